@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict
+from types import CodeType
+from typing import Any, Dict, Union
 
 
 class CodeExecutor(ABC):
@@ -18,12 +19,19 @@ class CodeExecutor(ABC):
     3. Execute a given string of Python code to define a specific function.
     4. Call that function with the established database connection and any extra context.
     5. Return the results from the called function.
+
+    Attributes:
+        accepts_code_objects: Whether `execute` accepts a precompiled `types.CodeType`
+            in place of a source string. Executors that ship the source elsewhere
+            (e.g. to a remote sandbox) should leave this False.
     """
 
+    accepts_code_objects: bool = False
+
     @abstractmethod
     def execute(
         self,
-        code: str,
+        code: Union[str, CodeType],
         function_name: str,
         sdif_sources: Dict[str, Path],
         extra_context: Dict[str, Any],
@@ -41,6 +49,8 @@ class CodeExecutor(ABC):
             code:
                 A string containing the Python script to be executed. This script
                 is expected to define the function identified by `function_name`.
+                Executors with `accepts_code_objects` set may also receive the
+                script already compiled with `compile(..., "exec")`.
             function_name:
                 The name of the function, defined within the `code` string, that
                 will be invoked after the `code` string itself has been executed.
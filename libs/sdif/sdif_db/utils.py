@@ -12,6 +12,25 @@ class DBConnectionError(Exception):
     pass
 
 
+def _sql_string_literal(value: str) -> str:
+    """Quotes a string as an SQLite string literal, doubling embedded quotes."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _first_unattached_source(
+    conn: sqlite3.Connection, sdif_sources: Dict[str, Union[Path, str]]
+) -> Tuple[str, Union[Path, str]]:
+    """Returns the first (schema, path) in `sdif_sources` not attached to `conn`."""
+    try:
+        attached = {row[1] for row in conn.execute("PRAGMA database_list;")}
+    except sqlite3.Error:
+        attached = set()
+    for schema_name, file_path in sdif_sources.items():
+        if schema_name not in attached:
+            return schema_name, file_path
+    return next(iter(sdif_sources.items()))
+
+
 def create_db_connection(
     sdif_sources: Dict[str, Union[Path, str]],
 ) -> Tuple[sqlite3.Connection, Dict[str, Path]]:
@@ -81,21 +100,28 @@ def create_db_connection(
                 "Creating in-memory database for attaching multiple SDIF sources."
             )
             db_conn = sqlite3.connect(":memory:")
-            for schema_name, file_path in sdif_sources.items():
-                logger.debug(
-                    f"Attaching SDIF source {file_path} as schema '{schema_name}'."
+            # executescript() cannot bind parameters, so paths are inlined as escaped
+            # SQL string literals. One call replaces a Python round-trip per source.
+            attach_script = ";\n".join(
+                f"ATTACH DATABASE {_sql_string_literal(str(file_path))} AS {schema_name}"
+                for schema_name, file_path in sdif_sources.items()
+            )
+            logger.debug(
+                f"Attaching SDIF sources as schemas {list(sdif_sources.keys())}."
+            )
+            try:
+                db_conn.executescript(attach_script)
+            except sqlite3.Error as e:
+                # The script stops at the first failing ATTACH; name it in the error.
+                failed_schema, failed_path = _first_unattached_source(
+                    db_conn, sdif_sources
                 )
-                try:
-                    db_conn.execute(
-                        f"ATTACH DATABASE ? AS {schema_name}", (str(file_path),)
-                    )
-                    successfully_attached_schemas[schema_name] = file_path
-                except sqlite3.Error as e:
-                    db_conn.close()
-                    db_conn = None  # type: ignore
-                    raise DBConnectionError(
-                        f"Failed to attach database '{file_path}' as schema '{schema_name}': {e}"
-                    ) from e
+                db_conn.close()
+                db_conn = None  # type: ignore
+                raise DBConnectionError(
+                    f"Failed to attach database '{failed_path}' as schema '{failed_schema}': {e}"
+                ) from e
+            successfully_attached_schemas.update(sdif_sources)  # type: ignore[arg-type]
         return db_conn, successfully_attached_schemas
     except Exception as e:
         # Catch any other unexpected error during setup, ensure connection is closed if partially opened
@@ -148,6 +148,22 @@ def test_create_db_connection_multiple_sources(temp_sqlite_files):
         reopened_conn.close()
 
 
+def test_create_db_connection_multiple_sources_quoted_paths(tmp_path):
+    sdif_sources = {}
+    for i, name in enumerate(["it's.sqlite", "plain.sqlite"]):
+        file_path = tmp_path / name
+        conn = sqlite3.connect(file_path)
+        conn.execute(f"CREATE TABLE t{i} (id INTEGER);")
+        conn.close()
+        sdif_sources[f"s{i}"] = file_path
+
+    conn, attached_schemas = create_db_connection(sdif_sources)
+    assert attached_schemas == sdif_sources
+    conn.execute("SELECT * FROM s0.t0;").fetchall()
+    conn.execute("SELECT * FROM s1.t1;").fetchall()
+    cleanup_db_connection(conn, attached_schemas)
+
+
 def test_create_db_connection_no_sources():
     with pytest.raises(DBConnectionError, match="No SDIF sources provided"):
         create_db_connection({})
@@ -353,69 +369,36 @@ def test_create_db_connection_attach_failure_multi_source(temp_sqlite_files, moc
     schema_to_succeed = "db1"
     schema_to_fail = "db2"
 
-    mock_path_db2 = mocker.MagicMock(spec=Path)
-    mock_path_db2.exists.return_value = True
-    mock_path_db2.is_file.return_value = True
-    mock_path_db2.resolve.return_value = mock_path_db2
-    mock_path_db2.__str__.return_value = "mocked/db2.sqlite"
+    file2_resolved = temp_sqlite_files[1].resolve()
 
     sdif_sources_mocked = {
         schema_to_succeed: file1_resolved,
-        schema_to_fail: mock_path_db2,
+        schema_to_fail: file2_resolved,
     }
 
     mock_conn_instance = mocker.MagicMock(spec=sqlite3.Connection)
-    attached_successfully = {}
-
-    def execute_for_multi_attach_fail(sql, params=None):
-        nonlocal attached_successfully
-        # Let the first ATTACH (for db1) succeed by returning a mock cursor
-        if isinstance(sql, str) and sql.startswith(
-            f"ATTACH DATABASE ? AS {schema_to_succeed}"
-        ):
-            # Simulate successful attach for the first one
-            attached_successfully[schema_to_succeed] = params[
-                0
-            ]  # Record path for assertion if needed
-            mock_cursor = mocker.MagicMock()
-            return mock_cursor
-        # Make the second ATTACH (for db2) fail
-        if isinstance(sql, str) and sql.startswith(
-            f"ATTACH DATABASE ? AS {schema_to_fail}"
-        ):
-            raise sqlite3.OperationalError(
-                f"Simulated ATTACH error for {schema_to_fail} multi-source"
-            )
-        # Default for other calls (e.g. initial :memory: connection might do pragmas)
-        mock_cursor = mocker.MagicMock()
-        return mock_cursor
-
-    mock_conn_instance.execute.side_effect = execute_for_multi_attach_fail
+    # The batched ATTACH script stops at db2; db1 is already attached by then.
+    mock_conn_instance.executescript.side_effect = sqlite3.OperationalError(
+        f"Simulated ATTACH error for {schema_to_fail} multi-source"
+    )
+    mock_conn_instance.execute.return_value = [
+        (0, "main", ""),
+        (2, schema_to_succeed, str(file1_resolved)),
+    ]
     mock_conn_instance.close.return_value = None  # To prevent errors on close
 
     mocker.patch("sqlite3.connect", return_value=mock_conn_instance)
 
     with pytest.raises(
         DBConnectionError,
-        match=f"Failed to attach database 'mocked/db2.sqlite' as schema '{schema_to_fail}': Simulated ATTACH error for {schema_to_fail} multi-source",
+        match=f"Failed to attach database '{file2_resolved}' as schema '{schema_to_fail}': Simulated ATTACH error for {schema_to_fail} multi-source",
     ):
         create_db_connection(sdif_sources_mocked)
 
-    # Ensure the failing ATTACH was attempted
-    # Check calls to mock_conn_instance.execute
-    attach_db1_call = mocker.call(
-        f"ATTACH DATABASE ? AS {schema_to_succeed}", (str(file1_resolved),)
-    )
-    attach_db2_call = mocker.call(
-        f"ATTACH DATABASE ? AS {schema_to_fail}", (str(mock_path_db2),)
-    )
-
-    mock_conn_instance.execute.assert_any_call(
-        *attach_db1_call[1], **attach_db1_call[2]
-    )
-    mock_conn_instance.execute.assert_any_call(
-        *attach_db2_call[1], **attach_db2_call[2]
-    )
+    # Both sources are attached in a single script
+    (attach_script,), _ = mock_conn_instance.executescript.call_args
+    assert f"ATTACH DATABASE '{file1_resolved}' AS {schema_to_succeed}" in attach_script
+    assert f"ATTACH DATABASE '{file2_resolved}' AS {schema_to_fail}" in attach_script
 
     # Ensure close was called on the mock connection during error handling
     mock_conn_instance.close.assert_called_once()
@@ -1,3 +1,4 @@
+import contextlib
 import csv
 import inspect
 import io
@@ -8,10 +9,12 @@ import re
 import sqlite3
 import unicodedata
 import uuid
+import weakref
 from datetime import datetime, timedelta
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, Optional
+from types import CodeType, FunctionType
+from typing import Any, Dict, FrozenSet, Iterator, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -22,6 +25,35 @@ from sdif_db.database import SDIFDatabase
 
 logger = logging.getLogger(__name__)
 
+# Signatures of transformation functions, keyed by their code object. Re-running
+# the same compiled code defines a new function object each time, but it shares
+# its __code__, so the introspection is done once per code object. Functions that
+# carry `__wrapped__` or `__signature__` (e.g. built by a `functools.wraps`
+# decorator) are not cached: their signature comes from elsewhere, and every
+# function a decorator returns shares the wrapper's __code__.
+_SIGNATURE_CACHE: "weakref.WeakKeyDictionary[CodeType, Tuple[Any, Any, Dict[str, Any], inspect.Signature]]" = weakref.WeakKeyDictionary()
+
+
+def _signature_of(func: Any) -> inspect.Signature:
+    """`inspect.signature(func)`, reused while the code, defaults and annotations match."""
+    if (
+        not isinstance(func, FunctionType)
+        or hasattr(func, "__wrapped__")
+        or hasattr(func, "__signature__")
+    ):
+        return inspect.signature(func)
+    key = (func.__defaults__, func.__kwdefaults__, func.__annotations__)
+    cached = _SIGNATURE_CACHE.get(func.__code__)
+    if cached is not None:
+        try:
+            if cached[:3] == key:
+                return cached[3]
+        except Exception:  # e.g. defaults whose == is not a plain bool
+            pass
+    sig = inspect.signature(func)
+    _SIGNATURE_CACHE[func.__code__] = (*key, sig)
+    return sig
+
 
 class LocalCodeExecutor(CodeExecutor):
     """
@@ -46,6 +78,8 @@ class LocalCodeExecutor(CodeExecutor):
     in trusted environments and with code from trusted sources.
     """
 
+    accepts_code_objects = True
+
     _DEFAULT_INITIAL_CONTEXT: Dict[str, Any] = {
         "pd": pd,
         "json": json,
@@ -76,17 +110,47 @@ class LocalCodeExecutor(CodeExecutor):
             initial_context:
                 An optional dictionary of global variables to make available
                 during code execution. These will be merged with (and can
-                override) the default set of globals provided by the executor.
+                override) the default set of globals provided by the executor,
+                except `__builtins__`, which is always the real builtins module.
             disable_security_warning: If True, suppresses the security warning log.
         """
-        self._resolved_initial_globals = self._DEFAULT_INITIAL_CONTEXT.copy()
+        # Template copied for every execution. Builtins are set last so an
+        # `initial_context` entry cannot replace them.
+        self._resolved_initial_globals = dict(self._DEFAULT_INITIAL_CONTEXT)
         if initial_context:
             self._resolved_initial_globals.update(initial_context)
+        self._resolved_initial_globals["__builtins__"] = __builtins__
         self.disable_security_warning = disable_security_warning
+        # Set only inside `session()`: attached connections keyed by their sources.
+        self._session_connections: Optional[
+            Dict[FrozenSet[Tuple[str, str]], Tuple[sqlite3.Connection, Dict[str, Path]]]
+        ] = None
+
+    @contextlib.contextmanager
+    def session(self) -> Iterator["LocalCodeExecutor"]:
+        """
+        Reuses database connections across the `execute` calls made in this block.
+
+        Calls with the same `sdif_sources` (and taking `conn` rather than `db`) share
+        one connection, set up and ATTACHed on first use, and cleaned up when the
+        block exits. Transformation code therefore sees what earlier calls left on
+        the connection (e.g. TEMP tables or uncommitted changes). A session is not
+        thread-safe; nested sessions join the outer one.
+        """
+        if self._session_connections is not None:
+            yield self
+            return
+        self._session_connections = {}
+        try:
+            yield self
+        finally:
+            connections, self._session_connections = self._session_connections, None
+            for db_conn, attached_schemas in connections.values():
+                cleanup_db_connection(db_conn, attached_schemas, should_close=True)
 
     def execute(
         self,
-        code: str,
+        code: Union[str, CodeType],
         function_name: str,
         sdif_sources: Dict[str, Path],
         extra_context: Dict[str, Any],
@@ -100,7 +164,8 @@ class LocalCodeExecutor(CodeExecutor):
                 A string containing the Python script to be executed. This script
                 is expected to define the function identified by `function_name`.
                 It can include imports, helper functions, and class definitions
-                as needed for the main transformation function.
+                as needed for the main transformation function. A code object
+                compiled in "exec" mode is run as-is, skipping the compile step.
             function_name:
                 The name of the function (defined in `code`) to be invoked.
             sdif_sources:
@@ -142,7 +207,6 @@ class LocalCodeExecutor(CodeExecutor):
             execution_globals = {
                 **self._resolved_initial_globals,
                 "context": extra_context,
-                "__builtins__": __builtins__,
                 **extra_context,
             }
 
@@ -152,7 +216,10 @@ class LocalCodeExecutor(CodeExecutor):
                     "This is insecure and should only be used in trusted environments."
                 )
 
-            compiled_code = compile(code, "<code_string>", "exec")
+            if isinstance(code, CodeType):
+                compiled_code = code
+            else:
+                compiled_code = compile(code, "<code_string>", "exec")
             exec(compiled_code, execution_globals, execution_globals)
 
             if function_name not in execution_globals:
@@ -166,7 +233,7 @@ class LocalCodeExecutor(CodeExecutor):
                     f"'{function_name}' defined in code is not a callable function."
                 )
 
-            sig = inspect.signature(transform_func)
+            sig = _signature_of(transform_func)
             param_names = list(sig.parameters.keys())
             func_args: Dict[str, Any] = {}
 
@@ -184,9 +251,21 @@ class LocalCodeExecutor(CodeExecutor):
             else:
                 # Default to connection-based setup if 'db' parameter is not present.
                 # This will also be the path if function takes no db/conn params (e.g. only context, or no params).
-                db_conn, attached_schemas = create_db_connection(sdif_sources)
+                if self._session_connections is None:
+                    db_conn, attached_schemas = create_db_connection(sdif_sources)
+                    func_conn = db_conn
+                else:
+                    key = frozenset(
+                        (name, str(path)) for name, path in sdif_sources.items()
+                    )
+                    if key not in self._session_connections:
+                        self._session_connections[key] = create_db_connection(
+                            sdif_sources
+                        )
+                    # Owned by the session: cleaned up when it ends, not below
+                    func_conn, _ = self._session_connections[key]
                 if "conn" in param_names:
-                    func_args["conn"] = db_conn
+                    func_args["conn"] = func_conn
 
             if "context" in param_names:
                 func_args["context"] = extra_context
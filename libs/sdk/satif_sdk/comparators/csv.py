@@ -1,9 +1,10 @@
+import contextlib
 import csv
 import decimal
 import logging
 from collections import Counter
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple, Union
 from typing import Counter as TypingCounter
 
 from satif_core.comparators.base import Comparator
@@ -17,6 +18,13 @@ CsvData = Tuple[
     Optional[str],  # Allow Any for mixed types (str, float)
 ]
 
+# Upper bound on distinct cell texts whose rounded value is remembered per read
+_ROUNDED_CELL_CACHE_SIZE = 65536
+_NOT_ROUNDED = object()
+
+# A path to a CSV file, or an already-open, seekable text stream over one
+CsvSource = Union[str, Path, TextIO]
+
 
 class CSVComparator(Comparator):
     """
@@ -24,100 +32,81 @@ class CSVComparator(Comparator):
 
     Provides a detailed report on differences found in headers and row content.
     Supports options like ignoring row order, header case sensitivity, etc.
+    Either side may also be given as an open, seekable text stream (e.g.
+    `io.StringIO`) instead of a path; streams are read from the start and
+    are not closed.
     """
 
-    def _read_data(
+    @staticmethod
+    def _is_stream(source: CsvSource) -> bool:
+        """Returns True if `source` is a file-like object rather than a path."""
+        return hasattr(source, "read")
+
+    @classmethod
+    def _source_name(cls, source: CsvSource) -> str:
+        """Short name used in reports: the file name, or the stream's `name` if any."""
+        if cls._is_stream(source):
+            return str(getattr(source, "name", "<stream>"))
+        return Path(source).name
+
+    @classmethod
+    def _open(cls, source: CsvSource, encoding: str):
+        """Opens a path for reading; an open stream is rewound and left open."""
+        if cls._is_stream(source):
+            source.seek(0)
+            return contextlib.nullcontext(source)
+        return open(source, newline="", encoding=encoding, errors="replace")
+
+    def _open_csv(
         self,
-        file_path: Union[str, Path],
-        delimiter: Optional[str] = None,
-        strip_whitespace: bool = True,
-        encoding: str = "utf-8",
-        decimal_places: Optional[int] = None,
-    ) -> CsvData:
-        """Helper to read CSV header and row data into a Counter."""
-        file_path = Path(file_path)
-        header: Optional[List[str]] = None
-        row_counts: TypingCounter[Tuple[Any, ...]] = (
-            Counter()
-        )  # Allow Any type in tuple
-        actual_delimiter = delimiter
+        stack: contextlib.ExitStack,
+        file_path: CsvSource,
+        delimiter: Optional[str],
+        strip_whitespace: bool,
+        encoding: str,
+    ) -> Tuple[Optional[List[str]], Optional[Iterator[List[str]]], Optional[str]]:
+        """
+        Opens a CSV source on `stack` and reads its header.
 
+        Returns `(header, reader, error)`. On success `reader` is positioned on
+        the first data row; it is None for an empty file, or when `error` is set.
+        """
+        actual_delimiter = delimiter
         try:
-            with open(file_path, newline="", encoding=encoding, errors="replace") as f:
-                if actual_delimiter is None:
-                    try:
-                        sample_lines = [line for _, line in zip(range(10), f)]
-                        sample = "".join(sample_lines)
-                        if not sample:
-                            log.debug(
-                                f"File {file_path} appears empty during sniffing."
-                            )
-                            return None, Counter(), None
-                        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
-                        actual_delimiter = dialect.delimiter
-                        log.debug(
-                            f"Detected delimiter '{actual_delimiter}' for {file_path}"
-                        )
-                        f.seek(0)
-                    except (csv.Error, Exception) as sniff_err:
-                        log.warning(
-                            f"Could not sniff delimiter for {file_path}, defaulting to ','. Error: {sniff_err}"
-                        )
-                        actual_delimiter = ","
-                        f.seek(0)
-
-                reader = csv.reader(f, delimiter=actual_delimiter)
+            f = stack.enter_context(self._open(file_path, encoding))
+            if actual_delimiter is None:
                 try:
-                    raw_header = next(reader)
-                    header = [h.strip() if strip_whitespace else h for h in raw_header]
-                    num_columns = len(header)
-
-                    for i, row in enumerate(reader):
-                        if len(row) != num_columns:
-                            log.warning(
-                                f"Row {i + 2} in {file_path} has {len(row)} columns, expected {num_columns}. Adapting row."
-                            )
-                            if len(row) > num_columns:
-                                row = row[:num_columns]
-                            else:
-                                row.extend([""] * (num_columns - len(row)))
-
-                        processed_row_values = []
-                        for cell in row:
-                            value: Any = cell.strip() if strip_whitespace else cell
-                            if decimal_places is not None:
-                                try:
-                                    # Use Decimal for precise rounding
-                                    d_value = decimal.Decimal(value)
-                                    # Round to specified decimal places
-                                    quantizer = decimal.Decimal(
-                                        "1e-" + str(decimal_places)
-                                    )
-                                    value = d_value.quantize(
-                                        quantizer, rounding=decimal.ROUND_HALF_UP
-                                    )
-                                    # Convert back to float for storage if needed, or keep as Decimal
-                                    # Keeping as Decimal might be more precise but requires consumers to handle it
-                                    # Let's convert back to float for broader compatibility, though precision issues might reappear
-                                    value = float(value)
-                                except (decimal.InvalidOperation, ValueError):
-                                    # Keep as string if conversion fails
-                                    pass
-                            processed_row_values.append(value)
-
-                        processed_row = tuple(processed_row_values)
-                        row_counts[processed_row] += 1
-
-                except StopIteration:
-                    log.debug(f"File {file_path} is empty or header-only.")
-                    return header, Counter(), None  # Return header if found, else None
-                except Exception as read_err:
-                    log.error(
-                        f"Error reading CSV content from {file_path} after header: {read_err}"
+                    sample_lines = [line for _, line in zip(range(10), f)]
+                    sample = "".join(sample_lines)
+                    if not sample:
+                        log.debug(f"File {file_path} appears empty during sniffing.")
+                        return None, None, None
+                    dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+                    actual_delimiter = dialect.delimiter
+                    log.debug(
+                        f"Detected delimiter '{actual_delimiter}' for {file_path}"
                     )
-                    return header, None, f"Error reading content: {read_err}"
-
-            return header, row_counts, None
+                    f.seek(0)
+                except (csv.Error, Exception) as sniff_err:
+                    log.warning(
+                        f"Could not sniff delimiter for {file_path}, defaulting to ','. Error: {sniff_err}"
+                    )
+                    actual_delimiter = ","
+                    f.seek(0)
+
+            reader = csv.reader(f, delimiter=actual_delimiter)
+            try:
+                raw_header = next(reader)
+            except StopIteration:
+                log.debug(f"File {file_path} is empty or header-only.")
+                return None, None, None
+            except Exception as read_err:
+                log.error(
+                    f"Error reading CSV content from {file_path} after header: {read_err}"
+                )
+                return None, None, f"Error reading content: {read_err}"
+            header = [h.strip() if strip_whitespace else h for h in raw_header]
+            return header, reader, None
 
         except FileNotFoundError:
             log.error(f"File not found: {file_path}")
@@ -126,6 +115,119 @@ class CSVComparator(Comparator):
             log.error(f"Failed to open or process file {file_path}: {e}")
             return None, None, f"Error opening/processing file: {e}"
 
+    def _tally_rows(
+        self,
+        reader: Optional[Iterator[List[str]]],
+        header: Optional[List[str]],
+        file_path: CsvSource,
+        strip_whitespace: bool = True,
+        decimal_places: Optional[int] = None,
+    ) -> Tuple[Optional[TypingCounter[Tuple[Any, ...]]], Optional[str]]:
+        """Normalizes the remaining rows of `reader` and counts each distinct row."""
+        row_counts: TypingCounter[Tuple[Any, ...]] = (
+            Counter()
+        )  # Allow Any type in tuple
+        if reader is None or header is None:
+            return row_counts, None
+        num_columns = len(header)
+        # Rounding goes through Decimal, so repeated cell texts (ids, amounts,
+        # categories) are rounded once per call and looked up afterwards.
+        quantizer = (
+            decimal.Decimal("1e-" + str(decimal_places))
+            if decimal_places is not None
+            else None
+        )
+        rounded_cells: Dict[str, Any] = {}
+
+        def normalized_rows() -> Iterator[Tuple[Any, ...]]:
+            for i, row in enumerate(reader):
+                if len(row) != num_columns:
+                    log.warning(
+                        f"Row {i + 2} in {file_path} has {len(row)} columns, expected {num_columns}. Adapting row."
+                    )
+                    if len(row) > num_columns:
+                        row = row[:num_columns]
+                    else:
+                        row.extend([""] * (num_columns - len(row)))
+
+                processed_row_values = []
+                for cell in row:
+                    value: Any = cell.strip() if strip_whitespace else cell
+                    if quantizer is not None:
+                        cell_text = value
+                        value = rounded_cells.get(cell_text, _NOT_ROUNDED)
+                        if value is _NOT_ROUNDED:
+                            try:
+                                # Use Decimal for precise rounding
+                                d_value = decimal.Decimal(cell_text)
+                                # Round to specified decimal places
+                                value = d_value.quantize(
+                                    quantizer, rounding=decimal.ROUND_HALF_UP
+                                )
+                                # Convert back to float for storage if needed, or keep as Decimal
+                                # Keeping as Decimal might be more precise but requires consumers to handle it
+                                # Let's convert back to float for broader compatibility, though precision issues might reappear
+                                value = float(value)
+                            except (decimal.InvalidOperation, ValueError):
+                                # Keep as string if conversion fails
+                                value = cell_text
+                            # NaN is left out: each cell keeps its own NaN object
+                            if (
+                                value == value
+                                and len(rounded_cells) < _ROUNDED_CELL_CACHE_SIZE
+                            ):
+                                rounded_cells[cell_text] = value
+                    processed_row_values.append(value)
+
+                yield tuple(processed_row_values)
+
+        try:
+            # Counter.update counts an iterable in C
+            row_counts.update(normalized_rows())
+        except Exception as read_err:
+            log.error(
+                f"Error reading CSV content from {file_path} after header: {read_err}"
+            )
+            return None, f"Error reading content: {read_err}"
+        return row_counts, None
+
+    @staticmethod
+    def _count_rows(
+        reader: Optional[Iterator[List[str]]], file_path: CsvSource
+    ) -> Tuple[Optional[int], Optional[str]]:
+        """Counts the remaining rows of `reader` without normalizing their values."""
+        if reader is None:
+            return 0, None
+        try:
+            return sum(1 for _ in reader), None
+        except Exception as read_err:
+            log.error(
+                f"Error reading CSV content from {file_path} after header: {read_err}"
+            )
+            return None, f"Error reading content: {read_err}"
+
+    def _read_data(
+        self,
+        file_path: CsvSource,
+        delimiter: Optional[str] = None,
+        strip_whitespace: bool = True,
+        encoding: str = "utf-8",
+        decimal_places: Optional[int] = None,
+    ) -> CsvData:
+        """Helper to read CSV header and row data into a Counter."""
+        if not self._is_stream(file_path):
+            file_path = Path(file_path)
+        with contextlib.ExitStack() as stack:
+            header, reader, error = self._open_csv(
+                stack, file_path, delimiter, strip_whitespace, encoding
+            )
+            if error:
+                return header, None, error
+            row_counts, error = self._tally_rows(
+                reader, header, file_path, strip_whitespace, decimal_places
+            )
+            return header, row_counts, error
+
     def _compare_headers(
         self,
         header1: Optional[List[str]],
@@ -277,18 +379,6 @@ class CSVComparator(Comparator):
                         f"Found {len(unique_keys2)} unique row(s) in {file_path2_name}."
                     )
 
-                # Iterate over all keys present in either counter to find count differences
-                all_keys = rows1_counter.keys() | rows2_counter.keys()
-                for key in all_keys:
-                    c1 = rows1_counter.get(key, 0)
-                    c2 = rows2_counter.get(key, 0)
-                    if (
-                        c1 != c2 and key not in unique_keys1 and key not in unique_keys2
-                    ):  # Only rows that are not already unique
-                        # This condition for key not in unique_keys might be tricky
-                        # Let's simplify: report diff if counts are different, after unique rows are handled
-                        pass  # This part is complex with unique_keys, simplify for now
-
                 # Simpler approach for count_diffs:
                 # Report rows present in both but with different counts
                 # This was already part of the original logic.
@@ -376,14 +466,16 @@ class CSVComparator(Comparator):
 
     def compare(
         self,
-        file_path1: Union[str, Path],
-        file_path2: Union[str, Path],
+        file_path1: CsvSource,
+        file_path2: CsvSource,
         file_config: Optional[dict[str, Any]] = None,
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """
         Compares two CSV files using specified options.
 
+        Each side is a path or an open, seekable text stream over CSV content.
+
         Kwargs Options:
             ignore_row_order (bool): Compare row content regardless of order (default: True).
             check_header_order (bool): Require header columns in the same order (default: True).
@@ -396,8 +488,12 @@ class CSVComparator(Comparator):
             check_structure_only (bool): If True, only compare headers. Row data is ignored for equivalence (default: False).
         """
         # --- Extract parameters with defaults ---
-        file_path1 = Path(file_path1)
-        file_path2 = Path(file_path2)
+        if not self._is_stream(file_path1):
+            file_path1 = Path(file_path1)
+        if not self._is_stream(file_path2):
+            file_path2 = Path(file_path2)
+        name1 = self._source_name(file_path1)
+        name2 = self._source_name(file_path2)
         ignore_row_order: bool = kwargs.get("ignore_row_order", True)
         check_header_order: bool = kwargs.get("check_header_order", True)
         check_header_case: bool = kwargs.get("check_header_case", True)
@@ -410,7 +506,10 @@ class CSVComparator(Comparator):
 
         # --- Initialize results structure ---
         results: Dict[str, Any] = {
-            "files": {"file1": str(file_path1), "file2": str(file_path2)},
+            "files": {
+                "file1": name1 if self._is_stream(file_path1) else str(file_path1),
+                "file2": name2 if self._is_stream(file_path2) else str(file_path2),
+            },
             "comparison_params": {
                 "ignore_row_order": ignore_row_order,
                 "check_header_order": check_header_order,
@@ -432,39 +531,60 @@ class CSVComparator(Comparator):
         }
 
         # --- Read Data ---
-        header1, rows1_counter, error1 = self._read_data(
-            file_path1,
-            delimiter,
-            strip_whitespace,
-            encoding,
-            decimal_places,
-        )
-        header2, rows2_counter, error2 = self._read_data(
-            file_path2,
-            delimiter,
-            strip_whitespace,
-            encoding,
-            decimal_places,
-        )
+        # Headers are read and compared first, with both files kept open: rows are
+        # only normalized and tallied when their content will actually be
+        # compared. Otherwise they are just counted.
+        rows1_counter: Optional[TypingCounter[Tuple[Any, ...]]] = None
+        rows2_counter: Optional[TypingCounter[Tuple[Any, ...]]] = None
+        row_count1: Optional[int] = None
+        row_count2: Optional[int] = None
+        header_comp_result: Optional[Dict[str, Any]] = None
+        with contextlib.ExitStack() as stack:
+            header1, reader1, error1 = self._open_csv(
+                stack, file_path1, delimiter, strip_whitespace, encoding
+            )
+            header2, reader2, error2 = self._open_csv(
+                stack, file_path2, delimiter, strip_whitespace, encoding
+            )
+            if not (error1 or error2):
+                header_comp_result = self._compare_headers(
+                    header1, header2, check_header_order, check_header_case
+                )
+
+            if (
+                header_comp_result is not None
+                and header_comp_result["are_structurally_equivalent"]
+                and not check_structure_only
+            ):
+                rows1_counter, error1 = self._tally_rows(
+                    reader1, header1, file_path1, strip_whitespace, decimal_places
+                )
+                rows2_counter, error2 = self._tally_rows(
+                    reader2, header2, file_path2, strip_whitespace, decimal_places
+                )
+                if rows1_counter is not None:
+                    row_count1 = sum(rows1_counter.values())
+                if rows2_counter is not None:
+                    row_count2 = sum(rows2_counter.values())
+            else:
+                if not error1:
+                    row_count1, error1 = self._count_rows(reader1, file_path1)
+                if not error2:
+                    row_count2, error2 = self._count_rows(reader2, file_path2)
 
         if error1:
-            results["details"]["errors"].append(f"File 1 ({file_path1.name}): {error1}")
+            results["details"]["errors"].append(f"File 1 ({name1}): {error1}")
             results["are_equivalent"] = False
         if error2:
-            results["details"]["errors"].append(f"File 2 ({file_path2.name}): {error2}")
+            results["details"]["errors"].append(f"File 2 ({name2}): {error2}")
             results["are_equivalent"] = False
 
-        if error1 or error2 or rows1_counter is None or rows2_counter is None:
-            # This check handles cases where _read_data returns None for row_counts due to errors
+        if error1 or error2 or header_comp_result is None:
             results["summary"].append(
                 "Comparison aborted due to errors reading file(s)."
             )
-            results["details"]["row_comparison"]["row_count1"] = (
-                sum(rows1_counter.values()) if rows1_counter else -1
-            )
-            results["details"]["row_comparison"]["row_count2"] = (
-                sum(rows2_counter.values()) if rows2_counter else -1
-            )
+            results["details"]["row_comparison"]["row_count1"] = row_count1 or -1
+            results["details"]["row_comparison"]["row_count2"] = row_count2 or -1
             if not results["details"][
                 "errors"
             ]:  # Ensure some error reported if not already
@@ -479,9 +599,6 @@ class CSVComparator(Comparator):
             return results
 
         # --- Compare Headers ---
-        header_comp_result = self._compare_headers(
-            header1, header2, check_header_order, check_header_case
-        )
         results["details"]["header_comparison"]["result"] = header_comp_result[
             "result_text"
         ]
@@ -513,12 +630,8 @@ class CSVComparator(Comparator):
             )
             results["details"]["row_comparison"] = {
                 "result": "Skipped (check_structure_only enabled)",
-                "row_count1": sum(
-                    rows1_counter.values()
-                ),  # rows1_counter is not None here
-                "row_count2": sum(
-                    rows2_counter.values()
-                ),  # rows2_counter is not None here
+                "row_count1": row_count1,
+                "row_count2": row_count2,
             }
             # Final summary message will be set based on results["are_equivalent"] later
         else:
@@ -531,8 +644,8 @@ class CSVComparator(Comparator):
                 )
                 results["details"]["row_comparison"] = {
                     "result": "Not compared (header mismatch)",
-                    "row_count1": sum(rows1_counter.values()),
-                    "row_count2": sum(rows2_counter.values()),
+                    "row_count1": row_count1,
+                    "row_count2": row_count2,
                 }
             else:
                 # Headers are structurally equivalent, proceed with row comparison
@@ -542,8 +655,8 @@ class CSVComparator(Comparator):
                     ignore_row_order,
                     decimal_places,
                     max_examples,
-                    file_path1.name,
-                    file_path2.name,
+                    name1,
+                    name2,
                 )
                 results["details"]["row_comparison"] = row_comp_output["details"]
                 results["summary"].extend(row_comp_output["summary_messages"])
@@ -1,11 +1,54 @@
 import logging
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 from deepdiff import DeepDiff
 from sdif_db.schema import SDIFSchemaConfig, apply_rules_to_schema
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 log = logging.getLogger(__name__)
 
+# DeepHash only needs a stable digest to match set items, not a cryptographic one;
+# None keeps DeepDiff's default (SHA-256).
+_DEEPDIFF_HASHER = xxhash.xxh3_64_hexdigest if xxhash is not None else None
+
+# Upper bound on rule-applied schemas remembered by one comparator.
+_MINIMAL_SCHEMA_CACHE_SIZE = 64
+
+_EQUIVALENT_SUMMARY = "Schemas are equivalent based on the current configuration."
+
+
+def _typed_form(value: Any) -> Any:
+    """
+    Copy of a schema (raw or rule-applied) whose == also compares types.
+
+    Plain == treats 1, 1.0 and True (or a set and a frozenset) as equal where
+    DeepDiff reports a type change, so numbers and sets are paired with their type.
+    Equal typed forms therefore mean DeepDiff would find no differences.
+    """
+    value_type = type(value)
+    if value_type is str or value is None:
+        return value
+    if value_type is tuple:
+        return tuple(map(_typed_form, value))
+    if value_type is frozenset:
+        return (frozenset, frozenset(map(_typed_form, value)))
+    if value_type is dict and all(type(key) is str for key in value):
+        return {key: _typed_form(item) for key, item in value.items()}
+    if value_type in (bool, int, float):
+        return (value_type, value)
+    if value_type is list:
+        return list(map(_typed_form, value))
+    if value_type is set:
+        return (set, frozenset(map(_typed_form, value)))
+    # Anything else (non-str keys, subclasses, other numbers) never compares equal,
+    # which leaves the verdict to DeepDiff.
+    return object()
+
 
 class SDIFSchemaComparator:
     """
@@ -22,6 +65,43 @@ class SDIFSchemaComparator:
             config: An SDIFSchemaConfig instance. If None, a default config is used.
         """
         self.config = config if config else SDIFSchemaConfig()
+        # (id(schema), config snapshot) -> [typed schema snapshot, minimal schema, typed form]
+        self._minimal_schemas: OrderedDict[Tuple[int, Tuple], List[Any]] = OrderedDict()
+
+    def _cache_entry(self, schema: Dict[str, Any]) -> List[Any]:
+        """
+        Returns the cache entry holding apply_rules_to_schema(schema, self.config).
+
+        Entries are keyed by the schema's identity and a snapshot of the config, and
+        are only reused while the schema's _typed_form still equals the one taken when
+        the entry was built, so mutated dicts (even 1 -> True edits, which plain ==
+        misses) and recycled ids are recomputed.
+        """
+        key = (id(schema), tuple(sorted(vars(self.config).items())))
+        snapshot = _typed_form(schema)
+        entry = self._minimal_schemas.get(key)
+        if entry is None or entry[0] != snapshot:
+            entry = [
+                snapshot,
+                apply_rules_to_schema(schema, self.config),
+                None,
+            ]
+            self._minimal_schemas[key] = entry
+        self._minimal_schemas.move_to_end(key)
+        if len(self._minimal_schemas) > _MINIMAL_SCHEMA_CACHE_SIZE:
+            self._minimal_schemas.popitem(last=False)
+        return entry
+
+    def _minimal_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns apply_rules_to_schema(schema, self.config), reusing earlier results."""
+        return self._cache_entry(schema)[1]
+
+    def _typed_minimal_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns the cached _typed_form of the schema's minimal form."""
+        entry = self._cache_entry(schema)
+        if entry[2] is None:
+            entry[2] = _typed_form(entry[1])
+        return entry[2]
 
     def compare(
         self,
@@ -45,11 +125,23 @@ class SDIFSchemaComparator:
                      'differences' depends on verbose_diff_level.
         """
         log.debug("Applying rules to schema 1...")
-        minimal_schema1 = apply_rules_to_schema(schema1, self.config)
+        minimal_schema1 = self._minimal_schema(schema1)
         log.debug("Applying rules to schema 2...")
-        minimal_schema2 = apply_rules_to_schema(schema2, self.config)
+        minimal_schema2 = self._minimal_schema(schema2)
 
         log.debug("Comparing minimal schemas...")
+        # Equivalent schemas are the common case: skip DeepDiff entirely. Plain ==
+        # rules out most differences before the typed forms need building.
+        if (
+            verbose_diff_level < 2
+            and minimal_schema1 == minimal_schema2
+            and self._typed_minimal_schema(schema1)
+            == self._typed_minimal_schema(schema2)
+        ):
+            if verbose_diff_level == 1:
+                return True, {}
+            return True, [_EQUIVALENT_SUMMARY]
+
         # ignore_order=False because canonicalization should handle order where specified by config.
         # report_repetition=True can be useful for complex list diffs.
         diff = DeepDiff(
@@ -58,6 +150,7 @@ class SDIFSchemaComparator:
             ignore_order=False,  # Our canonical form handles order based on config
             report_repetition=True,
             verbose_level=2,  # Get full details for potential custom summary
+            hasher=_DEEPDIFF_HASHER,
         )
 
         are_equivalent = not bool(diff)
@@ -131,9 +224,7 @@ class SDIFSchemaComparator:
                 )
 
         else:  # are_equivalent is True
-            diff_summary.append(
-                "Schemas are equivalent based on the current configuration."
-            )
+            diff_summary.append(_EQUIVALENT_SUMMARY)
 
         return are_equivalent, diff_summary
 
@@ -161,13 +252,11 @@ class SDIFSchemaComparator:
         log.debug(
             "Applying consumer rules (from config) to consumer schema for compatibility check..."
         )
-        min_consumer_schema = apply_rules_to_schema(consumer_schema, self.config)
+        min_consumer_schema = self._minimal_schema(consumer_schema)
         log.debug(
             "Applying consumer rules (from config) to producer schema for compatibility check..."
         )
-        min_producer_schema_viewed_by_consumer = apply_rules_to_schema(
-            producer_schema, self.config
-        )
+        min_producer_schema_viewed_by_consumer = self._minimal_schema(producer_schema)
 
         log.debug("Checking recursive compatibility...")
         return self._check_compatibility_recursive(
@@ -178,6 +267,11 @@ class SDIFSchemaComparator:
         self, consumer_part: Any, producer_part: Any
     ) -> bool:
         """Recursive helper for is_compatible_with."""
+        # The same object always satisfies itself; this covers a schema checked
+        # against itself, whose minimal forms come from the same cache entry.
+        if consumer_part is producer_part:
+            return True
+
         # If consumer part is None (e.g., optional section not present or ignored by config),
         # it imposes no requirement.
         if consumer_part is None:
@@ -226,11 +320,12 @@ class SDIFSchemaComparator:
             # potentially more. Using set subset check handles this.
             # Note: This assumes elements within the tuple are hashable due to _canonicalize_value
             try:
-                consumer_set = set(consumer_part)
+                # Only the producer side needs materializing; issuperset walks the
+                # consumer tuple directly.
                 producer_set = set(producer_part)
-                if not consumer_set.issubset(producer_set):
+                if not producer_set.issuperset(consumer_part):
                     log.debug(
-                        f"Producer tuple/list missing required items. Consumer needs: {consumer_set - producer_set}"
+                        f"Producer tuple/list missing required items. Consumer needs: {set(consumer_part) - producer_set}"
                     )
                     return False
                 return True
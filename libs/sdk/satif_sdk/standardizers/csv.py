@@ -1,3 +1,4 @@
+import copy
 import csv
 import logging
 from pathlib import Path
@@ -383,14 +384,20 @@ class CSVStandardizer(Standardizer):
 
         current_config_override = file_configs[index] or {}
 
-        effective_skip_rows_raw = validate_skip_rows_config(
-            current_config_override.get("skip_rows", self.default_skip_rows),
-            input_path.name,
-        )
-        effective_skip_columns_raw = validate_skip_columns_config(
-            current_config_override.get("skip_columns", self.default_skip_columns),
-            input_path.name,
-        )
+        # Defaults were validated once in __init__; only per-file overrides need it here.
+        # Copies keep each file's recorded config independent of the shared defaults.
+        if "skip_rows" in current_config_override:
+            effective_skip_rows_raw = validate_skip_rows_config(
+                current_config_override["skip_rows"], input_path.name
+            )
+        else:
+            effective_skip_rows_raw = copy.copy(self.default_skip_rows)
+        if "skip_columns" in current_config_override:
+            effective_skip_columns_raw = validate_skip_columns_config(
+                current_config_override["skip_columns"], input_path.name
+            )
+        else:
+            effective_skip_columns_raw = copy.copy(self.default_skip_columns)
         current_file_params["skip_rows"] = effective_skip_rows_raw
         current_file_params["skip_columns"] = effective_skip_columns_raw
 
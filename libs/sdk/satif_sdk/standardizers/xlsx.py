@@ -51,6 +51,8 @@ class XLSXStandardizer(Standardizer):
     are set during initialization. These defaults can be overridden on a per-file basis
     when calling the `standardize` method using the `file_configs` parameter.
     Infers SQLite types (INTEGER, REAL, TEXT) from pandas dtypes.
+    Only empty cells are treated as missing values; strings such as 'NA', 'N/A'
+    or 'NULL' are kept verbatim rather than being coerced to NULL.
 
     If `column_definitions` are provided for a file, they take precedence for selecting,
     renaming, and describing columns. Otherwise, headers are taken from the Excel sheet
@@ -180,9 +182,29 @@ class XLSXStandardizer(Standardizer):
         else:
             return str(value)
 
+    def _open_workbook(self, input_path: Path) -> Any:
+        """
+        Opens an Excel workbook once so it can be shared by sheet-name resolution and pandas.
+
+        Parsing the workbook (and its shared-strings table) is the most expensive part of
+        reading large files, so the returned handle is passed to both consumers instead of
+        letting each one re-open the file. pandas closes the workbook once the sheet is parsed.
+        """
+        import openpyxl
+
+        try:
+            return openpyxl.load_workbook(
+                input_path, read_only=True, data_only=True, keep_links=False
+            )
+        except Exception as e_open:
+            raise RuntimeError(
+                f"Failed to read Excel file {input_path.name}: {e_open}"
+            ) from e_open
+
     def _gather_file_processing_parameters(
         self,
         input_path: Path,
+        workbook: Any,
         index: int,
         num_inputs: int,
         descriptions_list: List[Optional[str]],
@@ -226,15 +248,14 @@ class XLSXStandardizer(Standardizer):
         actual_sheet_name_resolved = str(effective_sheet_name)
         if isinstance(effective_sheet_name, int):
             try:
-                xl = pd.ExcelFile(input_path, engine="openpyxl")
-                if 0 <= effective_sheet_name < len(xl.sheet_names):
-                    actual_sheet_name_resolved = xl.sheet_names[effective_sheet_name]
+                sheet_names = workbook.sheetnames
+                if 0 <= effective_sheet_name < len(sheet_names):
+                    actual_sheet_name_resolved = sheet_names[effective_sheet_name]
                 else:
                     raise ValueError(
                         f"Sheet index {effective_sheet_name} out of range for {input_path.name}. "
-                        f"Available sheets: {xl.sheet_names}"
+                        f"Available sheets: {sheet_names}"
                     )
-                xl.close()
             except Exception as e_sheetname:
                 logger.warning(
                     f"Could not determine sheet name from index {effective_sheet_name} for {input_path.name}: {e_sheetname}. "
@@ -433,48 +454,57 @@ class XLSXStandardizer(Standardizer):
                             f"Input file {current_input_path} does not have .xlsx extension. Attempting to read anyway."
                         )
 
-                    current_file_config = self._gather_file_processing_parameters(
-                        input_path=current_input_path,
-                        index=i,
-                        num_inputs=num_inputs,
-                        descriptions_list=descriptions_list,
-                        table_names_list=table_names_list,
-                        file_configs_overrides_list=file_configs_overrides_list,
-                        column_definitions_config_list=column_definitions_config_list,
-                    )
-                    file_configs_used[resolved_input_path_str] = current_file_config
-
-                    # --- Read Excel Sheet ---
+                    # Open the workbook once; it is shared by sheet-name resolution and pandas.
+                    workbook = self._open_workbook(current_input_path)
                     try:
-                        # Pandas: header is 0-indexed row *after* skipping rows.
-                        # Our skip_rows means rows before the header row.
-                        # So, pandas header = config header_row. Pandas skiprows = config skip_rows.
-                        df = pd.read_excel(
-                            current_input_path,
-                            sheet_name=current_file_config["sheet_name"],
-                            header=current_file_config["header_row"],
-                            skiprows=current_file_config["skip_rows"],
-                            engine="openpyxl",
-                            keep_default_na=True,
-                            na_values=None,  # Avoid pandas interpreting 'NA', 'NULL' etc. as NaN
+                        current_file_config = self._gather_file_processing_parameters(
+                            input_path=current_input_path,
+                            workbook=workbook,
+                            index=i,
+                            num_inputs=num_inputs,
+                            descriptions_list=descriptions_list,
+                            table_names_list=table_names_list,
+                            file_configs_overrides_list=file_configs_overrides_list,
+                            column_definitions_config_list=column_definitions_config_list,
                         )
-                    except FileNotFoundError:  # Should be caught by earlier check
-                        logger.error(
-                            f"File not found during pd.read_excel: {current_input_path}"
-                        )
-                        raise
-                    except (
-                        ValueError
-                    ) as e_pandas_val:  # Handles sheet not found by pandas, etc.
-                        raise ValueError(
-                            f"Error reading Excel file {current_input_path.name} (sheet: '{current_file_config['sheet_name']}'): {e_pandas_val}"
-                        ) from e_pandas_val
-                    except (
-                        Exception
-                    ) as e_pandas_other:  # Catch other pandas/openpyxl errors
-                        raise RuntimeError(
-                            f"Failed to read Excel file {current_input_path.name} (sheet: '{current_file_config['sheet_name']}'): {e_pandas_other}"
-                        ) from e_pandas_other
+                        file_configs_used[resolved_input_path_str] = current_file_config
+
+                        # --- Read Excel Sheet ---
+                        try:
+                            # Pandas: header is 0-indexed row *after* skipping rows.
+                            # Our skip_rows means rows before the header row.
+                            # So, pandas header = config header_row. Pandas skiprows = config skip_rows.
+                            df = pd.read_excel(
+                                workbook,
+                                sheet_name=current_file_config["sheet_name"],
+                                header=current_file_config["header_row"],
+                                skiprows=current_file_config["skip_rows"],
+                                engine="openpyxl",
+                                # Keep strings like 'NA' or 'NULL' as-is (and skip pandas'
+                                # per-cell default-NA lookup); only empty cells become NaN.
+                                keep_default_na=False,
+                                na_values=[""],
+                            )
+                        except FileNotFoundError:  # Should be caught by earlier check
+                            logger.error(
+                                f"File not found during pd.read_excel: {current_input_path}"
+                            )
+                            raise
+                        except (
+                            ValueError
+                        ) as e_pandas_val:  # Handles sheet not found by pandas, etc.
+                            raise ValueError(
+                                f"Error reading Excel file {current_input_path.name} (sheet: '{current_file_config['sheet_name']}'): {e_pandas_val}"
+                            ) from e_pandas_val
+                        except (
+                            Exception
+                        ) as e_pandas_other:  # Catch other pandas/openpyxl errors
+                            raise RuntimeError(
+                                f"Failed to read Excel file {current_input_path.name} (sheet: '{current_file_config['sheet_name']}'): {e_pandas_other}"
+                            ) from e_pandas_other
+                    finally:
+                        # pandas closes the workbook after parsing; this covers early failures.
+                        workbook.close()
 
                     if df.empty:
                         logger.warning(
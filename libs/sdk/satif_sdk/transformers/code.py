@@ -1,10 +1,35 @@
+import contextlib
+import functools
+import importlib.util
 import inspect
+import io
 import json
 import logging
+import os
+import re
+import shutil
 import sqlite3
+import stat
+import tempfile
+import threading
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Union
+from types import CodeType
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import pandas as pd
 from satif_core import CodeExecutor, Transformer
@@ -14,6 +39,38 @@ from sdif_db import SDIFDatabase, cleanup_db_connection, create_db_connection
 
 from satif_sdk.code_executors import LocalCodeExecutor
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+    pa_csv = None
+
+try:
+    import pyarrow.parquet as pa_pq
+except ImportError:
+    pa_pq = None
+
+try:
+    import jetxl
+except ImportError:
+    jetxl = None
+
+try:
+    import rustpy_xlsxwriter
+except ImportError:
+    rustpy_xlsxwriter = None
+
+try:
+    from isal import isal_zlib
+except ImportError:
+    isal_zlib = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,6 +82,474 @@ class ExportError(Exception):
 
 # Global registry for decorated transformation functions
 _TRANSFORMATION_REGISTRY = {}
+# Guards writes to the registry, so threaded imports register transformations safely.
+_REGISTRY_LOCK = threading.Lock()
+
+# Zip archive defaults. Level-1 deflate is several times faster than zlib's default
+# level 6 for only a slightly worse ratio on CSV/JSON exports, which are usually
+# written once and read once.
+DEFAULT_ZIP_COMPRESSION = zipfile.ZIP_DEFLATED
+DEFAULT_ZIP_COMPRESSLEVEL = 1
+# Entries with these suffixes are compressed already; deflating them again costs CPU
+# for next to no size reduction, so they are stored as-is.
+PRECOMPRESSED_SUFFIXES = frozenset(
+    {".xlsx", ".parquet", ".png", ".jpg", ".jpeg", ".gz", ".zip"}
+)
+# Bytes handed to the compressor per write when streaming an entry into a zip.
+ZIP_STREAM_CHUNK_SIZE = 1 << 20
+# DataFrames and strings at least this large (in memory) are streamed into zip
+# entries instead of being serialized to one bytes object, in serial and parallel mode.
+ZIP_STREAM_MIN_SIZE = 8 * 1024 * 1024
+# Fixed entry timestamp (the earliest a zip can store): entries need no clock lookup
+# and identical results produce byte-identical archives.
+ZIP_ENTRY_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+class _IsalDeflateZlib:
+    """
+    `zlib` stand-in for `zipfile` that deflates with ISA-L when the level allows.
+
+    ISA-L produces standard raw deflate streams, so archives stay readable by any
+    zip tool. Levels outside ISA-L's 1-3 range, decompression and everything else
+    are delegated to the stdlib `zlib` module.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(zlib, name)
+
+    @staticmethod
+    def compressobj(level: int = -1, *args: Any, **kwargs: Any) -> Any:
+        if 1 <= level <= isal_zlib.ISAL_BEST_COMPRESSION:
+            return isal_zlib.compressobj(level, *args, **kwargs)
+        return zlib.compressobj(level, *args, **kwargs)
+
+
+# Active `_isal_zip_deflate` blocks, and the `zlib` they replaced in `zipfile`.
+_ZIP_ZLIB_LOCK = threading.Lock()
+_zip_zlib_users = 0
+_zip_zlib_saved: Any = None
+
+
+@contextlib.contextmanager
+def _isal_zip_deflate() -> Iterator[None]:
+    """
+    Routes `zipfile`'s deflate through ISA-L while CodeTransformer writes an archive.
+
+    `zipfile` looks `zlib` up at call time, so swapping its module attribute covers
+    both `writestr` and `ZipFile.open(..., "w")`. The stdlib module is restored once
+    the last concurrent export finishes. Zips written by other threads meanwhile
+    also deflate with ISA-L, which produces standard, equally readable streams.
+    """
+    global _zip_zlib_users, _zip_zlib_saved
+    if isal_zlib is None:
+        yield
+        return
+    with _ZIP_ZLIB_LOCK:
+        if _zip_zlib_users == 0:
+            _zip_zlib_saved = zipfile.zlib
+            zipfile.zlib = _IsalDeflateZlib()
+        _zip_zlib_users += 1
+    try:
+        yield
+    finally:
+        with _ZIP_ZLIB_LOCK:
+            _zip_zlib_users -= 1
+            if _zip_zlib_users == 0:
+                zipfile.zlib = _zip_zlib_saved
+                _zip_zlib_saved = None
+
+
+# Parquet writer settings: zstd level 3 is close to snappy's speed with a better
+# ratio, and dictionary encoding pays off on the repetitive columns typical of exports.
+PARQUET_WRITE_OPTIONS: Dict[str, Any] = {
+    "compression": "zstd",
+    "compression_level": 3,
+    "use_dictionary": True,
+    "data_page_size": 1 << 20,
+}
+
+# `bytes` outputs larger than this are written unbuffered, in FILE_WRITE_CHUNK_SIZE slices.
+LARGE_BYTES_WRITE_THRESHOLD = 8 * 1024 * 1024
+FILE_WRITE_CHUNK_SIZE = 1 << 20
+
+# SQLite tuning for the read-mostly connections used by direct callables.
+DEFAULT_SQLITE_MMAP_SIZE = 256 * 1024 * 1024  # bytes per attached SDIF
+SQLITE_CACHE_SIZE_KIB = 64 * 1024  # page cache per attached SDIF
+
+# A '..' path component, with either separator. Checked on the raw key before any Path work.
+_PARENT_DIR_RE = re.compile(r"(?:^|[/\\])\.\.(?:[/\\]|$)")
+
+# Rows per DataFrame yielded by the `read_sql_chunked` context helper.
+DEFAULT_READ_CHUNK_SIZE = 100_000
+
+
+@functools.lru_cache(maxsize=128)
+def _load_script(path_str: str, mtime_ns: int, size: int) -> str:
+    """
+    Reads a transformation script, memoized on its path, modification time and size.
+
+    Transformers built from the same unchanged script share one read; editing the
+    file changes the key, so the new source is picked up.
+    """
+    return Path(path_str).read_text(encoding="utf-8")
+
+
+def _arrow_table_for_csv(df: pd.DataFrame) -> Optional["pa.Table"]:
+    """
+    Converts `df` to an Arrow table when PyArrow's C++ CSV writer can be used for it.
+
+    Only frames made of numeric and string columns take the fast path: PyArrow renders
+    booleans and datetimes differently from pandas. Returns None when PyArrow is not
+    installed or the frame is not eligible, in which case pandas should be used.
+    """
+    if pa is None:
+        return None
+    for _, column in df.items():
+        if pd.api.types.is_bool_dtype(column) or not (
+            pd.api.types.is_numeric_dtype(column)
+            or pd.api.types.is_string_dtype(column)
+        ):
+            return None
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+
+
+def _df_to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """Serializes a DataFrame to UTF-8 CSV bytes, using PyArrow when available."""
+    table = _arrow_table_for_csv(df)
+    if table is not None:
+        sink = pa.BufferOutputStream()
+        pa_csv.write_csv(table, sink)
+        return sink.getvalue().to_pybytes()
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def _orjson_bytes(data: Any) -> Optional[bytes]:
+    """
+    Serializes a dict/list to indented JSON bytes with orjson.
+
+    orjson also handles numpy scalars/arrays and non-string keys natively. Returns
+    None when orjson is not installed or rejects the value, in which case the
+    standard library encoder should be used.
+    """
+    if orjson is None:
+        return None
+    try:
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2
+            | orjson.OPT_SERIALIZE_NUMPY
+            | orjson.OPT_NON_STR_KEYS,
+        )
+    except TypeError:
+        return None
+
+
+def _json_bytes(data: Any) -> bytes:
+    """Serializes a dict/list to indented UTF-8 JSON bytes, using orjson when available."""
+    payload = _orjson_bytes(data)
+    if payload is None:
+        payload = json.dumps(data, indent=2).encode("utf-8")
+    return payload
+
+
+def _find_handler(handlers: Dict[type, Callable], data: Any) -> Optional[Callable]:
+    """
+    Returns the handler registered for `data`'s type, or None if there is none.
+
+    The exact type is looked up first; subclasses (e.g. an OrderedDict) fall back
+    to an isinstance scan over the registered types.
+    """
+    handler = handlers.get(type(data))
+    if handler is None:
+        handler = next(
+            (h for data_type, h in handlers.items() if isinstance(data, data_type)),
+            None,
+        )
+    return handler
+
+
+def _write_parquet(df: pd.DataFrame, where: Union[str, IO[bytes]]) -> None:
+    """Writes a DataFrame as Parquet (without its index) to a path or binary stream."""
+    if pa_pq is None:
+        raise ExportError(
+            "Writing to Parquet format ('.parquet') requires 'pyarrow'. Please install it."
+        )
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pa_pq.write_table(table, where, **PARQUET_WRITE_OPTIONS)
+
+
+def _df_entry_bytes(df: pd.DataFrame, ext: str) -> bytes:
+    if ext == ".parquet":
+        buffer = io.BytesIO()
+        _write_parquet(df, buffer)
+        return buffer.getvalue()
+    if ext == ".json":
+        return df.to_json(orient="records", indent=2).encode("utf-8")
+    return _df_to_csv_bytes(df)
+
+
+def _json_entry_bytes(data: Any, ext: str) -> bytes:
+    return _json_bytes(data)
+
+
+def _str_entry_bytes(data: str, ext: str) -> bytes:
+    return data.encode("utf-8")
+
+
+def _bytes_entry_bytes(data: bytes, ext: str) -> bytes:
+    return data
+
+
+# DataFrame extensions written as-is inside zip archives; any other becomes CSV.
+_ZIP_DATAFRAME_EXTENSIONS = frozenset(
+    {".csv", ".json"} | ({".parquet"} if pa_pq is not None else set())
+)
+
+# Serializers for zip archive entries, keyed by result type. Each takes the item and
+# the extension of its archive name and returns the entry's bytes.
+_ZIP_SERIALIZERS: Dict[type, Callable[[Any, str], bytes]] = {
+    pd.DataFrame: _df_entry_bytes,
+    dict: _json_entry_bytes,
+    list: _json_entry_bytes,
+    str: _str_entry_bytes,
+    bytes: _bytes_entry_bytes,
+}
+
+
+def _serialize_entry(
+    filename_key: str, archive_name: str, original_ext: str, data_item: Any
+) -> Optional[bytes]:
+    """
+    Serializes one result item to bytes for a zip archive, or returns None to skip it.
+
+    A module-level function so it can be handed to any executor as-is.
+    """
+    serializer = _find_handler(_ZIP_SERIALIZERS, data_item)
+    if serializer is None:
+        logger.warning(
+            f"Unsupported data type {type(data_item)} for file '{archive_name}' (from key '{filename_key}') in zip. Skipping."
+        )
+        return None
+    try:
+        return serializer(data_item, original_ext)
+    except Exception as ser_ex:
+        logger.error(
+            f"Error serializing '{filename_key}' (to be '{archive_name}') for zip: {ser_ex}"
+        )
+        return None
+
+
+@contextlib.contextmanager
+def _text_entry(raw_entry: IO[bytes]) -> Iterator[io.TextIOWrapper]:
+    """UTF-8 text view of `raw_entry` that leaves the binary stream open afterwards."""
+    text_entry = io.TextIOWrapper(raw_entry, encoding="utf-8", newline="")
+    try:
+        yield text_entry
+    finally:
+        text_entry.detach()
+
+
+def _stream_df_entry(df: pd.DataFrame, ext: str, raw_entry: IO[bytes]) -> None:
+    if ext == ".parquet":
+        _write_parquet(df, raw_entry)
+        return
+    table = _arrow_table_for_csv(df) if ext != ".json" else None
+    if table is not None:
+        pa_csv.write_csv(table, raw_entry)
+        return
+    with _text_entry(raw_entry) as text_entry:
+        if ext == ".json":
+            df.to_json(text_entry, orient="records", indent=2)
+        else:
+            df.to_csv(text_entry, index=False)
+
+
+def _stream_str_entry(data: str, ext: str, raw_entry: IO[bytes]) -> None:
+    with _text_entry(raw_entry) as text_entry:
+        for start in range(0, len(data), ZIP_STREAM_CHUNK_SIZE):
+            text_entry.write(data[start : start + ZIP_STREAM_CHUNK_SIZE])
+
+
+def _write_entry_chunks(data: bytes, raw_entry: IO[bytes]) -> None:
+    view = memoryview(data)
+    for start in range(0, len(view), ZIP_STREAM_CHUNK_SIZE):
+        raw_entry.write(view[start : start + ZIP_STREAM_CHUNK_SIZE])
+
+
+def _set_compress_level(zinfo: zipfile.ZipInfo, level: Optional[int]) -> None:
+    """
+    Sets the compression level `ZipFile.open(zinfo, "w")` will use for an entry.
+
+    Python 3.13 exposes it as the public `ZipInfo.compress_level`. Earlier versions have
+    no public way to set it on a `ZipInfo` passed to `open()` (only `writestr()` takes
+    a level), so their private `_compresslevel` is set instead.
+    """
+    if hasattr(zinfo, "compress_level"):
+        zinfo.compress_level = level
+    else:
+        zinfo._compresslevel = level
+
+
+def _is_large_zip_entry(data_item: Any) -> bool:
+    """Whether `data_item` should be streamed rather than serialized in memory."""
+    if isinstance(data_item, pd.DataFrame):
+        size = int(data_item.memory_usage(index=False, deep=False).sum())
+    elif isinstance(data_item, str):
+        size = len(data_item)
+    else:
+        return False
+    return size >= ZIP_STREAM_MIN_SIZE
+
+
+# Streaming counterparts of _ZIP_SERIALIZERS for the types whose serialized form can
+# be much larger than the item itself. Each writes the item incrementally into a
+# binary stream, which the zip writer spools to a temporary file: a failure halfway
+# through then never leaves a truncated entry in the archive. JSON payloads are not
+# streamed, as they are serialized in full (and fail cleanly) before being written.
+_ZIP_STREAMERS: Dict[type, Callable[[Any, str, IO[bytes]], None]] = {
+    pd.DataFrame: _stream_df_entry,
+    str: _stream_str_entry,
+}
+
+
+def _write_xlsx_fast(filepath: Path, data: pd.DataFrame) -> bool:
+    """
+    Writes `data` to an .xlsx file with a Rust-backed writer, if one is installed.
+
+    Prefers jetxl (via an Arrow table, which needs PyArrow), then rustpy-xlsxwriter.
+    Returns False when neither can write the frame, in which case pandas should be used.
+    """
+    if jetxl is not None and pa is not None:
+        try:
+            table = pa.Table.from_pandas(data, preserve_index=False)
+            jetxl.write_sheet_arrow(table, str(filepath))
+            return True
+        except Exception as e:
+            logger.debug(f"jetxl could not write '{filepath}', falling back: {e}")
+    if rustpy_xlsxwriter is not None:
+        try:
+            rustpy_xlsxwriter.write_worksheet(data, str(filepath))
+            return True
+        except Exception as e:
+            logger.debug(
+                f"rustpy-xlsxwriter could not write '{filepath}', falling back: {e}"
+            )
+    return False
+
+
+@functools.cache
+def _openpyxl_available() -> bool:
+    """Checks once per process whether openpyxl is installed, without importing it."""
+    return importlib.util.find_spec("openpyxl") is not None
+
+
+def _write_dataframe_file(
+    filepath: Path, data: pd.DataFrame, fast_excel: bool = False
+) -> None:
+    ext = filepath.suffix.lower()
+    if ext == ".xlsx" and fast_excel and _write_xlsx_fast(filepath, data):
+        return
+    if ext == ".csv":
+        _write_csv_file(filepath, data)
+    elif ext == ".json":
+        data.to_json(filepath, orient="records", indent=2)
+    elif ext == ".parquet":
+        _write_parquet(data, str(filepath))
+    elif ext in [".xlsx", ".xls"]:
+        dep = "openpyxl"
+        # Ensure openpyxl is available for .xlsx (pandas imports it lazily in to_excel).
+        # For .xls, pandas might try xlwt or openpyxl. Let's suggest openpyxl as it's more common.
+        if ext == ".xlsx" and not _openpyxl_available():
+            raise ExportError(
+                f"Writing to Excel format ('{ext}') requires '{dep}'. Please install it."
+            )
+        try:
+            data.to_excel(filepath, index=False)
+        except ImportError:
+            raise ExportError(
+                f"Writing to Excel format ('{ext}') requires '{dep}'. Please install it."
+            )
+    else:  # Default to CSV for unknown extensions for DataFrame
+        csv_path = filepath.with_suffix(".csv")
+        logger.warning(
+            f"Unsupported DataFrame extension '{ext}' for file '{filepath.name}'. Writing as CSV to '{csv_path}'."
+        )
+        _write_csv_file(csv_path, data)
+
+
+def _write_csv_file(filepath: Path, data: pd.DataFrame) -> None:
+    """Writes a DataFrame as CSV without its index, using PyArrow when eligible."""
+    table = _arrow_table_for_csv(data)
+    if table is not None:
+        pa_csv.write_csv(table, str(filepath))
+    else:
+        data.to_csv(filepath, index=False)
+
+
+def _write_json_file(filepath: Path, data: Any) -> None:
+    payload = _orjson_bytes(data)
+    if payload is not None:
+        with open(filepath, "wb") as f:
+            f.write(payload)
+        return
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def _write_text_file(filepath: Path, data: str) -> None:
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write(data)
+
+
+def _write_bytes_file(filepath: Path, data: bytes) -> None:
+    if len(data) <= LARGE_BYTES_WRITE_THRESHOLD:
+        with open(filepath, "wb") as f:
+            f.write(data)
+        return
+    # Unbuffered, in page-sized memoryview slices: no intermediate copies of the payload.
+    view = memoryview(data)
+    with open(filepath, "wb", buffering=0) as f:
+        offset = 0
+        while offset < len(view):
+            offset += f.write(view[offset : offset + FILE_WRITE_CHUNK_SIZE])
+
+
+# Writers for standalone output files, keyed by result type.
+_FILE_WRITERS: Dict[type, Callable[[Path, Any], None]] = {
+    pd.DataFrame: _write_dataframe_file,
+    dict: _write_json_file,
+    list: _write_json_file,
+    str: _write_text_file,
+    bytes: _write_bytes_file,
+}
+
+
+@functools.singledispatch
+def _source_items(sdif: Any, db_schema_prefix: str) -> List[Tuple[str, SDIFPath]]:
+    """Returns the (schema name, SDIF path) pairs for a `transform()` input."""
+    raise TypeError(
+        f"Unsupported type for 'sdif' argument: {type(sdif)}. "
+        "Expected str, Path, list, dict, or SDIFDatabase."
+    )
+
+
+@_source_items.register(str)
+@_source_items.register(Path)
+def _(sdif: SDIFPath, db_schema_prefix: str) -> List[Tuple[str, SDIFPath]]:
+    return [(f"{db_schema_prefix}1", sdif)]
+
+
+@_source_items.register(list)
+def _(sdif: List[SDIFPath], db_schema_prefix: str) -> List[Tuple[str, SDIFPath]]:
+    return [(f"{db_schema_prefix}{i + 1}", item) for i, item in enumerate(sdif)]
+
+
+@_source_items.register(dict)
+def _(sdif: Dict[str, SDIFPath], db_schema_prefix: str) -> List[Tuple[str, SDIFPath]]:
+    return list(sdif.items())
 
 
 class CodeTransformer(Transformer):
@@ -50,11 +575,43 @@ class CodeTransformer(Transformer):
                        or make available in the executor's global scope.
         db_schema_prefix: Prefix for auto-generated schema names when a list of SDIFs is given.
                           Defaults to "db".
+        parallel: If True (default), serialize multiple output files concurrently on a
+                  thread pool when exporting. Zip archives are still written by a single
+                  thread, and entries of `ZIP_STREAM_MIN_SIZE` or more are streamed into
+                  them in both modes, so peak memory stays bounded. Set to False to
+                  write outputs one by one.
+        analyze_on_attach: If True, refresh SQLite planner statistics on each attached
+                           SDIF before running a direct callable, so multi-SDIF joins get
+                           sensible query plans. Note that this modifies the input files:
+                           it writes a `sqlite_stat1` table into every writable SDIF (and
+                           `close()` refreshes it for cached connections). Defaults to
+                           False, so `transform()` leaves its inputs untouched.
+        cache_connections: If True, keep the SQLite connection (with its ATTACHed SDIFs and
+                           statistics) open between `transform()` calls on the same sources
+                           when using a direct callable, instead of rebuilding it each time.
+                           Cached connections are released by `close()` or by using the
+                           transformer as a context manager. Defaults to False.
+        mmap_size: Bytes of each attached SDIF that SQLite may memory-map when a direct
+                   callable runs (`PRAGMA mmap_size`), replacing read() calls with page-cache
+                   access. Defaults to 256 MiB; 0 disables memory-mapping.
+        read_chunk_size: Rows per chunk for the `read_sql_chunked` helper that direct
+                         callables receive in `context`. Defaults to 100,000.
+        strict_resolve: If True, resolve symlinks in input SDIF paths (like `Path.resolve()`).
+                        By default paths are only made absolute, which needs no filesystem
+                        lookups.
+        fast_excel: If True, write DataFrames to `.xlsx` files with a Rust-backed writer
+                    (jetxl, else rustpy-xlsxwriter) when one is installed, which is much
+                    faster than openpyxl on large frames. Cell styling differs slightly
+                    from pandas' `to_excel`. Falls back to pandas when neither is
+                    available. Defaults to False (pandas with openpyxl).
     Transformation Function Signature:
         The transform function should accept these parameters:
         - `conn` (sqlite3.Connection): A connection to an in-memory SQLite
           database with all input SDIF files attached as schemas.
-        - `context` (Dict[str, Any], optional): Extra context values if needed.
+        - `context` (Dict[str, Any], optional): Extra context values if needed. For direct
+          callables it also holds `read_sql_chunked(sql, conn)`, which behaves like
+          `pd.read_sql_query` but yields DataFrames of `read_chunk_size` rows, so large
+          tables can be streamed instead of loaded whole.
 
         The function MUST return a dictionary (`Dict[str, Any]`) where:
         - Keys (str): Relative output filenames (e.g., "orders_extract.csv", "summary/report.json").
@@ -91,14 +648,41 @@ class CodeTransformer(Transformer):
         code_executor: Optional[CodeExecutor] = None,
         extra_context: Optional[Dict[str, Any]] = None,
         db_schema_prefix: str = "db",
+        parallel: bool = True,
+        analyze_on_attach: bool = False,
+        cache_connections: bool = False,
+        mmap_size: int = DEFAULT_SQLITE_MMAP_SIZE,
+        read_chunk_size: int = DEFAULT_READ_CHUNK_SIZE,
+        strict_resolve: bool = False,
+        fast_excel: bool = False,
     ):
         self.transform_function_obj: Optional[Callable] = None
+        self._transform_param_count: Optional[int] = None
         self.transform_code: Optional[str] = None
+        self.transform_code_obj: Optional[CodeType] = None
         self.function_name = (
             function_name  # Will be overridden if function is callable and has a name
         )
         self.extra_context = extra_context or {}
         self.db_schema_prefix = db_schema_prefix
+        self.parallel = parallel
+        self.analyze_on_attach = analyze_on_attach
+        self.cache_connections = cache_connections
+        self.mmap_size = mmap_size
+        self.read_chunk_size = read_chunk_size
+        self.strict_resolve = strict_resolve
+        self._resolved_target_dirs: Dict[Path, Path] = {}
+        self.fast_excel = fast_excel
+        self._file_writers = _FILE_WRITERS
+        if fast_excel:
+            self._file_writers = {
+                **_FILE_WRITERS,
+                pd.DataFrame: functools.partial(_write_dataframe_file, fast_excel=True),
+            }
+        # (schema, path) pairs -> (connection, attached schemas), used when cache_connections is True
+        self._conn_cache: Dict[
+            Tuple[Tuple[str, str], ...], Tuple[sqlite3.Connection, Dict[str, Path]]
+        ] = {}
         self._original_function_input = function  # Store for _init_transform_logic
         self.code_executor = code_executor
 
@@ -117,10 +701,9 @@ class CodeTransformer(Transformer):
             )
             logger.debug(f"Initialized with direct callable: {self.function_name}")
         elif isinstance(function_input, str):
-            if (
-                function_input in _TRANSFORMATION_REGISTRY
-            ):  # Is it a name of a registered function?
-                self.transform_function_obj = _TRANSFORMATION_REGISTRY[function_input]
+            registered = _TRANSFORMATION_REGISTRY.get(function_input)
+            if registered is not None:  # Is it a name of a registered function?
+                self.transform_function_obj = registered
                 self.function_name = function_input  # The key is the name
                 logger.debug(
                     f"Initialized with registered callable: {self.function_name}"
@@ -138,8 +721,10 @@ class CodeTransformer(Transformer):
                     self.code_executor = LocalCodeExecutor()
         elif isinstance(function_input, Path):
             try:
-                with open(function_input, encoding="utf-8") as f:
-                    self.transform_code = f.read()
+                st = function_input.stat()
+                self.transform_code = _load_script(
+                    str(function_input), st.st_mtime_ns, st.st_size
+                )
                 # self.function_name was already set in __init__ (or default 'transform')
                 logger.debug(
                     f"Initialized with code from file '{function_input}' for executor. Target function: '{self.function_name}'"
@@ -159,6 +744,12 @@ class CodeTransformer(Transformer):
                 "Expected callable, string (code or registered name), or Path."
             )
 
+        if self.transform_function_obj:
+            # The signature is stable, so inspect it once rather than on every transform() call.
+            self._transform_param_count = len(
+                inspect.signature(self.transform_function_obj).parameters
+            )
+
         if not self.transform_function_obj and not self.transform_code:
             # This state should ideally be prevented by the logic above
             raise ValueError(
@@ -175,6 +766,22 @@ class CodeTransformer(Transformer):
                 "A code_executor is required when transformation logic is a code string or file path."
             )
 
+        # Executors written against an older satif-core lack `accepts_code_objects`.
+        if self.transform_code and getattr(
+            self.code_executor, "accepts_code_objects", False
+        ):
+            # Compile once so executors that accept code objects skip the parse on every call.
+            filename = (
+                str(function_input)
+                if isinstance(function_input, Path)
+                else "<code_string>"
+            )
+            try:
+                self.transform_code_obj = compile(self.transform_code, filename, "exec")
+            except SyntaxError:
+                # Leave it to the executor, which reports it as a CodeExecutionError.
+                self.transform_code_obj = None
+
     def transform(
         self,
         sdif: Union[SDIFPath, List[SDIFPath], SDIFDatabase, Dict[str, SDIFPath]],
@@ -220,35 +827,26 @@ class CodeTransformer(Transformer):
 
         # Case 2: Input is SDIFPath, List[SDIFPath], or Dict[str, SDIFPath]
         # Prepare sdif_sources_map for both direct callable and executor paths.
-        sdif_sources_map: Dict[str, Path] = {}
-        raw_paths: List[Path] = []  # For validation
-
-        if isinstance(sdif, (str, Path)):
-            p = Path(sdif).resolve()
-            raw_paths.append(p)
-            sdif_sources_map = {f"{self.db_schema_prefix}1": p}
-        elif isinstance(sdif, list):
-            for i, item in enumerate(sdif):
-                p = Path(item).resolve()
-                raw_paths.append(p)
-                sdif_sources_map[f"{self.db_schema_prefix}{i + 1}"] = p
-        elif isinstance(sdif, dict):
-            for schema_name, path_item in sdif.items():
-                p = Path(path_item).resolve()
-                raw_paths.append(p)
-                sdif_sources_map[schema_name] = p
-        else:
-            raise TypeError(
-                f"Unsupported type for 'sdif' argument: {type(sdif)}. "
-                "Expected str, Path, list, dict, or SDIFDatabase."
-            )
+        source_items = _source_items(sdif, self.db_schema_prefix)
+
+        # abspath is pure string work; resolving symlinks costs an lstat per path component.
+        to_absolute = os.path.realpath if self.strict_resolve else os.path.abspath
+        sdif_sources_map: Dict[str, Path] = {
+            schema_name: Path(to_absolute(os.fspath(path_item)))
+            for schema_name, path_item in source_items
+        }
+        raw_paths: List[Path] = list(sdif_sources_map.values())  # For validation
 
         if not sdif_sources_map:
             raise ValueError("No input SDIF sources were resolved.")
 
-        # Validate all source files exist before proceeding
+        # Validate all source files exist before proceeding (one stat() per file)
         for path_to_check in raw_paths:
-            if not path_to_check.exists() or not path_to_check.is_file():
+            try:
+                is_regular_file = stat.S_ISREG(os.stat(path_to_check).st_mode)
+            except OSError:
+                is_regular_file = False
+            if not is_regular_file:
                 raise FileNotFoundError(f"Input SDIF file not found: {path_to_check}")
 
         # --- Execution path decision based on initialized transform logic ---
@@ -258,9 +856,11 @@ class CodeTransformer(Transformer):
             )
             db_conn: Optional[sqlite3.Connection] = None
             attached_schemas: Dict[str, Path] = {}
+            is_cached_conn = False
             try:
-                # Use db_utils to setup connection and attach sources
-                db_conn, attached_schemas = create_db_connection(sdif_sources_map)
+                db_conn, attached_schemas, is_cached_conn = self._open_db_connection(
+                    sdif_sources_map
+                )
 
                 return self._execute_transformation(conn=db_conn)
             except (
@@ -276,7 +876,8 @@ class CodeTransformer(Transformer):
                     f"Database error during direct callable execution: {e}"
                 ) from e
             finally:
-                if db_conn:  # Only cleanup if CodeTransformer created the connection
+                # Only cleanup if CodeTransformer created the connection for this call
+                if db_conn and not is_cached_conn:
                     cleanup_db_connection(db_conn, attached_schemas, should_close=True)
 
         elif self.transform_code:  # Path 2: Code string/file to be run by an executor
@@ -299,6 +900,103 @@ class CodeTransformer(Transformer):
                 "Transformation logic (callable or code) is not properly initialized."
             )
 
+    def _open_db_connection(
+        self, sdif_sources_map: Dict[str, Path]
+    ) -> Tuple[sqlite3.Connection, Dict[str, Path], bool]:
+        """
+        Returns a connection with all sources attached, and whether it is owned by the cache.
+
+        With `cache_connections`, a connection built for the same sources is reused
+        instead of re-creating the database and re-running every ATTACH.
+        """
+        cache_key = tuple(
+            sorted((schema, str(path)) for schema, path in sdif_sources_map.items())
+        )
+        if self.cache_connections and cache_key in self._conn_cache:
+            db_conn, attached_schemas = self._conn_cache[cache_key]
+            return db_conn, attached_schemas, True
+
+        # Use db_utils to setup connection and attach sources
+        db_conn, attached_schemas = create_db_connection(sdif_sources_map)
+        self._tune_attached_schemas(db_conn, attached_schemas)
+        if self.analyze_on_attach:
+            self._optimize_attached_schemas(db_conn, attached_schemas)
+
+        if self.cache_connections:
+            self._conn_cache[cache_key] = (db_conn, attached_schemas)
+            return db_conn, attached_schemas, True
+        return db_conn, attached_schemas, False
+
+    def close(self) -> None:
+        """Closes the database connections kept open by `cache_connections`."""
+        while self._conn_cache:
+            _, (db_conn, attached_schemas) = self._conn_cache.popitem()
+            if self.analyze_on_attach:
+                # Persist statistics for the queries run on this long-lived connection.
+                for schema_name in attached_schemas:
+                    try:
+                        db_conn.execute(f"PRAGMA {schema_name}.optimize")
+                    except sqlite3.Error as e:
+                        logger.debug(
+                            f"Could not optimize attached schema '{schema_name}': {e}"
+                        )
+            cleanup_db_connection(db_conn, attached_schemas, should_close=True)
+
+    def __enter__(self) -> "CodeTransformer":
+        """Context manager enter method."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit method; closes cached connections."""
+        self.close()
+
+    def _tune_attached_schemas(
+        self, conn: sqlite3.Connection, attached_schemas: Dict[str, Path]
+    ) -> None:
+        """Sizes the page cache and memory-mapping of attached SDIFs for large scans."""
+        try:
+            conn.execute("PRAGMA temp_store = MEMORY")
+            for schema_name in attached_schemas:
+                conn.execute(f"PRAGMA {schema_name}.mmap_size = {int(self.mmap_size)}")
+                conn.execute(
+                    f"PRAGMA {schema_name}.cache_size = -{SQLITE_CACHE_SIZE_KIB}"
+                )
+        except sqlite3.Error as e:
+            logger.debug(f"Could not apply SQLite tuning pragmas: {e}")
+
+    def _optimize_attached_schemas(
+        self, conn: sqlite3.Connection, attached_schemas: Dict[str, Path]
+    ) -> None:
+        """
+        Gathers planner statistics for attached SDIFs before user queries run.
+
+        Schemas that were never analyzed get a full `ANALYZE`; the others get
+        `PRAGMA optimize`, which only re-analyzes tables whose statistics are stale.
+        Failures (e.g. read-only files) are logged and ignored.
+        """
+        for schema_name in attached_schemas:
+            try:
+                has_stats = conn.execute(
+                    f"SELECT 1 FROM {schema_name}.sqlite_master "
+                    "WHERE type = 'table' AND name = 'sqlite_stat1'"
+                ).fetchone()
+                if has_stats:
+                    conn.execute(f"PRAGMA {schema_name}.optimize(0x10002)")
+                else:
+                    conn.execute(f"ANALYZE {schema_name}")
+            except sqlite3.Error as e:
+                logger.debug(f"Could not analyze attached schema '{schema_name}': {e}")
+
+    def _check_str_keys_distinct(
+        self, result: Dict[Any, Any], str_keyed_result: Dict[str, Any]
+    ) -> None:
+        """Raises ExportError if converting `result`'s keys to str merged any of them."""
+        if len(str_keyed_result) != len(result):
+            raise ExportError(
+                f"Transformation function '{self.function_name}' returned keys that "
+                "collide once converted to strings (e.g. 1 and '1')."
+            )
+
     def _execute_transformation(
         self,
         conn: Optional[sqlite3.Connection] = None,
@@ -327,17 +1025,20 @@ class CodeTransformer(Transformer):
                 logger.debug(
                     f"Executing direct callable '{self.function_name}' with provided connection."
                 )
-                sig = inspect.signature(self.transform_function_obj)
-                param_count = len(sig.parameters)
+                param_count = self._transform_param_count or 0
 
                 if param_count == 1:  # Expects only conn
                     result = self.transform_function_obj(conn=conn)
                 elif (
                     param_count >= 2
                 ):  # Expects conn and context (and potentially others)
-                    result = self.transform_function_obj(
-                        conn=conn, context=self.extra_context
-                    )
+                    context = {
+                        "read_sql_chunked": functools.partial(
+                            pd.read_sql_query, chunksize=self.read_chunk_size
+                        ),
+                        **self.extra_context,
+                    }
+                    result = self.transform_function_obj(conn=conn, context=context)
                 else:  # Should have at least 'conn'
                     raise ExportError(
                         f"Directly provided transformation function '{self.function_name}' "
@@ -359,7 +1060,7 @@ class CodeTransformer(Transformer):
                     f"Delegating to code_executor for '{self.function_name}'. Sources: {sdif_sources_for_executor}"
                 )
                 result = self.code_executor.execute(
-                    code=self.transform_code,
+                    code=self.transform_code_obj or self.transform_code,
                     function_name=self.function_name,
                     sdif_sources=sdif_sources_for_executor,
                     extra_context=self.extra_context,
@@ -377,7 +1078,12 @@ class CodeTransformer(Transformer):
                     f"must return a dictionary, but got {type(result)}."
                 )
 
-            return {str(k): v for k, v in result.items()}
+            # Keys are documented as strings; only rebuild the dict when one is not.
+            if all(type(k) is str for k in result):
+                return result
+            str_keyed_result = {str(k): v for k, v in result.items()}
+            self._check_str_keys_distinct(result, str_keyed_result)
+            return str_keyed_result
 
         except (
             CodeExecutionError
@@ -409,6 +1115,8 @@ class CodeTransformer(Transformer):
         sdif: Union[SDIFPath, List[SDIFPath], SDIFDatabase, Dict[str, SDIFPath]],
         output_path: FilePath = Path("."),
         zip_archive: bool = False,
+        zip_compression: int = DEFAULT_ZIP_COMPRESSION,
+        zip_compresslevel: Optional[int] = DEFAULT_ZIP_COMPRESSLEVEL,
     ) -> Path:
         """
         Transforms data from SDIF input(s) and exports results to files.
@@ -424,6 +1132,12 @@ class CodeTransformer(Transformer):
                          or directory (if multiple outputs). Defaults to current directory.
             zip_archive: If True, package all output files into a single ZIP archive
                          at the specified output_path.
+            zip_compression: Compression method for the ZIP archive (a `zipfile` constant,
+                             e.g. `zipfile.ZIP_DEFLATED` or `zipfile.ZIP_STORED` for speed;
+                             `zipfile.ZIP_ZSTANDARD` on Python 3.14+). Ignored unless
+                             `zip_archive` is True.
+            zip_compresslevel: Compression level passed to `zipfile.ZipFile`. Defaults to 1,
+                               the fastest deflate level; None uses the library default.
 
         Returns:
             Path to the created output file or directory.
@@ -436,7 +1150,11 @@ class CodeTransformer(Transformer):
         """
         transformed_data = self.transform(sdif=sdif)
         return self._export_data(
-            data=transformed_data, output_path=output_path, zip_archive=zip_archive
+            data=transformed_data,
+            output_path=output_path,
+            zip_archive=zip_archive,
+            zip_compression=zip_compression,
+            zip_compresslevel=zip_compresslevel,
         )
 
     def _export_data(
@@ -444,6 +1162,8 @@ class CodeTransformer(Transformer):
         data: Dict[str, Any],
         output_path: FilePath = Path("."),
         zip_archive: bool = False,
+        zip_compression: int = DEFAULT_ZIP_COMPRESSION,
+        zip_compresslevel: Optional[int] = DEFAULT_ZIP_COMPRESSLEVEL,
     ) -> Path:
         """
         Exports the transformed data to files or a zip archive.
@@ -456,6 +1176,8 @@ class CodeTransformer(Transformer):
                          or directory (if multiple outputs). Defaults to current directory.
             zip_archive: If True, package all output files into a single ZIP archive
                          at the specified output_path.
+            zip_compression: Compression method for the ZIP archive.
+            zip_compresslevel: Compression level for the ZIP archive (None for the library default).
 
         Returns:
             Path to the created output file or directory.
@@ -473,7 +1195,9 @@ class CodeTransformer(Transformer):
                 f"Exporting {len(data)} items to write to {resolved_output_path}."
             )
             if zip_archive:
-                self._write_zip(data)
+                self._write_zip(
+                    data, compression=zip_compression, compresslevel=zip_compresslevel
+                )
             else:
                 self._write_files(data)
             return self._current_output_path
@@ -491,6 +1215,20 @@ class CodeTransformer(Transformer):
                 "Internal error: Output path not set before writing files."
             )
         output_dir_or_file = self._current_output_path
+
+        # Fast path for the common single-output export to a named file: one stat
+        # (to rule out a directory such as 'out.d') instead of the probes below.
+        if (
+            len(data_to_write) == 1
+            and output_dir_or_file.suffix
+            and not output_dir_or_file.is_dir()
+        ):
+            output_dir_or_file.parent.mkdir(parents=True, exist_ok=True)
+            self._write_output_file(
+                output_dir_or_file, next(iter(data_to_write.values()))
+            )
+            return
+
         target_dir: Path
         is_single_file_output = False
 
@@ -526,38 +1264,89 @@ class CodeTransformer(Transformer):
 
         target_dir.mkdir(parents=True, exist_ok=True)
 
-        for filename_key, data_content in data_to_write.items():
-            output_filepath: Path
-            if is_single_file_output:
-                # For a single file output, the user-provided path is the final one.
-                # The filename_key from results is not used for path construction here, output_dir_or_file is the direct target.
-                output_filepath = output_dir_or_file
-                # It's good practice to ensure the output_dir_or_file itself (which is the target path)
-                # is within the intended parent (target_dir) if we were to be extremely rigorous,
-                # but _sanitize_output_filename is primarily for keys from transformation results.
-                # The creation of output_filepath from output_dir_or_file already implies user intent for this exact path.
+        write_tasks: List[Tuple[Path, Any]]
+        if is_single_file_output:
+            # For a single file output, the user-provided path is the final one; the
+            # filename key from the results is not used for path construction.
+            write_tasks = [(output_dir_or_file, next(iter(data_to_write.values())))]
+        else:
+            # For multiple files, use the sanitized keys relative to the target_dir
+            safe_paths = self._sanitize_output_keys(data_to_write, target_dir)
+            write_tasks = [
+                (output_filepath, data_to_write[filename_key])
+                for filename_key, output_filepath in safe_paths.items()
+            ]
+        for output_filepath, _ in write_tasks:
+            output_filepath.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.parallel and len(write_tasks) > 1:
+            # Each output is independent, so serialization runs concurrently.
+            # pandas/json spend most of their time in C code, so threads scale well.
+            errors: List[Exception] = []
+            with ThreadPoolExecutor(
+                max_workers=min(len(write_tasks), os.cpu_count() or 1)
+            ) as executor:
+                futures = [
+                    executor.submit(self._write_output_file, output_filepath, data)
+                    for output_filepath, data in write_tasks
+                ]
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        errors.append(e)
+            if errors:
+                if len(errors) == 1:
+                    raise errors[0]
+                raise ExportError(
+                    f"Errors writing {len(errors)} output files: "
+                    + "; ".join(str(e) for e in errors)
+                ) from errors[0]
+        else:
+            for output_filepath, data_content in write_tasks:
+                self._write_output_file(output_filepath, data_content)
+
+    def _sanitize_output_keys(
+        self, data_to_write: Dict[str, Any], target_dir: Optional[Path]
+    ) -> Dict[str, Path]:
+        """
+        Sanitizes every result key up front, dropping (and logging) unsafe ones.
+
+        Returns a mapping of the safe keys to their sanitized paths, in result order,
+        so the write loops only iterate entries that will actually be written.
+        """
+        safe_paths: Dict[str, Path] = {}
+        unsafe_keys: List[str] = []
+        # Resolve the target directory once per export rather than once per key.
+        self._resolved_target_dirs = {}
+        for filename_key in data_to_write:
+            safe_path = self._sanitize_output_filename(
+                filename_key, target_dir_for_file=target_dir
+            )
+            if safe_path is None:
+                unsafe_keys.append(filename_key)
             else:
-                # For multiple files, use the sanitized key relative to the target_dir
-                safe_path = self._sanitize_output_filename(
-                    filename_key, target_dir_for_file=target_dir
-                )
-                if safe_path is None:
-                    logger.warning(
-                        f"Skipping unsafe filename key from results: {filename_key}"
-                    )
-                    continue  # Skip unsafe filenames
-                output_filepath = safe_path
+                safe_paths[filename_key] = safe_path
+        if unsafe_keys:
+            logger.warning(f"Skipping unsafe filename keys from results: {unsafe_keys}")
+        return safe_paths
 
-            output_filepath.parent.mkdir(parents=True, exist_ok=True)
-            try:
-                self._write_single_file(output_filepath, data_content)
-                logger.info(f"Successfully wrote output file: {output_filepath}")
-            except Exception as e:
-                if isinstance(e, ExportError):
-                    raise
-                raise ExportError(f"Error writing file {output_filepath}: {e}") from e
+    def _write_output_file(self, output_filepath: Path, data_content: Any) -> None:
+        """Writes one output file, wrapping unexpected errors in `ExportError`."""
+        try:
+            self._write_single_file(output_filepath, data_content)
+            logger.info(f"Successfully wrote output file: {output_filepath}")
+        except Exception as e:
+            if isinstance(e, ExportError):
+                raise
+            raise ExportError(f"Error writing file {output_filepath}: {e}") from e
 
-    def _write_zip(self, data_to_write: Dict[str, Any]) -> None:
+    def _write_zip(
+        self,
+        data_to_write: Dict[str, Any],
+        compression: int = DEFAULT_ZIP_COMPRESSION,
+        compresslevel: Optional[int] = DEFAULT_ZIP_COMPRESSLEVEL,
+    ) -> None:
         if self._current_output_path is None:
             raise ExportError("Internal error: Output path not set before writing zip.")
         output_zip_path = self._current_output_path
@@ -569,125 +1358,171 @@ class CodeTransformer(Transformer):
 
         output_zip_path.parent.mkdir(parents=True, exist_ok=True)
         try:
-            with zipfile.ZipFile(output_zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-                for filename_key, data_item in data_to_write.items():
-                    # Sanitize the filename_key for use as the path within the zip archive
-                    path_in_zip_obj = self._sanitize_output_filename(
-                        filename_key, target_dir_for_file=None
-                    )
-                    if path_in_zip_obj is None:
-                        logger.warning(
-                            f"Skipping unsafe filename key for zip entry: {filename_key}"
-                        )
-                        continue  # Skip unsafe filenames
-
+            with (
+                _isal_zip_deflate(),
+                zipfile.ZipFile(
+                    output_zip_path, "w", compression, compresslevel=compresslevel
+                ) as zipf,
+            ):
+                safe_paths = self._sanitize_output_keys(data_to_write, None)
+                entries: List[Tuple[str, str, str, Any]] = []
+                zinfos: List[zipfile.ZipInfo] = []
+                for filename_key, path_in_zip_obj in safe_paths.items():
+                    data_item = data_to_write[filename_key]
                     archive_name = path_in_zip_obj.as_posix()
                     original_ext = (
                         Path(filename_key).suffix.lower()
                     )  # Use original key for extension for data conversion logic
-
-                    content_bytes: Optional[bytes] = None
-                    if isinstance(data_item, pd.DataFrame):
-                        current_archive_name_for_df = (
-                            archive_name  # Store name before potential modification
+                    if (
+                        isinstance(data_item, pd.DataFrame)
+                        and original_ext not in _ZIP_DATAFRAME_EXTENSIONS
+                    ):
+                        logger.warning(
+                            f"Unsupported DataFrame extension '{original_ext}' for '{archive_name}' in zip. Writing as CSV."
                         )
-                        try:
-                            if original_ext == ".csv":
-                                content_bytes = data_item.to_csv(index=False).encode(
-                                    "utf-8"
-                                )
-                            elif original_ext == ".json":
-                                content_bytes = data_item.to_json(
-                                    orient="records", indent=2
-                                ).encode("utf-8")
-                            else:
-                                logger.warning(
-                                    f"Unsupported DataFrame extension '{original_ext}' for '{current_archive_name_for_df}' in zip. Writing as CSV."
+                        # Update archive_name to reflect the .csv extension change for this entry
+                        archive_name = path_in_zip_obj.with_suffix(".csv").as_posix()
+                    entries.append(
+                        (filename_key, archive_name, original_ext, data_item)
+                    )
+                    zinfos.append(self._new_zip_entry(zipf, archive_name))
+
+                if self.parallel and len(entries) > 1:
+                    # Serialize entries concurrently, but funnel all writes through this
+                    # thread since ZipFile is not thread-safe. At most two payloads per
+                    # worker are in flight, which caps memory, and entries are written
+                    # in submission order so the archive layout matches serial mode.
+                    # Large entries are streamed by this thread instead, once every
+                    # entry before them has been written.
+                    max_workers = min(len(entries), os.cpu_count() or 1)
+                    max_in_flight = 2 * max_workers
+                    pending: Deque[Tuple[str, zipfile.ZipInfo, Future]] = deque()
+
+                    def write_pending(keep: int) -> None:
+                        while len(pending) > keep:
+                            filename_key, done_zinfo, future = pending.popleft()
+                            self._write_zip_entry(
+                                zipf, filename_key, done_zinfo, future.result()
+                            )
+
+                    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                        for entry, zinfo in zip(entries, zinfos):
+                            filename_key, _, original_ext, data_item = entry
+                            if _is_large_zip_entry(data_item):
+                                write_pending(0)
+                                self._stream_zip_entry(
+                                    zipf, filename_key, zinfo, original_ext, data_item
                                 )
-                                # Update archive_name to reflect the .csv extension change for this entry
-                                archive_name = path_in_zip_obj.with_suffix(
-                                    ".csv"
-                                ).as_posix()
-                                content_bytes = data_item.to_csv(index=False).encode(
-                                    "utf-8"
+                                continue
+                            write_pending(max_in_flight - 1)
+                            pending.append(
+                                (
+                                    filename_key,
+                                    zinfo,
+                                    executor.submit(_serialize_entry, *entry),
                                 )
-                        except Exception as df_ex:
-                            logger.error(
-                                f"Error converting DataFrame for '{filename_key}' (to be '{current_archive_name_for_df}') for zip: {df_ex}"
-                            )
-                            continue
-                    elif isinstance(data_item, (dict, list)):
-                        try:
-                            content_bytes = json.dumps(data_item, indent=2).encode(
-                                "utf-8"
-                            )
-                        except Exception as json_ex:
-                            logger.error(
-                                f"Error serializing '{filename_key}' (to be '{archive_name}') to JSON for zip: {json_ex}"
                             )
-                            continue
-                    elif isinstance(data_item, str):
-                        content_bytes = data_item.encode("utf-8")
-                    elif isinstance(data_item, bytes):
-                        content_bytes = data_item
-                    else:
-                        logger.warning(
-                            f"Unsupported data type {type(data_item)} for file '{archive_name}' (from key '{filename_key}') in zip. Skipping."
+                        write_pending(0)
+                else:
+                    for (
+                        filename_key,
+                        archive_name,
+                        original_ext,
+                        data_item,
+                    ), zinfo in zip(entries, zinfos):
+                        self._stream_zip_entry(
+                            zipf, filename_key, zinfo, original_ext, data_item
                         )
-                        continue
-
-                    if content_bytes is not None:
-                        try:
-                            zipf.writestr(
-                                archive_name, content_bytes
-                            )  # Use potentially modified archive_name here
-                        except Exception as zip_write_ex:
-                            logger.error(
-                                f"Error writing file '{archive_name}' (from key '{filename_key}') to zip: {zip_write_ex}"
-                            )
             logger.info(f"Successfully created ZIP archive: {output_zip_path}")
         except Exception as e:
             raise ExportError(f"Error creating ZIP file {output_zip_path}: {e}") from e
 
+    def _write_zip_entry(
+        self,
+        zipf: zipfile.ZipFile,
+        filename_key: str,
+        zinfo: zipfile.ZipInfo,
+        content_bytes: Optional[bytes],
+    ) -> None:
+        """Writes already-serialized bytes to the archive; `None` content is skipped."""
+        if content_bytes is None:
+            return
+        try:
+            zinfo.file_size = len(content_bytes)
+            with zipf.open(zinfo, "w") as raw_entry:
+                _write_entry_chunks(content_bytes, raw_entry)
+        except Exception as zip_write_ex:
+            logger.error(
+                f"Error writing file '{zinfo.filename}' (from key '{filename_key}') to zip: {zip_write_ex}"
+            )
+
+    def _stream_zip_entry(
+        self,
+        zipf: zipfile.ZipFile,
+        filename_key: str,
+        zinfo: zipfile.ZipInfo,
+        original_ext: str,
+        data_item: Any,
+    ) -> None:
+        """
+        Writes one result item into a zip entry, streaming it when it is large.
+
+        DataFrames and strings of at least `ZIP_STREAM_MIN_SIZE` are streamed into a
+        temporary file first and only copied into the archive once fully serialized,
+        so an item that fails halfway is skipped rather than left truncated. Other
+        items are serialized to bytes in memory.
+        """
+        streamer = (
+            _find_handler(_ZIP_STREAMERS, data_item)
+            if _is_large_zip_entry(data_item)
+            else None
+        )
+        if streamer is None:
+            self._write_zip_entry(
+                zipf,
+                filename_key,
+                zinfo,
+                _serialize_entry(filename_key, zinfo.filename, original_ext, data_item),
+            )
+            return
+        with tempfile.TemporaryFile() as spool:
+            try:
+                streamer(data_item, original_ext, spool)
+            except Exception as stream_ex:
+                logger.error(
+                    f"Error serializing '{filename_key}' (to be '{zinfo.filename}') for zip: {stream_ex}"
+                )
+                return
+            zinfo.file_size = spool.tell()
+            spool.seek(0)
+            with zipf.open(zinfo, "w") as raw_entry:
+                shutil.copyfileobj(spool, raw_entry, ZIP_STREAM_CHUNK_SIZE)
+
+    def _new_zip_entry(
+        self, zipf: zipfile.ZipFile, archive_name: str
+    ) -> zipfile.ZipInfo:
+        """
+        Builds the `ZipInfo` for an entry, using the archive's compression settings.
+
+        Already-compressed payloads (see `PRECOMPRESSED_SUFFIXES`) are stored instead.
+        """
+        zinfo = zipfile.ZipInfo(archive_name, date_time=ZIP_ENTRY_DATE_TIME)
+        if os.path.splitext(archive_name)[1].lower() in PRECOMPRESSED_SUFFIXES:
+            zinfo.compress_type = zipfile.ZIP_STORED
+        else:
+            zinfo.compress_type = zipf.compression
+            _set_compress_level(zinfo, zipf.compresslevel)
+        zinfo.external_attr = 0o644 << 16  # -rw-r--r--
+        return zinfo
+
     def _write_single_file(self, filepath: Path, data: Any) -> None:
         try:
-            if isinstance(data, pd.DataFrame):
-                ext = filepath.suffix.lower()
-                if ext == ".csv":
-                    data.to_csv(filepath, index=False)
-                elif ext == ".json":
-                    data.to_json(filepath, orient="records", indent=2)
-                elif ext in [".xlsx", ".xls"]:
-                    try:
-                        # Ensure openpyxl is available for .xlsx, xlwt for .xls (though pandas might use openpyxl for .xls too)
-                        if ext == ".xlsx":
-                            import openpyxl  # type: ignore # noqa: F401
-                        # For .xls, pandas might try xlwt or openpyxl. Let's suggest openpyxl as it's more common.
-                        data.to_excel(filepath, index=False)
-                    except ImportError:
-                        dep = "openpyxl"
-                        raise ExportError(
-                            f"Writing to Excel format ('{ext}') requires '{dep}'. Please install it."
-                        )
-                else:  # Default to CSV for unknown extensions for DataFrame
-                    csv_path = filepath.with_suffix(".csv")
-                    logger.warning(
-                        f"Unsupported DataFrame extension '{ext}' for file '{filepath.name}'. Writing as CSV to '{csv_path}'."
-                    )
-                    data.to_csv(csv_path, index=False)
-            elif isinstance(data, (dict, list)):
-                with open(filepath, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2)
-            elif isinstance(data, str):
-                with open(filepath, "w", encoding="utf-8") as f:
-                    f.write(data)
-            elif isinstance(data, bytes):
-                with open(filepath, "wb") as f:
-                    f.write(data)
-            else:
+            writer = _find_handler(self._file_writers, data)
+            if writer is None:
                 raise TypeError(
                     f"Unsupported data type '{type(data)}' for writing to file '{filepath.name}'."
                 )
+            writer(filepath, data)
         except Exception as e:
             if isinstance(e, ExportError):
                 raise  # Re-raise if already our specific error type
@@ -710,23 +1545,26 @@ class CodeTransformer(Transformer):
             - For zip output (target_dir_for_file is None): Relative Path object if safe.
             - None if the path is unsafe.
         """
-        p_filename = Path(filename_key)
-        if ".." in p_filename.parts or p_filename.is_absolute():
+        p_filename = None
+        if not _PARENT_DIR_RE.search(filename_key):
+            p_filename = Path(filename_key)
+        if p_filename is None or p_filename.is_absolute():
             logger.error(
                 f"Skipping potentially unsafe filename key (contains '..' or is absolute): '{filename_key}'"
             )
             return None
 
         if target_dir_for_file:
-            resolved_target_dir = target_dir_for_file.resolve()
+            resolved_target_dir = self._resolved_target_dirs.get(target_dir_for_file)
+            if resolved_target_dir is None:
+                resolved_target_dir = target_dir_for_file.resolve()
+                self._resolved_target_dirs[target_dir_for_file] = resolved_target_dir
+            # The joined path is still resolved so symlinks pointing outside are caught.
             abs_filepath = (resolved_target_dir / p_filename).resolve()
 
-            # Check if resolved_target_dir is a parent of abs_filepath, or if they are the same path.
-            # This robustly checks for containment.
-            if (
-                resolved_target_dir != abs_filepath
-                and resolved_target_dir not in abs_filepath.parents
-            ):
+            # Containment check: the target dir must be abs_filepath itself or one of its parents.
+            target_str = str(resolved_target_dir)
+            if os.path.commonpath([target_str, str(abs_filepath)]) != target_str:
                 logger.error(
                     f"Skipping filename '{filename_key}' which resolves outside target directory '{resolved_target_dir}'. Resolved: '{abs_filepath}'"
                 )
@@ -762,11 +1600,14 @@ def transformation(func=None, name=None):
         transform_name = name or f.__name__
         if not isinstance(transform_name, str) or not transform_name:
             raise ValueError("Transformation name must be a non-empty string.")
-        if transform_name in _TRANSFORMATION_REGISTRY:
+        with _REGISTRY_LOCK:
+            existing = _TRANSFORMATION_REGISTRY.get(transform_name)
+            _TRANSFORMATION_REGISTRY[transform_name] = f
+        # Re-registering the same function (e.g. on module reload) is not an overwrite.
+        if existing is not None and existing is not f:
             logger.warning(
                 f"Transformation name '{transform_name}' is already registered. Overwriting."
             )
-        _TRANSFORMATION_REGISTRY[transform_name] = f
         # Add attributes to the function itself for identification
         setattr(f, "_is_transformation", True)
         setattr(f, "_transform_name", transform_name)
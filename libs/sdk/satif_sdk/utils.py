@@ -12,6 +12,11 @@ from typing import (
     Union,
 )
 
+try:
+    from cchardet import detect as _cchardet_detect
+except ImportError:
+    _cchardet_detect = None
+
 T = TypeVar("T")
 
 
@@ -35,27 +40,32 @@ SkipColumnsConfig = Optional[
 ]
 
 ENCODING_SAMPLE_SIZE = 1024 * 12  # Bytes for encoding detection
+# cchardet is fast enough that a larger sample improves accuracy at no real cost.
+CCHARDET_ENCODING_SAMPLE_SIZE = 1024 * 64
+# Below this cchardet confidence, defer to charset-normalizer (short samples often
+# come back as a low-confidence 'UTF-8' guess).
+CCHARDET_MIN_CONFIDENCE = 0.8
+# cchardet answers trusted as-is, mapped to the names charset-normalizer reports for
+# the same input. For any other encoding the two libraries disagree on the code page
+# name (e.g. 'ISO-8859-1' vs 'Windows-1252'), so charset-normalizer decides.
+_CCHARDET_CONFIRMED_ENCODINGS = {
+    "ASCII": "ascii",
+    "UTF-8": "utf-8",
+    "UTF-8-SIG": "UTF-8-SIG",
+}
 DELIMITER_SAMPLE_SIZE = 1024 * 16  # Bytes for delimiter detection
+# Quick delimiter check run before clevercsv: candidates and the sample lines it needs.
+_COMMON_DELIMITERS = (",", ";", "\t", "|")
+_DELIMITER_HEURISTIC_MAX_LINES = 10
+_DELIMITER_HEURISTIC_MIN_LINES = 5
 
 
-def sanitize_sql_identifier(name: str, prefix: str = "item") -> str:
-    """
-    Clean up a string to be a safe SQL identifier.
-    Replaces problematic characters with underscores, ensures it starts with a
-    letter or underscore, and appends an underscore if it's a basic SQL keyword.
-    """
-    name = (
-        name.strip().lower()
-    )  # Trim whitespace and convert to lowercase for snake_case
-    # Replace common problematic characters with underscores
-    name = re.sub(r"[^\w\s-]", "", name)  # Keep word chars, whitespace, hyphen
-    name = re.sub(r"[-\s]+", "_", name)  # Replace hyphens/whitespace with underscore
-    # Ensure it starts with a letter or underscore if not empty
-    safe_name = "".join(c for c in name if c.isalnum() or c == "_")
-
-    # Ensure it's not a reserved SQL keyword (basic check)
-    # TODO: Consider a more comprehensive list of SQL keywords from a library if precision is critical
-    if safe_name.upper() in {
+_SANITIZE_STRIP_RE = re.compile(r"[^\w\s-]")  # Keep word chars, whitespace, hyphen
+_SANITIZE_SEPARATOR_RE = re.compile(r"[-\s]+")
+# Basic SQL keywords that get an underscore appended.
+# TODO: Consider a more comprehensive list of SQL keywords from a library if precision is critical
+_SQL_KEYWORDS = frozenset(
+    {
         "TABLE",
         "SELECT",
         "INSERT",
@@ -71,11 +81,63 @@ def sanitize_sql_identifier(name: str, prefix: str = "item") -> str:
         "CREATE",
         "DROP",
         "VALUES",
-    }:
+    }
+)
+
+
+def sanitize_sql_identifier(name: str, prefix: str = "item") -> str:
+    """
+    Clean up a string to be a safe SQL identifier.
+    Replaces problematic characters with underscores, ensures it starts with a
+    letter or underscore, and appends an underscore if it's a basic SQL keyword.
+    """
+    name = (
+        name.strip().lower()
+    )  # Trim whitespace and convert to lowercase for snake_case
+    # Replace common problematic characters with underscores
+    name = _SANITIZE_STRIP_RE.sub("", name)
+    safe_name = _SANITIZE_SEPARATOR_RE.sub("_", name)
+    # In ASCII, word chars are exactly alphanumerics and '_', so only non-ASCII
+    # names (e.g. with combining marks) need the character filter.
+    if not safe_name.isascii():
+        safe_name = "".join(c for c in safe_name if c.isalnum() or c == "_")
+
+    # Ensure it's not a reserved SQL keyword (basic check)
+    if safe_name.upper() in _SQL_KEYWORDS:
         safe_name = f"{safe_name}_"
     return safe_name or prefix  # Return prefix if name becomes empty
 
 
+def _normalize_none(
+    arg_value: None, arg_name_for_error: str, expected_len: int
+) -> List[Optional[T]]:
+    return [None] * expected_len
+
+
+def _normalize_single(
+    arg_value: T, arg_name_for_error: str, expected_len: int
+) -> List[Optional[T]]:
+    # Any non-list value (including a dict, e.g. a single file config) is repeated.
+    return [arg_value] * expected_len
+
+
+def _normalize_list(
+    arg_value: List[Optional[T]], arg_name_for_error: str, expected_len: int
+) -> List[Optional[T]]:
+    if len(arg_value) != expected_len:
+        raise ValueError(
+            f"{arg_name_for_error} list length ({len(arg_value)}) must match "
+            f"input files count ({expected_len})."
+        )
+    return arg_value
+
+
+_NORMALIZE_DISPATCH = {
+    type(None): _normalize_none,
+    list: _normalize_list,
+}
+
+
 def normalize_list_argument(
     arg_value: Optional[Union[T, List[Optional[T]]]],
     arg_name_for_error: str,
@@ -89,35 +151,11 @@ def normalize_list_argument(
     If arg_value is a list, its length must match expected_len.
     If arg_value is None, a list of Nones of expected_len is returned.
     """
-    if arg_value is None:
-        return [None] * expected_len
-
-    # isinstance check for dict should be specific if T can be Dict,
-    # but for general purpose, checking if it's NOT a list first is safer.
-    if not isinstance(arg_value, list) or isinstance(
-        arg_value, dict
-    ):  # Treat dict as a single item unless T is List[Dict] explicitly
-        # Special handling for file_configs which can be a single dict
-        if arg_name_for_error == "File configs" and isinstance(arg_value, dict):
-            return [arg_value] * expected_len  # type: ignore -> T might be Dict
-        # General case for single items (non-list)
-        if not isinstance(arg_value, list):
-            return [arg_value] * expected_len  # type: ignore -> T might be T
-
-    # If it is a list
-    if isinstance(arg_value, list):
-        if len(arg_value) != expected_len:
-            raise ValueError(
-                f"{arg_name_for_error} list length ({len(arg_value)}) must match "
-                f"input files count ({expected_len})."
-            )
-        return arg_value  # type: ignore -> T might be List[Optional[T]]
-
-    # Fallback, though logically the above should cover typical single item or list cases.
-    # This might be hit if T is complex and isn't caught by 'not isinstance(arg_value, list)'
-    # For instance, if arg_value is a custom iterable object that isn't a list.
-    # Defaulting to repeating it if it's not a list.
-    return [arg_value] * expected_len  # type: ignore
+    handler = _NORMALIZE_DISPATCH.get(type(arg_value))
+    if handler is None:
+        # List subclasses still count as lists; everything else is a single item.
+        handler = _normalize_list if isinstance(arg_value, list) else _normalize_single
+    return handler(arg_value, arg_name_for_error, expected_len)
 
 
 def validate_skip_rows_config(
@@ -134,14 +172,11 @@ def validate_skip_rows_config(
             )
         return config
     elif isinstance(config, (list, set)):
-        validated_set = set()
-        for item in config:
-            if not isinstance(item, int):
-                raise TypeError(
-                    f"skip_rows list/set must contain only integers{error_context}."
-                )
-            validated_set.add(item)
-        return validated_set
+        if not all(isinstance(item, int) for item in config):
+            raise TypeError(
+                f"skip_rows list/set must contain only integers{error_context}."
+            )
+        return set(config)
     else:
         raise TypeError(
             f"skip_rows must be an integer, a list/set of integers, or None{error_context}."
@@ -162,21 +197,15 @@ def validate_skip_columns_config(
             )
         return config
     elif isinstance(config, (list, set)):
-        validated_items = []
-        for item in config:
-            if isinstance(item, int):
-                if item < 0:
-                    raise ValueError(
-                        f"skip_columns indices in list/set cannot be negative{error_context}."
-                    )
-                validated_items.append(item)
-            elif isinstance(item, str):
-                validated_items.append(item)
-            else:
-                raise TypeError(
-                    f"skip_columns list/set must contain only integers or strings{error_context}."
-                )
-        return validated_items
+        if not all(isinstance(item, (int, str)) for item in config):
+            raise TypeError(
+                f"skip_columns list/set must contain only integers or strings{error_context}."
+            )
+        if any(isinstance(item, int) and item < 0 for item in config):
+            raise ValueError(
+                f"skip_columns indices in list/set cannot be negative{error_context}."
+            )
+        return list(config)
     else:
         raise TypeError(
             f"skip_columns must be an int, str, list/set of int/str, or None{error_context}."
@@ -201,39 +230,61 @@ def parse_skip_columns_config(
     skip_columns_config: SkipColumnsConfig,
 ) -> Tuple[Set[int], Set[str]]:
     """Parse validated skip_columns config into separate sets for indices and names."""
-    skip_indices: Set[int] = set()
-    skip_names: Set[str] = set()
     if skip_columns_config is None:
-        return skip_indices, skip_names
+        return set(), set()
     if isinstance(skip_columns_config, int):
-        skip_indices.add(skip_columns_config)
-    elif isinstance(skip_columns_config, str):
-        skip_names.add(skip_columns_config)
-    elif isinstance(skip_columns_config, (list, set)):
-        for item in skip_columns_config:  # Assumes already validated
-            if isinstance(item, int):
-                skip_indices.add(item)
-            elif isinstance(item, str):
-                skip_names.add(item)
-    else:
-        raise TypeError(
-            "Internal Error: Invalid type for processed skip_columns_config, expected validated config."
-        )
-    return skip_indices, skip_names
+        return {skip_columns_config}, set()
+    if isinstance(skip_columns_config, str):
+        return set(), {skip_columns_config}
+    if isinstance(skip_columns_config, (list, set)):
+        # Element types were checked by validate_skip_columns_config.
+        skip_indices = {item for item in skip_columns_config if isinstance(item, int)}
+        skip_names = {item for item in skip_columns_config if isinstance(item, str)}
+        return skip_indices, skip_names
+    raise TypeError(
+        "Internal Error: Invalid type for processed skip_columns_config, expected validated config."
+    )
 
 
-def detect_file_encoding(
-    file_path: Path, sample_size: int = ENCODING_SAMPLE_SIZE
-) -> str:
-    """Detect file encoding using charset-normalizer."""
-    from charset_normalizer import detect as charset_detect
+def detect_file_encoding(file_path: Path, sample_size: Optional[int] = None) -> str:
+    """
+    Detect file encoding with charset-normalizer, using cchardet as a fast path.
+
+    When cchardet is installed and confidently finds ASCII or UTF-8 (with or without
+    BOM), that answer is returned under charset-normalizer's name for it; anything
+    else is left to charset-normalizer, so the result does not depend on whether
+    cchardet is installed. If `sample_size` is None, cchardet reads 64 KiB and
+    charset-normalizer the first 12 KiB. The larger sample means a file that is
+    ASCII for 12 KiB but has UTF-8 further on is reported as 'utf-8' with cchardet
+    and 'ascii' without.
+    """
+    fallback_sample_size = ENCODING_SAMPLE_SIZE if sample_size is None else sample_size
+    if sample_size is None:
+        sample_size = (
+            CCHARDET_ENCODING_SAMPLE_SIZE
+            if _cchardet_detect is not None
+            else ENCODING_SAMPLE_SIZE
+        )
 
     try:
         with open(file_path, "rb") as fb:
             data = fb.read(sample_size)
             if not data:
                 return "utf-8"
-            best_guess = charset_detect(data)
+            if _cchardet_detect is not None:
+                fast_guess = _cchardet_detect(data) or {}
+                confirmed = _CCHARDET_CONFIRMED_ENCODINGS.get(
+                    fast_guess.get("encoding") or ""
+                )
+                if (
+                    confirmed
+                    and (fast_guess.get("confidence") or 0) >= CCHARDET_MIN_CONFIDENCE
+                ):
+                    return confirmed
+
+            from charset_normalizer import detect as charset_detect
+
+            best_guess = charset_detect(data[:fallback_sample_size])
             if best_guess and best_guess.get("encoding"):
                 return best_guess["encoding"]
             else:
@@ -250,12 +301,43 @@ def detect_file_encoding(
         ) from e
 
 
+def _guess_common_delimiter(sample_text: str) -> Optional[str]:
+    """
+    Returns the common delimiter that appears equally often on every sample line.
+
+    Only complete lines are considered (the sample may end mid-line). Returns None
+    when there are too few lines, or when zero or several candidates are
+    consistent, e.g. because quoted fields contain delimiters.
+    """
+    lines = sample_text.splitlines()
+    if not sample_text.endswith(("\n", "\r")):
+        lines = lines[:-1]
+    lines = [line for line in lines if line.strip()][:_DELIMITER_HEURISTIC_MAX_LINES]
+    if len(lines) < _DELIMITER_HEURISTIC_MIN_LINES:
+        return None
+
+    consistent = []
+    for delimiter in _COMMON_DELIMITERS:
+        first_count = lines[0].count(delimiter)
+        if first_count and all(line.count(delimiter) == first_count for line in lines):
+            consistent.append(delimiter)
+    return consistent[0] if len(consistent) == 1 else None
+
+
 def detect_csv_delimiter(sample_text: str) -> str:
-    """Detect CSV delimiter using clevercsv.Sniffer."""
-    import clevercsv
+    """
+    Detect CSV delimiter, trying a quick per-line count of common delimiters first.
 
+    Falls back to clevercsv.Sniffer when the quick check is inconclusive.
+    """
     if not sample_text:
         raise ValueError("Cannot detect delimiter from empty sample text.")
+    delimiter = _guess_common_delimiter(sample_text)
+    if delimiter is not None:
+        return delimiter
+
+    import clevercsv
+
     try:
         sniffer = clevercsv.Sniffer()
         dialect = sniffer.sniff(sample_text)
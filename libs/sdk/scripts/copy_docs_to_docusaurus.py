@@ -9,10 +9,14 @@ This script:
 4. Ensures proper navigation and linking
 """
 
+import itertools
+import os
 import re
 import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Callable, Sequence, Set, Tuple, Union
 
 
 def add_docusaurus_frontmatter(
@@ -26,191 +30,327 @@ def add_docusaurus_frontmatter(
     # Clean up title
     title = title.strip()
 
-    frontmatter = f"""---
-title: {title}
-description: Auto-generated API documentation for {title}
-"""
+    parts = [
+        "---\n",
+        f"title: {title}\n",
+        f"description: Auto-generated API documentation for {title}\n",
+    ]
 
     if sidebar_position:
-        frontmatter += f"sidebar_position: {sidebar_position}\n"
-
-    frontmatter += "---\n\n"
-
-    return frontmatter + content
+        parts.append(f"sidebar_position: {sidebar_position}\n")
+
+    parts.append("---\n\n")
+    parts.append(content)
+
+    return "".join(parts)
+
+
+# Patterns used by clean_sphinx_markdown, compiled once rather than on every call.
+# Sphinx-specific HTML anchors that might interfere with Docusaurus
+_SPHINX_ANCHOR_RE = re.compile(r'<a id="[^"]*"></a>\s*')
+# Redundant "satif_sdk." prefixes in titles and headers
+_MODULE_HEADER_RE = re.compile(r"(#{1,6})\s*satif_sdk\.([a-zA-Z_]+)\s+module")
+_SUBMODULE_HEADER_RE = re.compile(
+    r"(#{1,6})\s*satif_sdk\.([a-zA-Z_]+)\.([a-zA-Z_]+)\s+module"
+)
+# Class and function signatures
+_CLASS_SIGNATURE_RE = re.compile(r"\*class\* satif_sdk\.([a-zA-Z_]+)\.([a-zA-Z_]+)\(")
+_QUALIFIED_CALL_RE = re.compile(r"satif_sdk\.([a-zA-Z_]+)\.([a-zA-Z_]+)\(")
+_CLASS_HEADING_RE = re.compile(r"### \*class\* ([^(]+)\(")
+_FUNCTION_HEADING_RE = re.compile(r"### satif_sdk\.([a-zA-Z_]+)\.([a-zA-Z_]+)\(")
+# Type annotations in signatures
+# Either an existing `code span` (group 1, kept as-is so reruns never re-wrap) or a
+# bare *args/**kwargs annotation (group 2, wrapped in backticks)
+_STAR_PARAM_RE = re.compile(r"(`[^`]*`)|(\*args: [^,)`]+|\*\*kwargs: [^,)`]+)")
+# Parameter formatting
+_SECTION_LABEL_RE = re.compile(
+    r"^\s*\*\s+\*\*(Parameters|Returns|Raises):\*\*", re.MULTILINE
+)
+_PARAMETER_ITEM_RE = re.compile(r"^\s*\*\s+\*\*([^*]+)\*\*\s+–", re.MULTILINE)
+# "Bases:" lines
+_BASES_RE = re.compile(r"Bases:\s+`([^`]+)`")
+# Angle brackets and curly braces (MDX)
+_ANGLE_BRACKETS_RE = re.compile(r"<([^>]+)>")
+_CURLY_BRACES_RE = re.compile(r"\{([^}]+)\}")
+# Link fixups as (pattern, replacement) pairs. Their patterns start with distinct
+# literals, so they are applied together in one pass (see _compile_rewrites).
+_LINK_REWRITES = (
+    # Broken Sphinx links
+    (r"\[([^\]]+)\]\(genindex\)", r"\1"),
+    (r"\[([^\]]+)\]\(py-modindex\)", r"\1"),
+    (r"\[([^\]]+)\]\(search\)", r"\1"),
+    # Autosummary links
+    (r"\]\(api/_autosummary/([^)#]+)\)", r"](modules/\1.md)"),
+    (r"\]\(api/_autosummary/([^)#]+)#([^)]+)\)", r"](modules/\1.md#\2)"),
+    (r"\]\(_autosummary/([^)#]+)\)", r"](modules/\1.md)"),
+    (r"\]\(_autosummary/([^)#]+)#([^)]+)\)", r"](modules/\1.md#\2)"),
+    # Cross-references between module pages
+    (r"\]\(satif_sdk\.([^)#]+)#([^)]+)\)", r"](satif_sdk.\1.md#\2)"),
+    (r"\]\(satif_sdk\.([^)#]+)\)", r"](satif_sdk.\1.md)"),
+    # Main index anchors
+    (r"\]\(\.\.\/\.\.\/index#module-([^)]+)\)", r"](../index.md)"),
+    (r"\]\(\.\.\/\.\.\/index#([^)]+)\)", r"](../index.md)"),
+)
+# Whitespace normalization
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_EMPTY_HEADING_RE = re.compile(r"^(#{1,6})\s*\n", re.MULTILINE)
+_TRAILING_COLON_RE = re.compile(r"^(\s*[^:\n]+):\s*$", re.MULTILINE)
+
+
+def _compile_rewrites(
+    rewrites: Sequence[Tuple[str, str]],
+) -> Tuple["re.Pattern[str]", Callable[["re.Match[str]"], str]]:
+    """
+    Combine (pattern, replacement) rules into one alternation and its replacer.
+
+    Each rule becomes a named group `r<i>`; the replacer looks up the rule that matched
+    through `Match.lastgroup`, with its group references renumbered to the combined
+    pattern, so the whole rule set runs as a single `sub` pass.
+    """
+    alternatives = []
+    templates = {}
+    offset = 0
+    for index, (pattern, replacement) in enumerate(rewrites):
+        name = f"r{index}"
+        alternatives.append(f"(?P<{name}>{pattern})")
+        templates[name] = re.sub(
+            r"\\(\d)",
+            lambda ref, base=offset + 1: rf"\g<{base + int(ref[1])}>",
+            replacement,
+        )
+        offset += 1 + re.compile(pattern).groups
+
+    def replace(match: "re.Match[str]") -> str:
+        return match.expand(templates[match.lastgroup])
+
+    return re.compile("|".join(alternatives)), replace
+
+
+_LINK_REWRITE_RE, _rewrite_link = _compile_rewrites(_LINK_REWRITES)
+
+
+def _wrap_star_param(match: "re.Match[str]") -> str:
+    """Wrap a bare *args/**kwargs annotation in backticks; leave code spans alone."""
+    if match.group(1) is not None:
+        return match.group(1)
+    return f"`{match.group(2)}`"
 
 
 def clean_sphinx_markdown(content: str, is_main_index: bool = False) -> str:
     """Clean up Sphinx-specific markdown for better Docusaurus compatibility."""
+    # Each group of rules below is skipped when a literal that every one of its
+    # matches must contain is absent; a substring check is far cheaper than a scan.
+
     # Remove Sphinx-specific HTML anchors that might interfere with Docusaurus
-    content = re.sub(r'<a id="[^"]*"></a>\s*', "", content)
-
-    # Convert Sphinx cross-references to simple links
-    content = re.sub(r"\[(.*?)\]\(#(.*?)\)", r"[\1](#\2)", content)
-
-    # Clean up redundant "satif_sdk." prefixes in titles and headers
-    content = re.sub(r"(#{1,6})\s*satif_sdk\.([a-zA-Z_]+)\s+module", r"\1 \2", content)
-    content = re.sub(
-        r"(#{1,6})\s*satif_sdk\.([a-zA-Z_]+)\.([a-zA-Z_]+)\s+module",
-        r"\1 \2.\3",
-        content,
-    )
-
-    # Clean up class and function signatures
-    content = re.sub(
-        r"\*class\* satif_sdk\.([a-zA-Z_]+)\.([a-zA-Z_]+)\(", r"**class** \2(", content
-    )
-    content = re.sub(r"satif_sdk\.([a-zA-Z_]+)\.([a-zA-Z_]+)\(", r"\2(", content)
-    content = re.sub(r"### \*class\* ([^(]+)\(", r"### class \1(", content)
+    if "<a id=" in content:
+        content = _SPHINX_ANCHOR_RE.sub("", content)
+
+    # The rules in this group only remove "satif_sdk." prefixes, never add them
+    if "satif_sdk." in content:
+        # Clean up redundant "satif_sdk." prefixes in titles and headers
+        content = _MODULE_HEADER_RE.sub(r"\1 \2", content)
+        content = _SUBMODULE_HEADER_RE.sub(r"\1 \2.\3", content)
+
+        # Clean up class and function signatures
+        content = _CLASS_SIGNATURE_RE.sub(r"**class** \2(", content)
+        content = _QUALIFIED_CALL_RE.sub(r"\2(", content)
+    if "### *class* " in content:
+        content = _CLASS_HEADING_RE.sub(r"### class \1(", content)
 
     # Clean up function signatures - remove module prefixes
-    content = re.sub(
-        r"### satif_sdk\.([a-zA-Z_]+)\.([a-zA-Z_]+)\(", r"### \2(", content
-    )
+    if "### satif_sdk." in content:
+        content = _FUNCTION_HEADING_RE.sub(r"### \2(", content)
 
     # Clean up type annotations in signatures for better readability
-    content = re.sub(
-        r"(\*args: Any, \*\*kwargs: Any)", r"`*args: Any, **kwargs: Any`", content
-    )
-    content = re.sub(r"(\*args: [^,)]+)", r"`*\1`", content)
-    content = re.sub(r"(\*\*kwargs: [^,)]+)", r"`**\1`", content)
+    if "args: " in content:
+        content = content.replace(
+            "(*args: Any, **kwargs: Any)", "(`*args: Any, **kwargs: Any`)"
+        )
+        content = _STAR_PARAM_RE.sub(_wrap_star_param, content)
 
     # Improve parameter formatting
-    content = re.sub(
-        r"^\s*\*\s+\*\*Parameters:\*\*", "**Parameters:**", content, flags=re.MULTILINE
-    )
-    content = re.sub(
-        r"^\s*\*\s+\*\*Returns:\*\*", "**Returns:**", content, flags=re.MULTILINE
-    )
-    content = re.sub(
-        r"^\s*\*\s+\*\*Raises:\*\*", "**Raises:**", content, flags=re.MULTILINE
-    )
+    if ":**" in content:
+        content = _SECTION_LABEL_RE.sub(r"**\1:**", content)
 
     # Clean up parameter descriptions for better formatting
-    content = re.sub(
-        r"^\s*\*\s+\*\*([^*]+)\*\*\s+–", r"- **\1** –", content, flags=re.MULTILINE
-    )
+    if "–" in content:
+        content = _PARAMETER_ITEM_RE.sub(r"- **\1** –", content)
 
     # Clean up "Bases:" lines to be more concise
-    content = re.sub(r"Bases:\s+`([^`]+)`", r"*Inherits from:* `\1`", content)
+    if "Bases:" in content:
+        content = _BASES_RE.sub(r"*Inherits from:* `\1`", content)
 
     # Clean up angle brackets and curly braces for MDX compatibility
-    content = re.sub(r"<([^>]+)>", r"`<\1>`", content)
-    content = re.sub(r"\{([^}]+)\}", r"\\{\1\\}", content)
-
-    # Fix broken Sphinx links
-    content = re.sub(r"\[([^\]]+)\]\(genindex\)", r"\1", content)
-    content = re.sub(r"\[([^\]]+)\]\(py-modindex\)", r"\1", content)
-    content = re.sub(r"\[([^\]]+)\]\(search\)", r"\1", content)
+    content = _ANGLE_BRACKETS_RE.sub(r"`<\1>`", content)
+    content = _CURLY_BRACES_RE.sub(r"\\{\1\\}", content)
 
     # Fix links to removed overview.md
-    content = re.sub(r"\]\(\.\.\/\.\.\/overview\.md\)", r"](../index.md)", content)
-
-    # Fix autosummary links to point to modules directory
-    content = re.sub(r"\]\(api/_autosummary/([^)#]+)\)", r"](modules/\1.md)", content)
-    content = re.sub(
-        r"\]\(api/_autosummary/([^)#]+)#([^)]+)\)", r"](modules/\1.md#\2)", content
-    )
-    content = re.sub(r"\]\(_autosummary/([^)#]+)\)", r"](modules/\1.md)", content)
-    content = re.sub(
-        r"\]\(_autosummary/([^)#]+)#([^)]+)\)", r"](modules/\1.md#\2)", content
-    )
-
-    # Fix cross-references to other modules within the same modules directory
-    content = re.sub(
-        r"\]\(satif_sdk\.([^)#]+)#([^)]+)\)", r"](satif_sdk.\1.md#\2)", content
-    )
-    content = re.sub(r"\]\(satif_sdk\.([^)#]+)\)", r"](satif_sdk.\1.md)", content)
-
-    # Fix cross-references to main index anchors
-    content = re.sub(
-        r"\]\(\.\.\/\.\.\/index#module-([^)]+)\)", r"](../index.md)", content
-    )
-    content = re.sub(r"\]\(\.\.\/\.\.\/index#([^)]+)\)", r"](../index.md)", content)
+    content = content.replace("](../../overview.md)", "](../index.md)")
+
+    # Fix broken Sphinx links, autosummary links and cross-references
+    if "](" in content:
+        content = _LINK_REWRITE_RE.sub(_rewrite_link, content)
 
     # Clean up excessive whitespace and normalize formatting
-    content = re.sub(r"\n{3,}", "\n\n", content)
-    content = re.sub(r"^(#{1,6})\s*\n", r"\1 \n", content, flags=re.MULTILINE)
-    content = re.sub(r"^(\s*[^:\n]+):\s*$", r"\1", content, flags=re.MULTILINE)
+    if "\n\n\n" in content:
+        content = _BLANK_LINES_RE.sub("\n\n", content)
+    if "#" in content:
+        content = _EMPTY_HEADING_RE.sub(r"\1 \n", content)
+    if ":" in content:
+        content = _TRAILING_COLON_RE.sub(r"\1", content)
 
     return content
 
 
+# Headings that start a class or function block in organize_module_content: class
+# headings, or other "### " headings with a "(" on the line (but not "### class...").
+# The group captures the class marker, so matching also classifies each block.
+_ITEM_HEADING_RE = re.compile(
+    r"^(?=### (?:(class |\*class\*)|(?!class)[^\n]*\())", re.MULTILINE
+)
+
+
 def organize_module_content(content: str, module_name: str) -> str:
     """Organize module content into cleaner sections like LangChain docs."""
-    # Create a cleaner module header
-    clean_module_name = module_name.replace("satif_sdk.", "").replace("_", " ").title()
-
-    # Split content into sections
-    lines = content.split("\n")
-    organized_lines = []
-    current_section = []
+    # Split content into sections: the preamble, then one block per class or function
+    # heading, each running up to the newline before the next heading. Blocks are
+    # sliced straight out of `content` between consecutive heading positions.
+    headings = list(_ITEM_HEADING_RE.finditer(content))
+    if not headings:
+        return content
+    preamble = content[: max(headings[0].start() - 1, 0)]
+    ends = [heading.start() - 1 for heading in headings[1:]] + [len(content)]
 
     # Group functions and classes
     classes = []
     functions = []
-    current_item = []
-    in_class = False
-    in_function = False
-
-    for line in lines:
-        # Detect class definitions
-        if line.startswith("### class ") or line.startswith("### *class*"):
-            if current_item:
-                if in_class:
-                    classes.append("\n".join(current_item))
-                elif in_function:
-                    functions.append("\n".join(current_item))
-                current_item = []
-            current_item.append(line)
-            in_class = True
-            in_function = False
-        # Detect function definitions
-        elif (
-            line.startswith("### ") and "(" in line and not line.startswith("### class")
-        ):
-            if current_item:
-                if in_class:
-                    classes.append("\n".join(current_item))
-                elif in_function:
-                    functions.append("\n".join(current_item))
-                current_item = []
-            current_item.append(line)
-            in_class = False
-            in_function = True
-        # Continue current item
-        elif in_class or in_function:
-            current_item.append(line)
-        # Regular content
+    for heading, end in zip(headings, ends):
+        block = content[heading.start() : end]
+        if heading.group(1) is not None:
+            classes.append(block)
         else:
-            if current_item:
-                if in_class:
-                    classes.append("\n".join(current_item))
-                elif in_function:
-                    functions.append("\n".join(current_item))
-                current_item = []
-                in_class = False
-                in_function = False
-            organized_lines.append(line)
-
-    # Add the last item
-    if current_item:
-        if in_class:
-            classes.append("\n".join(current_item))
-        elif in_function:
-            functions.append("\n".join(current_item))
+            functions.append(block)
 
     # Rebuild content with better organization
-    result = "\n".join(organized_lines)
+    parts = [preamble]
 
     if classes:
-        result += "\n\n## Classes\n\n"
-        result += "\n\n".join(classes)
+        parts.append("\n\n## Classes\n\n")
+        parts.append("\n\n".join(classes))
 
     if functions:
-        result += "\n\n## Functions\n\n"
-        result += "\n\n".join(functions)
+        parts.append("\n\n## Functions\n\n")
+        parts.append("\n\n".join(functions))
+
+    return "".join(parts)
+
+
+def clean_and_organize(content: str, module_name: str) -> str:
+    """
+    Clean a Sphinx module page and organize it into class and function sections.
+
+    The cleaning rules span lines (anchor whitespace, blank-line collapsing, link
+    text), so they run over the whole page; organizing is then a single regex split.
+    """
+    return organize_module_content(clean_sphinx_markdown(content), module_name)
+
+
+def read_markdown(path: Union[str, Path]) -> str:
+    """Read a UTF-8 markdown file, translating newlines as a text-mode read would."""
+    with open(path, "rb") as f:
+        content = f.read().decode("utf-8")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+
+def write_markdown(path: Path, content: str) -> bool:
+    """
+    Write markdown content to a file as UTF-8, without newline translation.
+
+    Files that already hold exactly this content are left untouched, so rebuilds do
+    not bump their modification times. Returns whether the file was written.
+    """
+    data = content.encode("utf-8")
+    try:
+        # Only a same-sized file can match, so most changed files are never read
+        if os.stat(path).st_size == len(data):
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+def remove_stale_files(directory: Union[str, Path], keep: Set[str]) -> int:
+    """
+    Delete everything under `directory` whose path is not in `keep`.
+
+    `keep` holds the paths of the generated files and of the directories containing
+    them; kept directories are cleaned recursively. Returns the number of removed entries.
+    """
+    removed = 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if entry.path in keep:
+                if is_dir:
+                    removed += remove_stale_files(entry.path, keep)
+                continue
+            if is_dir:
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+            removed += 1
+    return removed
+
+
+def process_autosummary_page(md_path: str, modules_dir: str) -> str:
+    """Convert one _autosummary page into the modules directory; return its filename."""
+    module_path = os.path.basename(md_path)[: -len(".md")]
+    if module_path.startswith("satif_sdk."):
+        clean_title = module_path.replace("satif_sdk.", "").replace("_", ".")
+    else:
+        clean_title = module_path.replace("_", ".")
+
+    # Ensure title is not empty
+    if not clean_title.strip():
+        clean_title = module_path
+
+    # Clean and organize content for better structure
+    content = clean_and_organize(read_markdown(md_path), module_path)
+    content = add_docusaurus_frontmatter(content, clean_title.strip())
+
+    filename = autosummary_filename(module_path)
+    write_markdown(Path(modules_dir) / filename, content)
+    return filename
 
-    return result
+
+def autosummary_filename(module_path: str) -> str:
+    """Output filename for an _autosummary page: the module path without satif_sdk prefix."""
+    return module_path.replace("satif_sdk.", "") + ".md"
+
+
+def process_module_page(
+    module_file: str, modules_dir: str, module_name: str, title: str, description: str
+) -> str:
+    """Convert one top-level API module page into the modules directory; return its filename."""
+    content = clean_and_organize(read_markdown(module_file), module_name)
+
+    # Add module description
+    enhanced_content = f"""# {title}
+
+{description}
+
+{content}
+"""
+
+    content = add_docusaurus_frontmatter(enhanced_content, title)
+    filename = f"{module_name}.md"
+    write_markdown(Path(modules_dir) / filename, content)
+    return filename
 
 
 def copy_docs_to_docusaurus():
@@ -234,14 +374,9 @@ def copy_docs_to_docusaurus():
     # Create target directory
     docusaurus_api_dir.mkdir(parents=True, exist_ok=True)
 
-    # Clear existing files in target directory
-    for item in docusaurus_api_dir.iterdir():
-        if item.is_file():
-            item.unlink()
-        elif item.is_dir():
-            shutil.rmtree(item)
-
-    print("🧹 Cleared existing documentation files")
+    # Existing files are kept until the end: unchanged pages are not rewritten, and
+    # whatever this run did not generate is removed afterwards
+    generated_paths: Set[str] = set()
 
     # Copy and process files
     files_copied = 0
@@ -249,10 +384,7 @@ def copy_docs_to_docusaurus():
     # Process main index file to create overview
     index_file = sphinx_build_dir / "index.md"
     if index_file.exists():
-        content = index_file.read_text(encoding="utf-8")
-        content = clean_sphinx_markdown(content, True)
-
-        # Create a clean main overview
+        # The overview is static; the Sphinx index only signals that it should exist
         overview_content = """# SATIF SDK
 
 The SATIF SDK provides a comprehensive data processing and AI agent toolkit for transforming, standardizing, and analyzing data.
@@ -285,13 +417,15 @@ For comprehensive class and function documentation, explore the individual modul
 
         content = add_docusaurus_frontmatter(overview_content, "SATIF SDK", 1)
         target_file = docusaurus_api_dir / "index.md"
-        target_file.write_text(content, encoding="utf-8")
+        write_markdown(target_file, content)
+        generated_paths.add(str(target_file))
         files_copied += 1
         print("✅ Created: index.md")
 
     # Create modules directory
     modules_dir = docusaurus_api_dir / "modules"
     modules_dir.mkdir(exist_ok=True)
+    generated_paths.add(str(modules_dir))
 
     # Define module organization
     module_groups = {
@@ -322,60 +456,63 @@ For comprehensive class and function documentation, explore the individual modul
         },
     }
 
-    # Process API directory for main module files
+    # Process API directory for main module files and detailed _autosummary modules
     api_dir = sphinx_build_dir / "api"
+    module_pages = []
+    autosummary_pages = {}
     if api_dir.exists():
-        for module_name, module_info in module_groups.items():
-            module_file = api_dir / f"{module_name}.md"
-            if module_file.exists():
-                content = module_file.read_text(encoding="utf-8")
-                content = clean_sphinx_markdown(content)
-                content = organize_module_content(content, module_name)
-
-                # Add module description
-                enhanced_content = f"""# {module_info["title"]}
-
-{module_info["description"]}
-
-{content}
-"""
-
-                content = add_docusaurus_frontmatter(
-                    enhanced_content, module_info["title"]
-                )
-                target_file = modules_dir / f"{module_name}.md"
-                target_file.write_text(content, encoding="utf-8")
-                files_copied += 1
-                print(f"✅ Copied: modules/{module_name}.md")
-
-    # Process detailed _autosummary modules
-    autosummary_dir = api_dir / "_autosummary" if api_dir.exists() else None
-    if autosummary_dir and autosummary_dir.exists():
-        # Group detailed modules by category
-        for md_file in autosummary_dir.glob("*.md"):
-            content = md_file.read_text(encoding="utf-8")
-            content = clean_sphinx_markdown(content)
-
-            module_path = md_file.stem
-            if module_path.startswith("satif_sdk."):
-                clean_title = module_path.replace("satif_sdk.", "").replace("_", ".")
-            else:
-                clean_title = module_path.replace("_", ".")
-
-            # Ensure title is not empty
-            if not clean_title.strip():
-                clean_title = module_path
-
-            # Organize content for better structure
-            content = organize_module_content(content, module_path)
-            content = add_docusaurus_frontmatter(content, clean_title.strip())
-
-            # Use clean filename without satif_sdk prefix
-            filename = module_path.replace("satif_sdk.", "") + ".md"
-            target_file = modules_dir / filename
-            target_file.write_text(content, encoding="utf-8")
+        module_pages = [
+            (api_dir / f"{module_name}.md", module_name, module_info)
+            for module_name, module_info in module_groups.items()
+            if (api_dir / f"{module_name}.md").exists()
+        ]
+        autosummary_dir = api_dir / "_autosummary"
+        if autosummary_dir.exists():
+            with os.scandir(autosummary_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".md") and entry.is_file():
+                        filename = autosummary_filename(entry.name[: -len(".md")])
+                        autosummary_pages[filename] = entry.path
+
+    # Pages that map to the same output file used to overwrite each other in order:
+    # an _autosummary page replaces a module page (satif_sdk.utils.md -> utils.md)
+    # and a later _autosummary page an earlier one. Only the page that would have
+    # been written last is converted.
+    module_pages = [
+        page for page in module_pages if f"{page[1]}.md" not in autosummary_pages
+    ]
+
+    # Pages are independent, so they are converted in parallel worker processes
+    with ProcessPoolExecutor() as executor:
+        module_futures = [
+            executor.submit(
+                process_module_page,
+                str(module_file),
+                str(modules_dir),
+                module_name,
+                module_info["title"],
+                module_info["description"],
+            )
+            for module_file, module_name, module_info in module_pages
+        ]
+        autosummary_filenames = executor.map(
+            process_autosummary_page,
+            list(autosummary_pages.values()),
+            itertools.repeat(str(modules_dir)),
+            chunksize=8,
+        )
+        for future in module_futures:
+            filename = future.result()
+            generated_paths.add(str(modules_dir / filename))
             files_copied += 1
             print(f"✅ Copied: modules/{filename}")
+        for filename in autosummary_filenames:
+            generated_paths.add(str(modules_dir / filename))
+            files_copied += 1
+            print(f"✅ Copied: modules/{filename}")
+
+    removed = remove_stale_files(docusaurus_api_dir, generated_paths)
+    print(f"🧹 Removed {removed} stale documentation files")
 
     print(f"\n🎉 Successfully copied {files_copied} documentation files to Docusaurus!")
     print(f"📂 Documentation available at: {docusaurus_api_dir}")
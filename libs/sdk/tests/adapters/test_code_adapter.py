@@ -1,3 +1,5 @@
+import sqlite3
+from contextlib import closing
 from pathlib import Path
 from typing import Any, Callable, Dict
 
@@ -15,10 +17,18 @@ def tmp_db_path(tmp_path: Path) -> Path:
     return tmp_path / "test_sdif.db"
 
 
-@pytest.fixture
-def sample_db(tmp_db_path: Path) -> Path:
-    """Creates a sample database with a simple table."""
-    db = SDIFDatabase(tmp_db_path)
+@pytest.fixture(scope="session")
+def _template_db(tmp_path_factory: pytest.TempPathFactory) -> bytes:
+    """Builds the sample database once and returns its serialized image.
+
+    Tests get their own copy via `sample_db`, which only has to write these bytes.
+    """
+    template_path = tmp_path_factory.mktemp("code_adapter") / "template_sdif.db"
+    db = SDIFDatabase(template_path)
+    # Throwaway test data: skip fsyncs while building it. SDIFDatabase keeps the
+    # file in WAL mode (already no rollback journal) and cannot leave it while
+    # its own connection has the file attached.
+    db.conn.execute("PRAGMA synchronous=OFF")
 
     # Create a simple table with test data
     table_name = "test_table"
@@ -40,6 +50,14 @@ def sample_db(tmp_db_path: Path) -> Path:
     )
 
     db.close()  # Close the DB connection
+    with closing(sqlite3.connect(template_path)) as conn:
+        return conn.serialize()
+
+
+@pytest.fixture
+def sample_db(_template_db: bytes, tmp_db_path: Path) -> Path:
+    """Creates a sample database with a simple table."""
+    tmp_db_path.write_bytes(_template_db)
     return tmp_db_path
 
 
@@ -134,6 +152,22 @@ def adapt(db: SDIFDatabase, context: Dict[str, Any]) -> Dict[str, Any]:
 """
 
 
+@pytest.fixture
+def custom_adapt_code_string() -> str:
+    """Returns adaptation code whose entry point is not named 'adapt'."""
+    return """
+from typing import Dict, Any
+from sdif_db.database import SDIFDatabase # Import SDIFDatabase
+import sqlite3 # Required for db.conn
+
+def custom_adapt(db: SDIFDatabase) -> Dict[str, Any]: # Changed to db: SDIFDatabase
+    db.conn.execute("ALTER TABLE test_table ADD COLUMN custom_col TEXT")
+    db.conn.execute("UPDATE test_table SET custom_col = 'custom'")
+    db.conn.commit() # Ensure changes are committed
+    return {}
+"""
+
+
 @pytest.fixture
 def code_file_path(tmp_path: Path, adapt_code_string: str) -> Path:
     """Creates a temporary file with adaptation code."""
@@ -146,150 +180,102 @@ def code_file_path(tmp_path: Path, adapt_code_string: str) -> Path:
 # --- Tests ---
 
 
-def test_direct_callable(sample_db: Path, simple_adapt_function: Callable):
-    """Test adapter with a direct callable function."""
-    adapter = CodeAdapter(simple_adapt_function)
-
-    # Verify function name is set correctly
-    assert adapter.function_name == "adapt"
-
-    # Execute adaptation
-    output_path = adapter.adapt(sample_db)
-
-    # Verify output path and existence
-    assert output_path.exists()
-    assert output_path.name == f"{sample_db.stem}_adapted{sample_db.suffix}"
-
-    # Check if the adaptation worked by opening the result
-    with SDIFDatabase(output_path) as db:
-        # Check if the new column exists and has the expected value
-        result = db.query(
-            "SELECT new_col FROM test_table LIMIT 1", return_format="dict"
-        )
-        assert result
-        assert result[0]["new_col"] == "added"
-
-
-def test_direct_callable_with_context(
-    sample_db: Path, adapt_function_with_context: Callable
+@pytest.mark.parametrize(
+    ("function_fixture", "adapter_kwargs", "column", "expected"),
+    [
+        pytest.param(
+            "simple_adapt_function", {}, "new_col", "added", id="direct_callable"
+        ),
+        pytest.param(
+            "adapt_function_with_context",
+            {"extra_context": {"value": "context_test_value"}},
+            "context_col",
+            "context_test_value",
+            id="direct_callable_with_context",
+        ),
+        pytest.param(
+            "adapt_code_string",
+            {"disable_security_warning": True},
+            "from_string",
+            "string_code",
+            id="code_string",
+        ),
+        pytest.param(
+            "adapt_code_with_context_string",
+            {
+                "extra_context": {"value": "context_string_value"},
+                "disable_security_warning": True,
+            },
+            "context_from_string",
+            "context_string_value",
+            id="code_string_with_context",
+        ),
+        pytest.param(
+            "code_file_path",
+            {"disable_security_warning": True},
+            "from_string",
+            "string_code",
+            id="code_file",
+        ),
+        pytest.param(
+            "custom_adapt_code_string",
+            {"function_name": "custom_adapt", "disable_security_warning": True},
+            "custom_col",
+            "custom",
+            id="custom_function_name",
+        ),
+        pytest.param(
+            "adapt_code_db_param_string",
+            {"disable_security_warning": True},
+            "from_db_param",
+            "db_param_code",
+            id="code_string_db_param",
+        ),
+        pytest.param(
+            "adapt_code_db_param_with_context_string",
+            {
+                "extra_context": {"db_value": "db_context_test_value"},
+                "disable_security_warning": True,
+            },
+            "context_from_db_param",
+            "db_context_test_value",
+            id="code_string_db_param_with_context",
+        ),
+    ],
+)
+def test_adapt(
+    request: pytest.FixtureRequest,
+    sample_db: Path,
+    function_fixture: str,
+    adapter_kwargs: Dict[str, Any],
+    column: str,
+    expected: str,
 ):
-    """Test adapter with a direct callable that uses context."""
-    context_value = "context_test_value"
-    adapter = CodeAdapter(
-        adapt_function_with_context, extra_context={"value": context_value}
-    )
-
+    """Test that each kind of adaptation source adds its column with the expected value."""
+    adapter = CodeAdapter(request.getfixturevalue(function_fixture), **adapter_kwargs)
     output_path = adapter.adapt(sample_db)
 
     with SDIFDatabase(output_path) as db:
         result = db.query(
-            "SELECT context_col FROM test_table LIMIT 1", return_format="dict"
+            f"SELECT {column} FROM test_table LIMIT 1", return_format="dict"
         )
         assert result
-        assert result[0]["context_col"] == context_value
+        assert result[0][column] == expected
 
 
-def test_code_string(sample_db: Path, adapt_code_string: str):
-    """Test adapter with a code string."""
-    adapter = CodeAdapter(adapt_code_string, disable_security_warning=True)
-    output_path = adapter.adapt(sample_db)
-
-    with SDIFDatabase(output_path) as db:
-        result = db.query(
-            "SELECT from_string FROM test_table LIMIT 1", return_format="dict"
-        )
-        assert result
-        assert result[0]["from_string"] == "string_code"
-
-
-def test_code_string_with_context(sample_db: Path, adapt_code_with_context_string: str):
-    """Test adapter with a code string that uses context."""
-    context_value = "context_string_value"
-    adapter = CodeAdapter(
-        adapt_code_with_context_string,
-        extra_context={"value": context_value},
-        disable_security_warning=True,
-    )
-
-    output_path = adapter.adapt(sample_db)
-
-    with SDIFDatabase(output_path) as db:
-        result = db.query(
-            "SELECT context_from_string FROM test_table LIMIT 1", return_format="dict"
-        )
-        assert result
-        assert result[0]["context_from_string"] == context_value
-
-
-def test_code_file(sample_db: Path, code_file_path: Path):
-    """Test adapter with a path to a code file."""
-    adapter = CodeAdapter(code_file_path, disable_security_warning=True)
-    output_path = adapter.adapt(sample_db)
-
-    with SDIFDatabase(output_path) as db:
-        result = db.query(
-            "SELECT from_string FROM test_table LIMIT 1", return_format="dict"
-        )
-        assert result
-        assert result[0]["from_string"] == "string_code"
-
-
-def test_custom_function_name(sample_db: Path):
-    """Test adapter with a custom function name."""
-    code = """
-from typing import Dict, Any
-from sdif_db.database import SDIFDatabase # Import SDIFDatabase
-import sqlite3 # Required for db.conn
-
-def custom_adapt(db: SDIFDatabase) -> Dict[str, Any]: # Changed to db: SDIFDatabase
-    db.conn.execute("ALTER TABLE test_table ADD COLUMN custom_col TEXT")
-    db.conn.execute("UPDATE test_table SET custom_col = 'custom'")
-    db.conn.commit() # Ensure changes are committed
-    return {}
-"""
-    adapter = CodeAdapter(
-        code, function_name="custom_adapt", disable_security_warning=True
-    )
-    output_path = adapter.adapt(sample_db)
-    with SDIFDatabase(output_path) as db:
-        result = db.query(
-            "SELECT custom_col FROM test_table LIMIT 1", return_format="dict"
-        )
-        assert result
-        assert result[0]["custom_col"] == "custom"
-
-
-def test_code_string_db_param(sample_db: Path, adapt_code_db_param_string: str):
-    """Test adapter with a code string using db: SDIFDatabase parameter."""
-    adapter = CodeAdapter(adapt_code_db_param_string, disable_security_warning=True)
-    output_path = adapter.adapt(sample_db)
-
-    with SDIFDatabase(output_path) as db:
-        result = db.query(
-            "SELECT from_db_param FROM test_table LIMIT 1", return_format="dict"
-        )
-        assert result
-        assert result[0]["from_db_param"] == "db_param_code"
+def test_direct_callable_output_path(sample_db: Path, simple_adapt_function: Callable):
+    """Test the function name and default output path for a direct callable."""
+    adapter = CodeAdapter(simple_adapt_function)
 
+    # Verify function name is set correctly
+    assert adapter.function_name == "adapt"
 
-def test_code_string_db_param_with_context(
-    sample_db: Path, adapt_code_db_param_with_context_string: str
-):
-    """Test adapter with a code string using db: SDIFDatabase and context."""
-    context_value = "db_context_test_value"
-    adapter = CodeAdapter(
-        adapt_code_db_param_with_context_string,
-        extra_context={"db_value": context_value},
-        disable_security_warning=True,
-    )
+    # Execute adaptation
     output_path = adapter.adapt(sample_db)
 
-    with SDIFDatabase(output_path) as db:
-        result = db.query(
-            "SELECT context_from_db_param FROM test_table LIMIT 1", return_format="dict"
-        )
-        assert result
-        assert result[0]["context_from_db_param"] == context_value
+    # Verify output path and existence
+    assert output_path.exists()
+    assert output_path.name == f"{sample_db.stem}_adapted{sample_db.suffix}"
 
 
 def test_custom_output_suffix(sample_db: Path, simple_adapt_function: Callable):
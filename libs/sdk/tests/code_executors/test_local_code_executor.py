@@ -1,9 +1,15 @@
+import functools
+import inspect
+import sqlite3
 from pathlib import Path
+from types import CodeType
+from typing import Any, Dict, Optional, Type, Union
 
 import pytest
 from satif_core.exceptions import CodeExecutionError
 from sdif_db.database import SDIFDatabase as ConcreteSDIFDatabase
 
+from satif_sdk.code_executors import local_executor
 from satif_sdk.code_executors.local_executor import LocalCodeExecutor
 
 # --- Fixtures ---
@@ -21,11 +27,32 @@ def executor_with_warning() -> LocalCodeExecutor:
     return LocalCodeExecutor(disable_security_warning=False)
 
 
-@pytest.fixture
-def sample_sdif_path(tmp_path: Path) -> Path:
+def _skip_fsync(db: ConcreteSDIFDatabase) -> None:
+    """Relaxes durability for throwaway fixture data (the file stays in WAL mode)."""
+    db.conn.execute("PRAGMA synchronous=OFF")
+    db.conn.execute("PRAGMA temp_store=MEMORY")
+
+
+@pytest.fixture(scope="session")
+def sample_sdif_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Directory holding the sample SDIF files shared by the whole session."""
+    return tmp_path_factory.mktemp("sdif_samples")
+
+
+@pytest.fixture(scope="session")
+def missing_sdif_path(sample_sdif_dir: Path) -> Path:
+    """A source path that is never created, for failures that precede DB access."""
+    return sample_sdif_dir / "never_opened.sdif"
+
+
+# The sample databases are built once and shared: every snippet in this module
+# only reads from them.
+@pytest.fixture(scope="session")
+def sample_sdif_path(sample_sdif_dir: Path) -> Path:
     """Creates a simple SDIF file and returns its path."""
-    db_path = tmp_path / "sample.sdif"
+    db_path = sample_sdif_dir / "sample.sdif"
     db = ConcreteSDIFDatabase(db_path)
+    _skip_fsync(db)
     source_id = db.add_source("test_source.csv", "csv", "Test source data")
     db.create_table(
         "my_data",
@@ -38,11 +65,12 @@ def sample_sdif_path(tmp_path: Path) -> Path:
     return db_path
 
 
-@pytest.fixture
-def another_sample_sdif_path(tmp_path: Path) -> Path:
+@pytest.fixture(scope="session")
+def another_sample_sdif_path(sample_sdif_dir: Path) -> Path:
     """Creates another simple SDIF file for multi-source tests."""
-    db_path = tmp_path / "another_sample.sdif"
+    db_path = sample_sdif_dir / "another_sample.sdif"
     db = ConcreteSDIFDatabase(db_path)
+    _skip_fsync(db)
     source_id = db.add_source("other_source.txt", "txt", "Other source")
     db.create_table(
         "other_table", {"key": {"type": "TEXT"}, "data": {"type": "INTEGER"}}, source_id
@@ -155,47 +183,112 @@ def process_data_no_prefix(conn: sqlite3.Connection) -> Dict[str, Any]:
     return {"count_no_prefix": count}
 """
 
-# --- Basic Tests ---
+# Compiled once per module: the executor runs code objects as-is, so cases that
+# do not exercise the string path skip re-parsing the same snippets every run.
+# CODE_SYNTAX_ERROR stays a string; its case needs the executor's compile step.
+_CODE_CACHE: Dict[str, CodeType] = {
+    name: compile(src, f"<{name}>", "exec")
+    for name, src in [
+        ("CODE_CONN_ONLY", CODE_CONN_ONLY),
+        ("CODE_CONN_CONTEXT", CODE_CONN_CONTEXT),
+        ("CODE_DB_ONLY", CODE_DB_ONLY),
+        ("CODE_DB_CONTEXT", CODE_DB_CONTEXT),
+        ("CODE_GLOBAL_CONTEXT_CHECK", CODE_GLOBAL_CONTEXT_CHECK),
+        ("CODE_RETURN_NOT_DICT", CODE_RETURN_NOT_DICT),
+        ("CODE_RUNTIME_ERROR_INSIDE", CODE_RUNTIME_ERROR_INSIDE),
+        ("CODE_WRONG_SIGNATURE_NO_DB_CONN", CODE_WRONG_SIGNATURE_NO_DB_CONN),
+        (
+            "CODE_WRONG_SIGNATURE_MISSING_REQUIRED",
+            CODE_WRONG_SIGNATURE_MISSING_REQUIRED,
+        ),
+        ("CODE_CONN_ONLY_NO_PREFIX", CODE_CONN_ONLY_NO_PREFIX),
+    ]
+}
 
+# --- Basic Tests ---
 
-def test_execute_conn_only(executor: LocalCodeExecutor, sample_sdif_path: Path):
-    sdif_sources = {"db": sample_sdif_path}
-    result = executor.execute(CODE_CONN_ONLY, "process_data", sdif_sources, {})
+# (code, function_name, schema_name, extra_context, expected)
+EXECUTE_CASES = [
+    pytest.param(
+        CODE_CONN_ONLY, "process_data", "db", {}, {"count": 2}, id="conn_only"
+    ),
+    pytest.param(
+        _CODE_CACHE["CODE_CONN_ONLY"],
+        "process_data",
+        "db",
+        {},
+        {"count": 2},
+        id="precompiled_code",
+    ),
+    pytest.param(
+        _CODE_CACHE["CODE_CONN_CONTEXT"],
+        "process_data_ctx",
+        "db",
+        {"prefix": "test"},
+        {"test_value": "alpha"},
+        id="conn_context",
+    ),
+    pytest.param(
+        _CODE_CACHE["CODE_DB_ONLY"],
+        "process_data_db",
+        "db",
+        {},
+        {"db_count": 2},
+        id="db_only",
+    ),
+    pytest.param(
+        _CODE_CACHE["CODE_DB_CONTEXT"],
+        "process_data_db_ctx",
+        "db",
+        {"multiplier": 3},
+        {"multiplied_id": 6},  # id for 'beta' is 2, 2*3=6
+        id="db_context",
+    ),
+    pytest.param(
+        _CODE_CACHE["CODE_GLOBAL_CONTEXT_CHECK"],
+        "check_global",
+        "db",
+        {"test_global": "hello_global"},
+        {"global_check": "hello_global"},
+        id="global_context_injection",
+    ),
+    pytest.param(
+        # No imports: sqlite3 comes from the executor's globals
+        "def no_imports(conn: sqlite3.Connection) -> dict:\n"
+        "    return {'rows': conn.execute('SELECT COUNT(*) FROM db.my_data').fetchone()[0]}\n",
+        "no_imports",
+        "db",
+        {},
+        {"rows": 2},
+        id="preloaded_globals",
+    ),
+    pytest.param(
+        _CODE_CACHE["CODE_CONN_ONLY_NO_PREFIX"],
+        "process_data_no_prefix",
+        "arbitrary_schema_for_attach",
+        {},
+        {"count_no_prefix": 2},
+        id="conn_only_no_prefix",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "code, function_name, schema_name, extra_context, expected", EXECUTE_CASES
+)
+def test_execute(
+    executor: LocalCodeExecutor,
+    sample_sdif_path: Path,
+    code: Union[str, CodeType],
+    function_name: str,
+    schema_name: str,
+    extra_context: Dict[str, Any],
+    expected: Dict[str, Any],
+):
+    sdif_sources = {schema_name: sample_sdif_path}
+    result = executor.execute(code, function_name, sdif_sources, extra_context)
     assert isinstance(result, dict)
-    assert result == {"count": 2}
-
-
-def test_execute_conn_context(executor: LocalCodeExecutor, sample_sdif_path: Path):
-    sdif_sources = {"db": sample_sdif_path}
-    extra_context = {"prefix": "test"}
-    result = executor.execute(
-        CODE_CONN_CONTEXT, "process_data_ctx", sdif_sources, extra_context
-    )
-    assert result == {"test_value": "alpha"}
-
-
-def test_execute_db_only(executor: LocalCodeExecutor, sample_sdif_path: Path):
-    sdif_sources = {"db": sample_sdif_path}
-    result = executor.execute(CODE_DB_ONLY, "process_data_db", sdif_sources, {})
-    assert result == {"db_count": 2}
-
-
-def test_execute_db_context(executor: LocalCodeExecutor, sample_sdif_path: Path):
-    sdif_sources = {"db": sample_sdif_path}
-    extra_context = {"multiplier": 3}
-    result = executor.execute(
-        CODE_DB_CONTEXT, "process_data_db_ctx", sdif_sources, extra_context
-    )
-    assert result == {"multiplied_id": 6}  # id for 'beta' is 2, 2*3=6
-
-
-def test_global_context_injection(executor: LocalCodeExecutor, sample_sdif_path: Path):
-    sdif_sources = {"db": sample_sdif_path}
-    extra_context = {"test_global": "hello_global"}
-    result = executor.execute(
-        CODE_GLOBAL_CONTEXT_CHECK, "check_global", sdif_sources, extra_context
-    )
-    assert result == {"global_check": "hello_global"}
+    assert result == expected
 
 
 def test_execute_multiple_sources_conn(
@@ -215,98 +308,178 @@ def process_multi(conn: sqlite3.Connection) -> Dict[str, Any]:
     assert result == {"db1_count": 2, "aux_db_count": 2}
 
 
-def test_execute_conn_only_no_prefix(
-    executor: LocalCodeExecutor, sample_sdif_path: Path
-):
-    sdif_sources = {"arbitrary_schema_for_attach": sample_sdif_path}
-    result = executor.execute(
-        CODE_CONN_ONLY_NO_PREFIX, "process_data_no_prefix", sdif_sources, {}
+def test_initial_context_cannot_replace_builtins(sample_sdif_path: Path):
+    executor = LocalCodeExecutor(
+        initial_context={"__builtins__": {}, "factor": 3},
+        disable_security_warning=True,
     )
-    assert isinstance(result, dict)
-    assert result == {"count_no_prefix": 2}
-
-
-# --- Error Handling Tests ---
-
-
-def test_error_function_not_found(executor: LocalCodeExecutor, sample_sdif_path: Path):
-    with pytest.raises(
-        CodeExecutionError, match="Function 'non_existent_func' not found"
-    ):
-        executor.execute(
-            CODE_CONN_ONLY, "non_existent_func", {"db": sample_sdif_path}, {}
-        )
-
-
-def test_error_not_callable(executor: LocalCodeExecutor, sample_sdif_path: Path):
-    code = "my_var = 123"
-    with pytest.raises(
-        CodeExecutionError, match="'my_var' defined in code is not a callable function"
-    ):
-        executor.execute(code, "my_var", {"db": sample_sdif_path}, {})
-
-
-def test_error_return_not_dict(executor: LocalCodeExecutor, sample_sdif_path: Path):
-    with pytest.raises(
-        CodeExecutionError, match="must return a Dict. Got <class 'str'>"
-    ):
-        executor.execute(
-            CODE_RETURN_NOT_DICT, "not_a_dict_return", {"db": sample_sdif_path}, {}
-        )
+    code = """
+def count_rows(conn):
+    rows = conn.execute("SELECT * FROM db.my_data").fetchall()
+    return {"n": len(rows) * factor, "typing_preloaded": "Dict" in globals()}
+"""
+    result = executor.execute(code, "count_rows", {"db": sample_sdif_path}, {})
+    assert result == {"n": 6, "typing_preloaded": False}
 
 
-def test_error_syntax_error_in_code(
-    executor: LocalCodeExecutor, sample_sdif_path: Path
+def test_session_reuses_attached_connection(
+    executor: LocalCodeExecutor,
+    sample_sdif_path: Path,
+    another_sample_sdif_path: Path,
+    mocker,
 ):
-    with pytest.raises(
-        CodeExecutionError
-    ) as excinfo:  # Check for wrapped original error
-        executor.execute(
-            CODE_SYNTAX_ERROR, "func_with_syntax_error", {"db": sample_sdif_path}, {}
+    sdif_sources = {"db1": sample_sdif_path, "aux_db": another_sample_sdif_path}
+    code = """
+def grab_conn(conn):
+    c1 = conn.execute("SELECT COUNT(*) FROM db1.my_data").fetchone()[0]
+    c2 = conn.execute("SELECT COUNT(*) FROM aux_db.other_table").fetchone()[0]
+    return {"conn": conn, "counts": (c1, c2)}
+"""
+    connect = mocker.spy(local_executor, "create_db_connection")
+    with executor.session():
+        first = executor.execute(code, "grab_conn", sdif_sources, {})
+        second = executor.execute(code, "grab_conn", sdif_sources, {})
+    assert first["counts"] == second["counts"] == (2, 2)
+    assert first["conn"] is second["conn"]
+    assert connect.call_count == 1
+    with pytest.raises(sqlite3.ProgrammingError):  # closed with the session
+        first["conn"].execute("SELECT 1")
+
+
+def test_execute_reuses_signature_for_same_code(
+    executor: LocalCodeExecutor, sample_sdif_path: Path, mocker
+):
+    # A snippet of its own: equal code objects share a cache entry
+    code_obj = compile(
+        CODE_CONN_ONLY.replace("def process_data(", "def process_data_sig_cache("),
+        "<signature-cache>",
+        "exec",
+    )
+    spy = mocker.spy(inspect, "signature")
+    for _ in range(3):
+        result = executor.execute(
+            code_obj, "process_data_sig_cache", {"db": sample_sdif_path}, {}
         )
-    assert isinstance(excinfo.value.__cause__, SyntaxError)
+        assert result == {"count": 2}
+    assert spy.call_count == 1
 
 
-def test_error_runtime_error_inside_func(
+def test_execute_decorated_functions_keep_own_signatures(
     executor: LocalCodeExecutor, sample_sdif_path: Path
 ):
-    with pytest.raises(CodeExecutionError) as excinfo:
-        executor.execute(
-            CODE_RUNTIME_ERROR_INSIDE,
-            "func_with_runtime_error",
-            {"db": sample_sdif_path},
-            {},
-        )
-    assert isinstance(excinfo.value.__cause__, ZeroDivisionError)
+    # Every function this decorator returns shares the wrapper's __code__.
+    def logged(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
 
+        return wrapper
 
-def test_error_wrong_signature_no_db_conn(
-    executor: LocalCodeExecutor, sample_sdif_path: Path
-):
-    with pytest.raises(
-        CodeExecutionError,
-        match=r"Transformation function 'wrong_sig_no_db_conn's first required parameter must be 'db' or 'conn' if other arguments are expected. Got 'some_other_param'. Signature: \(some_other_param: int\) -> Dict\[str, Any\]",
-    ):
-        executor.execute(
-            CODE_WRONG_SIGNATURE_NO_DB_CONN,
-            "wrong_sig_no_db_conn",
-            {"db": sample_sdif_path},
-            {},
-        )
+    sdif_sources = {"db": sample_sdif_path}
+    conn_code = """
+@logged
+def transform(conn):
+    return {"count": conn.execute("SELECT COUNT(*) FROM db.my_data").fetchone()[0]}
+"""
+    db_code = """
+@logged
+def transform(db):
+    return {"is_db": isinstance(db, SDIFDatabase)}
+"""
+    context = {"logged": logged}
+    assert executor.execute(conn_code, "transform", sdif_sources, context) == {
+        "count": 2
+    }
+    assert executor.execute(db_code, "transform", sdif_sources, context) == {
+        "is_db": True
+    }
 
 
-def test_error_wrong_signature_missing_required(
-    executor: LocalCodeExecutor, sample_sdif_path: Path
+# --- Error Handling Tests ---
+
+# (code, function_name, match, expected_cause, needs_db)
+# Cases with needs_db=False fail before any database is opened, so they run
+# against a path that does not exist instead of the sample SDIF.
+ERROR_CASES = [
+    pytest.param(
+        _CODE_CACHE["CODE_CONN_ONLY"],
+        "non_existent_func",
+        "Function 'non_existent_func' not found",
+        None,
+        False,
+        id="function_not_found",
+    ),
+    pytest.param(
+        "my_var = 123",
+        "my_var",
+        "'my_var' defined in code is not a callable function",
+        None,
+        False,
+        id="not_callable",
+    ),
+    pytest.param(
+        _CODE_CACHE["CODE_RETURN_NOT_DICT"],
+        "not_a_dict_return",
+        "must return a Dict. Got <class 'str'>",
+        None,
+        True,
+        id="return_not_dict",
+    ),
+    pytest.param(
+        CODE_SYNTAX_ERROR,
+        "func_with_syntax_error",
+        None,
+        SyntaxError,  # Check for wrapped original error
+        False,
+        id="syntax_error_in_code",
+    ),
+    pytest.param(
+        _CODE_CACHE["CODE_RUNTIME_ERROR_INSIDE"],
+        "func_with_runtime_error",
+        None,
+        ZeroDivisionError,
+        True,
+        id="runtime_error_inside_func",
+    ),
+    pytest.param(
+        _CODE_CACHE["CODE_WRONG_SIGNATURE_NO_DB_CONN"],
+        "wrong_sig_no_db_conn",
+        r"Transformation function 'wrong_sig_no_db_conn's first required parameter must be 'db' or 'conn' if other arguments are expected. Got 'some_other_param'. Signature: \(some_other_param: int\) -> Dict\[str, Any\]",
+        None,
+        True,
+        id="wrong_signature_no_db_conn",
+    ),
+    pytest.param(
+        _CODE_CACHE["CODE_WRONG_SIGNATURE_MISSING_REQUIRED"],
+        "wrong_sig_missing_req",
+        "is missing required argument 'mandatory_param'",
+        None,
+        True,
+        id="wrong_signature_missing_required",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "code, function_name, match, expected_cause, needs_db", ERROR_CASES
+)
+def test_execute_error(
+    request: pytest.FixtureRequest,
+    executor: LocalCodeExecutor,
+    missing_sdif_path: Path,
+    code: Union[str, CodeType],
+    function_name: str,
+    match: Optional[str],
+    expected_cause: Optional[Type[BaseException]],
+    needs_db: bool,
 ):
-    with pytest.raises(
-        CodeExecutionError, match="is missing required argument 'mandatory_param'"
-    ):
-        executor.execute(
-            CODE_WRONG_SIGNATURE_MISSING_REQUIRED,
-            "wrong_sig_missing_req",
-            {"db": sample_sdif_path},
-            {},
-        )
+    sdif_path = (
+        request.getfixturevalue("sample_sdif_path") if needs_db else missing_sdif_path
+    )
+    with pytest.raises(CodeExecutionError, match=match) as excinfo:
+        executor.execute(code, function_name, {"db": sdif_path}, {})
+    if expected_cause is not None:
+        assert isinstance(excinfo.value.__cause__, expected_cause)
 
 
 def test_error_db_param_multiple_sources(
@@ -316,4 +489,6 @@ def test_error_db_param_multiple_sources(
     with pytest.raises(
         CodeExecutionError, match="'db' parameter requires exactly one SDIF source file"
     ):
-        executor.execute(CODE_DB_ONLY, "process_data_db", sdif_sources, {})
+        executor.execute(
+            _CODE_CACHE["CODE_DB_ONLY"], "process_data_db", sdif_sources, {}
+        )
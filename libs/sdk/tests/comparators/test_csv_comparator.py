@@ -1,17 +1,60 @@
 import csv
+import functools
+import io
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import pytest
 
 from satif_sdk.comparators.csv import CSVComparator
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def comparator() -> CSVComparator:
+    # CSVComparator keeps no per-compare state, so one instance serves the module.
     return CSVComparator()
 
 
+def _is_simple(value: Any, delimiter: str) -> bool:
+    """True if csv.writer would emit `value` unquoted, as plain str()."""
+    if not isinstance(value, (str, int, float)):
+        return False
+    text = str(value)
+    return bool(text) and not any(c in text for c in (delimiter, '"', "\r", "\n"))
+
+
+@functools.lru_cache(maxsize=None)
+def _render_csv(
+    header: Optional[Tuple[str, ...]],
+    rows: Optional[Tuple[Tuple[Any, ...], ...]],
+    delimiter: str,
+) -> str:
+    """Serializes CSV content once per distinct (header, rows, delimiter)."""
+    lines = ([header] if header else []) + list(rows or ())
+    if all(_is_simple(value, delimiter) for line in lines for value in line):
+        # Nothing needs quoting: same output as csv.writer, minus the dialect work
+        return "".join(delimiter.join(map(str, line)) + "\r\n" for line in lines)
+    buf = io.StringIO(newline="")
+    writer = csv.writer(buf, delimiter=delimiter)
+    if header:
+        writer.writerow(header)
+    if rows:
+        writer.writerows(rows)
+    return buf.getvalue()
+
+
+def _csv_text(
+    header: Optional[List[str]],
+    rows: Optional[List[List[Any]]],
+    delimiter: str,
+) -> str:
+    return _render_csv(
+        tuple(header) if header is not None else None,
+        tuple(map(tuple, rows)) if rows is not None else None,
+        delimiter,
+    )
+
+
 def create_csv_file(
     tmp_path: Path,
     file_name: str,
@@ -21,14 +64,22 @@ def create_csv_file(
 ) -> Path:
     file_path = tmp_path / file_name
     with open(file_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f, delimiter=delimiter)
-        if header:
-            writer.writerow(header)
-        if rows:
-            writer.writerows(rows)
+        f.write(_csv_text(header, rows, delimiter))
     return file_path
 
 
+def build_csv_buf(
+    name: str,
+    header: Optional[List[str]],
+    rows: Optional[List[List[Any]]],
+    delimiter: str = ",",
+) -> io.StringIO:
+    """In-memory counterpart of `create_csv_file`; `name` labels the stream in reports."""
+    buf = io.StringIO(_csv_text(header, rows, delimiter), newline="")
+    buf.name = name
+    return buf
+
+
 # --- Basic Equivalence Tests ---
 
 
@@ -51,9 +102,9 @@ def test_compare_identical_files(tmp_path: Path, comparator: CSVComparator):
     )
 
 
-def test_compare_empty_files(tmp_path: Path, comparator: CSVComparator):
-    file1_path = create_csv_file(tmp_path, "empty1.csv", None, None)
-    file2_path = create_csv_file(tmp_path, "empty2.csv", None, None)
+def test_compare_empty_files(comparator: CSVComparator):
+    file1_path = build_csv_buf("empty1.csv", None, None)
+    file2_path = build_csv_buf("empty2.csv", None, None)
 
     result = comparator.compare(file1_path, file2_path)
     assert result["are_equivalent"] is True
@@ -64,10 +115,10 @@ def test_compare_empty_files(tmp_path: Path, comparator: CSVComparator):
     )  # Both have 0 rows
 
 
-def test_compare_header_only_files_identical(tmp_path: Path, comparator: CSVComparator):
+def test_compare_header_only_files_identical(comparator: CSVComparator):
     header = ["ColA", "ColB"]
-    file1_path = create_csv_file(tmp_path, "header1.csv", header, None)
-    file2_path = create_csv_file(tmp_path, "header2.csv", header, None)
+    file1_path = build_csv_buf("header1.csv", header, None)
+    file2_path = build_csv_buf("header2.csv", header, None)
 
     result = comparator.compare(file1_path, file2_path)
     assert result["are_equivalent"] is True
@@ -81,12 +132,12 @@ def test_compare_header_only_files_identical(tmp_path: Path, comparator: CSVComp
 # --- Tests for Comparison Parameters ---
 
 
-def test_compare_ignore_row_order(tmp_path: Path, comparator: CSVComparator):
+def test_compare_ignore_row_order(comparator: CSVComparator):
     header = ["ID", "Name"]
     rows1 = [[1, "Alice"], [2, "Bob"]]
     rows2 = [[2, "Bob"], [1, "Alice"]]
-    file1_path = create_csv_file(tmp_path, "file1_order.csv", header, rows1)
-    file2_path = create_csv_file(tmp_path, "file2_order.csv", header, rows2)
+    file1_path = build_csv_buf("file1_order.csv", header, rows1)
+    file2_path = build_csv_buf("file2_order.csv", header, rows2)
 
     # Default: ignore_row_order=True
     result_ignored = comparator.compare(file1_path, file2_path)
@@ -104,12 +155,12 @@ def test_compare_ignore_row_order(tmp_path: Path, comparator: CSVComparator):
         comparator.compare(file1_path, file2_path, ignore_row_order=False)
 
 
-def test_compare_check_header_order(tmp_path: Path, comparator: CSVComparator):
+def test_compare_check_header_order(comparator: CSVComparator):
     header1 = ["Name", "ID"]
     header2 = ["ID", "Name"]
     rows = [[1, "Alice"]]
-    file1_path = create_csv_file(tmp_path, "h_order1.csv", header1, rows)
-    file2_path = create_csv_file(tmp_path, "h_order2.csv", header2, rows)
+    file1_path = build_csv_buf("h_order1.csv", header1, rows)
+    file2_path = build_csv_buf("h_order2.csv", header2, rows)
 
     # Default: check_header_order=True
     result_ordered = comparator.compare(file1_path, file2_path)
@@ -132,12 +183,12 @@ def test_compare_check_header_order(tmp_path: Path, comparator: CSVComparator):
     )
 
 
-def test_compare_check_header_case(tmp_path: Path, comparator: CSVComparator):
+def test_compare_check_header_case(comparator: CSVComparator):
     header1 = ["Name", "ID"]
     header2 = ["name", "id"]
     rows = [["Alice", 1]]
-    file1_path = create_csv_file(tmp_path, "h_case1.csv", header1, rows)
-    file2_path = create_csv_file(tmp_path, "h_case2.csv", header2, rows)
+    file1_path = build_csv_buf("h_case1.csv", header1, rows)
+    file2_path = build_csv_buf("h_case2.csv", header2, rows)
 
     # Default: check_header_case=True
     result_cs = comparator.compare(file1_path, file2_path)
@@ -156,14 +207,14 @@ def test_compare_check_header_case(tmp_path: Path, comparator: CSVComparator):
     )
 
 
-def test_compare_strip_whitespace(tmp_path: Path, comparator: CSVComparator):
+def test_compare_strip_whitespace(comparator: CSVComparator):
     header1 = ["  ID  ", "Name"]
     rows1 = [["  1  ", "  Alice  "]]
     header2 = ["ID", "Name"]
     rows2 = [["1", "Alice"]]
 
-    file1_path = create_csv_file(tmp_path, "ws1.csv", header1, rows1)
-    file2_path = create_csv_file(tmp_path, "ws2.csv", header2, rows2)
+    file1_path = build_csv_buf("ws1.csv", header1, rows1)
+    file2_path = build_csv_buf("ws2.csv", header2, rows2)
 
     # Default: strip_whitespace=True
     result_stripped = comparator.compare(file1_path, file2_path)
@@ -191,39 +242,46 @@ def test_compare_strip_whitespace(tmp_path: Path, comparator: CSVComparator):
     assert result_not_stripped["details"]["row_comparison"]["row_count2"] == 1
 
 
-def test_compare_decimal_places(tmp_path: Path, comparator: CSVComparator):
+DECIMAL_PLACES_CASES = [
+    # (compare kwargs, are_equivalent, expected row_comparison result)
+    pytest.param({}, True, "Identical content (within 2 decimal places)", id="default"),
+    pytest.param(
+        {"decimal_places": None}, False, "Different content", id="no_rounding"
+    ),
+    pytest.param(
+        # 1.234 vs 1.230 (when file2 is read)
+        {"decimal_places": 3},
+        False,
+        "Different content (within 3 decimal places)",
+        id="three_places",
+    ),
+]
+
+
+@pytest.mark.parametrize("kwargs, are_equivalent, expected", DECIMAL_PLACES_CASES)
+def test_compare_decimal_places(
+    comparator: CSVComparator,
+    kwargs: Dict[str, Any],
+    are_equivalent: bool,
+    expected: str,
+):
     header = ["Value1", "Value2"]
     rows1 = [[1.234, 5.678]]
     rows2 = [[1.23, 5.68]]  # Rounded versions
-    file1_path = create_csv_file(tmp_path, "dec1.csv", header, rows1)
-    file2_path = create_csv_file(tmp_path, "dec2.csv", header, rows2)
-
-    # Default decimal_places=2
-    result_default_dp = comparator.compare(file1_path, file2_path)
-    assert result_default_dp["are_equivalent"] is True
-    assert (
-        "Identical content (within 2 decimal places)"
-        in result_default_dp["details"]["row_comparison"]["result"]
-    )
+    file1_path = build_csv_buf("dec1.csv", header, rows1)
+    file2_path = build_csv_buf("dec2.csv", header, rows2)
 
-    # No rounding (decimal_places=None)
-    result_no_dp = comparator.compare(file1_path, file2_path, decimal_places=None)
-    assert result_no_dp["are_equivalent"] is False
-    assert "Different content" in result_no_dp["details"]["row_comparison"]["result"]
+    result = comparator.compare(file1_path, file2_path, **kwargs)
+    assert result["are_equivalent"] is are_equivalent
+    assert expected in result["details"]["row_comparison"]["result"]
 
-    # Different decimal_places
-    result_dp3 = comparator.compare(file1_path, file2_path, decimal_places=3)
-    assert result_dp3["are_equivalent"] is False  # 1.234 vs 1.230 (when file2 is read)
-    assert (
-        "Different content (within 3 decimal places)"
-        in result_dp3["details"]["row_comparison"]["result"]
-    )
 
-    # Test with non-numeric data (should not error, just compare as strings)
+def test_compare_decimal_places_non_numeric(comparator: CSVComparator):
+    # Non-numeric data should not error, just compare as strings
     rows_non_numeric1 = [["abc", "def"]]
     rows_non_numeric2 = [["abc", "def"]]
-    file_nn1 = create_csv_file(tmp_path, "nn1.csv", ["ColA"], rows_non_numeric1)
-    file_nn2 = create_csv_file(tmp_path, "nn2.csv", ["ColA"], rows_non_numeric2)
+    file_nn1 = build_csv_buf("nn1.csv", ["ColA"], rows_non_numeric1)
+    file_nn2 = build_csv_buf("nn2.csv", ["ColA"], rows_non_numeric2)
     result_nn = comparator.compare(file_nn1, file_nn2, decimal_places=2)
     assert result_nn["are_equivalent"] is True
     assert (
@@ -232,18 +290,16 @@ def test_compare_decimal_places(tmp_path: Path, comparator: CSVComparator):
     )
 
 
-def test_compare_check_structure_only(tmp_path: Path, comparator: CSVComparator):
+def test_compare_check_structure_only(comparator: CSVComparator):
     header1 = ["ID", "Name"]
     rows1 = [[1, "Alice"]]
     header2 = ["ID", "Name"]
     rows2 = [[2, "Bob"]]
     header3 = ["ID", "Value"]
 
-    file1_path = create_csv_file(tmp_path, "struct1.csv", header1, rows1)
-    file2_path = create_csv_file(
-        tmp_path, "struct2.csv", header2, rows2
-    )  # Same header, diff rows
-    file3_path = create_csv_file(tmp_path, "struct3.csv", header3, rows1)  # Diff header
+    file1_path = build_csv_buf("struct1.csv", header1, rows1)
+    file2_path = build_csv_buf("struct2.csv", header2, rows2)  # Same header, diff rows
+    file3_path = build_csv_buf("struct3.csv", header3, rows1)  # Diff header
 
     # Equivalent structure, different rows
     result_eq_struct = comparator.compare(
@@ -273,10 +329,8 @@ def test_compare_check_structure_only(tmp_path: Path, comparator: CSVComparator)
 def test_compare_different_delimiters(tmp_path: Path, comparator: CSVComparator):
     header = ["A", "B"]
     rows = [[1, 2]]
-    file_comma_path = create_csv_file(
-        tmp_path, "comma.csv", header, rows, delimiter=","
-    )
-    file_semi_path = create_csv_file(tmp_path, "semi.csv", header, rows, delimiter=";")
+    file_comma_path = create_csv_file(tmp_path, "comma.csv", header, rows, ",")
+    file_semi_path = create_csv_file(tmp_path, "semi.csv", header, rows, ";")
 
     # Auto-detect (should work)
     result_auto = comparator.compare(
@@ -308,15 +362,35 @@ def test_compare_different_delimiters(tmp_path: Path, comparator: CSVComparator)
     )
 
 
+def test_compare_files_with_encoding(tmp_path: Path, comparator: CSVComparator):
+    latin1_text = "ID,Name\r\n1,Café\r\n2,Crème\r\n"
+    file1_path = tmp_path / "latin1_a.csv"
+    file2_path = tmp_path / "latin1_b.csv"
+    file1_path.write_bytes(latin1_text.encode("latin-1"))
+    file2_path.write_bytes(latin1_text.replace("Café", "Cafe").encode("latin-1"))
+
+    result = comparator.compare(file1_path, file1_path, encoding="latin-1")
+    assert result["are_equivalent"] is True
+    assert result["comparison_params"]["encoding"] == "latin-1"
+
+    result = comparator.compare(file1_path, file2_path, encoding="latin-1")
+    assert result["are_equivalent"] is False
+
+    # Undecodable bytes are replaced rather than aborting the comparison.
+    result = comparator.compare(file1_path, file1_path)
+    assert result["are_equivalent"] is True
+    assert not result["details"].get("errors")
+
+
 # --- Basic Non-Equivalence Tests ---
 
 
-def test_compare_different_header_names(tmp_path: Path, comparator: CSVComparator):
+def test_compare_different_header_names(comparator: CSVComparator):
     header1 = ["ID", "Name"]
     header2 = ["ID", "Value"]
     rows = [[1, "Alice"]]
-    file1_path = create_csv_file(tmp_path, "h_diff1.csv", header1, rows)
-    file2_path = create_csv_file(tmp_path, "h_diff2.csv", header2, rows)
+    file1_path = build_csv_buf("h_diff1.csv", header1, rows)
+    file2_path = build_csv_buf("h_diff2.csv", header2, rows)
 
     result = comparator.compare(file1_path, file2_path)
     assert result["are_equivalent"] is False
@@ -329,26 +403,39 @@ def test_compare_different_header_names(tmp_path: Path, comparator: CSVComparato
     )
 
 
-def test_compare_different_column_count(tmp_path: Path, comparator: CSVComparator):
+def test_compare_different_column_count(comparator: CSVComparator):
     header1 = ["ID", "Name"]
     header2 = ["ID", "Name", "Age"]
     rows = [[1, "Alice"]]
-    file1_path = create_csv_file(tmp_path, "cc1.csv", header1, rows)
-    file2_path = create_csv_file(tmp_path, "cc2.csv", header2, rows)
+    file1_path = build_csv_buf("cc1.csv", header1, rows)
+    file2_path = build_csv_buf("cc2.csv", header2, rows)
 
     result = comparator.compare(file1_path, file2_path)
     assert result["are_equivalent"] is False
     assert "Different column count" in result["details"]["header_comparison"]["result"]
 
 
-def test_compare_different_row_content_unique_rows(
-    tmp_path: Path, comparator: CSVComparator
-):
+def test_compare_header_mismatch_counts_rows_without_tallying(mocker):
+    comparator = CSVComparator()
+    tally = mocker.spy(comparator, "_tally_rows")
+    file1_path = build_csv_buf("cc1.csv", ["ID", "Name"], [[1, "Alice"], [2, "Bob"]])
+    file2_path = build_csv_buf("cc2.csv", ["ID", "Name", "Age"], [[1, "Alice", 30]])
+
+    result = comparator.compare(file1_path, file2_path)
+    assert result["details"]["row_comparison"] == {
+        "result": "Not compared (header mismatch)",
+        "row_count1": 2,
+        "row_count2": 1,
+    }
+    tally.assert_not_called()
+
+
+def test_compare_different_row_content_unique_rows(comparator: CSVComparator):
     header = ["ID", "Name"]
     rows1 = [[1, "Alice"], [2, "Bob"]]
     rows2 = [[1, "Alice"], [3, "Charlie"]]
-    file1_path = create_csv_file(tmp_path, "rc1.csv", header, rows1)
-    file2_path = create_csv_file(tmp_path, "rc2.csv", header, rows2)
+    file1_path = build_csv_buf("rc1.csv", header, rows1)
+    file2_path = build_csv_buf("rc2.csv", header, rows2)
 
     result = comparator.compare(file1_path, file2_path)
     assert result["are_equivalent"] is False
@@ -359,12 +446,12 @@ def test_compare_different_row_content_unique_rows(
     assert result["details"]["row_comparison"]["unique_rows2"][0] == [3, "Charlie"]
 
 
-def test_compare_different_row_counts(tmp_path: Path, comparator: CSVComparator):
+def test_compare_different_row_counts(comparator: CSVComparator):
     header = ["ID"]
     rows1 = [[1], [2]]
     rows2 = [[1], [2], [3]]
-    file1_path = create_csv_file(tmp_path, "rcount1.csv", header, rows1)
-    file2_path = create_csv_file(tmp_path, "rcount2.csv", header, rows2)
+    file1_path = build_csv_buf("rcount1.csv", header, rows1)
+    file2_path = build_csv_buf("rcount2.csv", header, rows2)
 
     result = comparator.compare(file1_path, file2_path)
     assert result["are_equivalent"] is False
@@ -374,14 +461,12 @@ def test_compare_different_row_counts(tmp_path: Path, comparator: CSVComparator)
     assert any("Total row counts differ" in s for s in result["summary"])
 
 
-def test_compare_different_row_occurrence_counts(
-    tmp_path: Path, comparator: CSVComparator
-):
+def test_compare_different_row_occurrence_counts(comparator: CSVComparator):
     header = ["ID"]
     rows1 = [[1], [1], [2]]  # ID 1 appears twice
     rows2 = [[1], [2], [2]]  # ID 2 appears twice
-    file1_path = create_csv_file(tmp_path, "rocc1.csv", header, rows1)
-    file2_path = create_csv_file(tmp_path, "rocc2.csv", header, rows2)
+    file1_path = build_csv_buf("rocc1.csv", header, rows1)
+    file2_path = build_csv_buf("rocc2.csv", header, rows2)
 
     result = comparator.compare(file1_path, file2_path)
     assert result["are_equivalent"] is False
@@ -417,11 +502,11 @@ def test_compare_file_not_found(tmp_path: Path, comparator: CSVComparator):
     assert "File not found" in result["details"]["errors"][0]
 
 
-def test_compare_one_file_empty_one_not(tmp_path: Path, comparator: CSVComparator):
+def test_compare_one_file_empty_one_not(comparator: CSVComparator):
     header = ["ID"]
     rows = [[1]]
-    file_empty_path = create_csv_file(tmp_path, "empty_comp.csv", None, None)
-    file_content_path = create_csv_file(tmp_path, "content_comp.csv", header, rows)
+    file_empty_path = build_csv_buf("empty_comp.csv", None, None)
+    file_content_path = build_csv_buf("content_comp.csv", header, rows)
 
     result = comparator.compare(file_empty_path, file_content_path)
     assert result["are_equivalent"] is False
@@ -431,23 +516,25 @@ def test_compare_one_file_empty_one_not(tmp_path: Path, comparator: CSVComparato
     assert "File 1 has no header" in result["details"]["header_comparison"]["diff"][0]
 
 
-def test_compare_ragged_rows_adapted(tmp_path: Path, comparator: CSVComparator):
+def test_compare_ragged_rows_adapted(comparator: CSVComparator):
     # File1 has a consistent structure
     header1 = ["ID", "Name", "Value"]
     rows1 = [
         ["1", "Alice", "100"],
         ["2", "Bob", "200"],
     ]
-    file1_path = create_csv_file(tmp_path, "ragged_base.csv", header1, rows1)
+    file1_path = build_csv_buf("ragged_base.csv", header1, rows1)
 
     # File2 has a ragged row (fewer columns) and one with more (should be truncated)
-    file_path_ragged = tmp_path / "ragged.csv"
-    with open(file_path_ragged, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["ID", "Name", "Value"])  # Header
-        writer.writerow(["1", "Alice", "100"])  # Correct row
-        writer.writerow(["2", "Bob"])  # Ragged row (missing one)
-        writer.writerow(["3", "Charlie", "300", "Extra"])  # Ragged row (extra one)
+    file_path_ragged = build_csv_buf(
+        "ragged.csv",
+        ["ID", "Name", "Value"],  # Header
+        [
+            ["1", "Alice", "100"],  # Correct row
+            ["2", "Bob"],  # Ragged row (missing one)
+            ["3", "Charlie", "300", "Extra"],  # Ragged row (extra one)
+        ],
+    )
 
     # Default comparison (ignore_row_order=True)
     # The comparator should adapt ragged rows: pad missing, truncate extra.
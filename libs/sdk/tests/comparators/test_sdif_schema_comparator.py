@@ -1,24 +1,29 @@
+import copy
+import re
 from typing import Any, Dict
 
 import pytest
 from sdif_db.schema import SDIFSchemaConfig
 
+from satif_sdk.comparators import sdif_schema as sdif_schema_module
 from satif_sdk.comparators.sdif_schema import SDIFSchemaComparator
 
 # --- Fixtures and Helper Data ---
 
+_COLUMN_INDEX_RE = re.compile(r"\['columns'\]\[(\d+)\]")
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def default_config() -> SDIFSchemaConfig:
     return SDIFSchemaConfig()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def comparator_default_config(default_config: SDIFSchemaConfig) -> SDIFSchemaComparator:
     return SDIFSchemaComparator(config=default_config)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def basic_schema_1() -> Dict[str, Any]:
     return {
         "sdif_properties": {"sdif_version": "1.0"},
@@ -43,7 +48,7 @@ def basic_schema_1() -> Dict[str, Any]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def basic_schema_1_copy() -> Dict[str, Any]:  # Identical to basic_schema_1
     return {
         "sdif_properties": {"sdif_version": "1.0"},
@@ -68,7 +73,7 @@ def basic_schema_1_copy() -> Dict[str, Any]:  # Identical to basic_schema_1
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def basic_schema_2_diff_col_name() -> Dict[str, Any]:
     return {
         "sdif_properties": {"sdif_version": "1.0"},
@@ -93,7 +98,7 @@ def basic_schema_2_diff_col_name() -> Dict[str, Any]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def basic_schema_3_diff_col_order() -> Dict[str, Any]:
     return {
         "sdif_properties": {"sdif_version": "1.0"},
@@ -118,7 +123,7 @@ def basic_schema_3_diff_col_order() -> Dict[str, Any]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def basic_schema_4_diff_table_name() -> Dict[str, Any]:
     return {
         "sdif_properties": {"sdif_version": "1.0"},
@@ -228,17 +233,20 @@ def test_compare_nonequivalent_schemas_col_order_default_config(
     assert are_equivalent is False
     assert "Schema differences found" in diff[0]
 
-    # Look for any indication of changes to the columns
-    found_col0_change = False
-    found_col1_change = False
-    for line in diff:
-        if "columns" in line and ("0" in line or "[0]" in line):
-            found_col0_change = True
-        if "columns" in line and ("1" in line or "[1]" in line):
-            found_col1_change = True
+    # The summary truncates long change sets, so read column positions from the
+    # full DeepDiff paths instead.
+    _, diff_dict = comparator_default_config.compare(
+        basic_schema_1, basic_schema_3_diff_col_order, verbose_diff_level=1
+    )
+    changed_columns = {
+        match.group(1)
+        for paths in diff_dict.values()
+        for path in paths
+        if (match := _COLUMN_INDEX_RE.search(path))
+    }
 
-    assert found_col0_change, "No mentions of changes to column 0 found"
-    assert found_col1_change, "No mentions of changes to column 1 found"
+    assert "0" in changed_columns, "No mentions of changes to column 0 found"
+    assert "1" in changed_columns, "No mentions of changes to column 1 found"
 
 
 def test_compare_nonequivalent_schemas_table_name_default_config(
@@ -370,10 +378,122 @@ def test_compare_nonequivalent_with_config_enforce_sdif_version(
     assert "Schemas are equivalent" in diff_ignored[0]
 
 
+def test_compare_reuses_minimal_schemas(
+    mocker,
+    basic_schema_1: Dict[str, Any],
+    basic_schema_1_copy: Dict[str, Any],
+):
+    # A fresh comparator: the shared one may already hold these schemas.
+    comparator = SDIFSchemaComparator()
+    spy = mocker.spy(sdif_schema_module, "apply_rules_to_schema")
+
+    for _ in range(3):
+        are_equivalent, _diff = comparator.compare(basic_schema_1, basic_schema_1_copy)
+        assert are_equivalent is True
+    assert comparator.is_compatible_with(basic_schema_1, basic_schema_1_copy)
+
+    assert spy.call_count == 2
+
+
+def test_compare_minimal_schemas_follow_mutations(
+    basic_schema_1: Dict[str, Any],
+    basic_schema_1_copy: Dict[str, Any],
+):
+    # Own comparator and config: this test mutates both.
+    comparator = SDIFSchemaComparator()
+    basic_schema_1_copy = copy.deepcopy(basic_schema_1_copy)
+    assert comparator.compare(basic_schema_1, basic_schema_1_copy)[0]
+
+    # In-place edits to a schema already seen must not hit a stale entry.
+    basic_schema_1_copy["tables"]["table1"]["columns"][1]["name"] = "data"
+    assert not comparator.compare(basic_schema_1, basic_schema_1_copy)[0]
+    basic_schema_1_copy["tables"]["table1"]["columns"][1]["name"] = "value"
+    assert comparator.compare(basic_schema_1, basic_schema_1_copy)[0]
+
+    # Including edits that only change a value's type, which plain == misses.
+    basic_schema_1 = copy.deepcopy(basic_schema_1)
+    basic_schema_1["sdif_properties"]["sdif_version"] = 1
+    basic_schema_1_copy["sdif_properties"]["sdif_version"] = 1
+    assert comparator.compare(basic_schema_1, basic_schema_1_copy)[0]
+    basic_schema_1_copy["sdif_properties"]["sdif_version"] = True
+    assert not comparator.compare(basic_schema_1, basic_schema_1_copy)[0]
+    basic_schema_1_copy["sdif_properties"]["sdif_version"] = 1
+    basic_schema_1_copy["tables"]["table1"]["columns"][1]["name"] = "data"
+
+    # Nor must a config change made after the comparator was created.
+    comparator.config.enforce_column_names = False
+    comparator.config.enforce_column_order = True
+    assert comparator.compare(basic_schema_1, basic_schema_1_copy)[0]
+
+
+@pytest.mark.parametrize(
+    ("verbose_diff_level", "expected_diff"),
+    [
+        (0, ["Schemas are equivalent based on the current configuration."]),
+        (1, {}),
+    ],
+)
+def test_compare_equivalent_skips_deepdiff(
+    mocker,
+    comparator_default_config: SDIFSchemaComparator,
+    basic_schema_1: Dict[str, Any],
+    basic_schema_1_copy: Dict[str, Any],
+    verbose_diff_level: int,
+    expected_diff: Any,
+):
+    deepdiff = mocker.spy(sdif_schema_module, "DeepDiff")
+
+    assert comparator_default_config.compare(
+        basic_schema_1, basic_schema_1_copy, verbose_diff_level=verbose_diff_level
+    ) == (True, expected_diff)
+    deepdiff.assert_not_called()
+
+
+def test_compare_reuses_typed_forms(
+    mocker,
+    comparator_default_config: SDIFSchemaComparator,
+    basic_schema_1: Dict[str, Any],
+    basic_schema_1_copy: Dict[str, Any],
+):
+    assert comparator_default_config.compare(basic_schema_1, basic_schema_1_copy)[0]
+    spy = mocker.spy(sdif_schema_module, "_typed_form")
+
+    for _ in range(2):
+        assert comparator_default_config.compare(basic_schema_1, basic_schema_1_copy)[0]
+    # Only the freshness snapshots of the inputs are taken; minimal forms are reused.
+    minimal_forms = [
+        comparator_default_config._minimal_schema(schema)
+        for schema in (basic_schema_1, basic_schema_1_copy)
+    ]
+    assert spy.call_count > 0
+    assert not any(
+        call.args[0] is minimal
+        for call in spy.call_args_list
+        for minimal in minimal_forms
+    )
+
+
+def test_compare_numeric_type_change_not_equivalent(
+    comparator_default_config: SDIFSchemaComparator,
+    basic_schema_1: Dict[str, Any],
+    basic_schema_1_copy: Dict[str, Any],
+):
+    # 1 == 1.0 in Python, but DeepDiff reports the changed type as a difference.
+    basic_schema_1 = copy.deepcopy(basic_schema_1)
+    basic_schema_1_copy = copy.deepcopy(basic_schema_1_copy)
+    basic_schema_1["sdif_properties"]["sdif_version"] = 1
+    basic_schema_1_copy["sdif_properties"]["sdif_version"] = 1.0
+
+    are_equivalent, _diff = comparator_default_config.compare(
+        basic_schema_1, basic_schema_1_copy
+    )
+    assert are_equivalent is False
+
+
 # --- Fixtures for is_compatible_with tests ---
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def consumer_schema_basic() -> Dict[str, Any]:
     """A basic consumer schema requiring one table with specific columns."""
     return {
@@ -389,13 +509,13 @@ def consumer_schema_basic() -> Dict[str, Any]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def producer_schema_compatible(consumer_schema_basic: Dict[str, Any]) -> Dict[str, Any]:
     """A producer schema that is compatible with consumer_schema_basic."""
     return consumer_schema_basic  # Exact match is compatible
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def producer_schema_compatible_extra_col() -> Dict[str, Any]:
     """Producer has an extra column, still compatible."""
     return {
@@ -412,7 +532,7 @@ def producer_schema_compatible_extra_col() -> Dict[str, Any]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def producer_schema_compatible_extra_table() -> Dict[str, Any]:
     """Producer has an extra table, still compatible."""
     return {
@@ -432,7 +552,7 @@ def producer_schema_compatible_extra_table() -> Dict[str, Any]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def producer_schema_incompatible_missing_col() -> Dict[str, Any]:
     """Producer is missing a column required by consumer."""
     return {
@@ -447,7 +567,7 @@ def producer_schema_incompatible_missing_col() -> Dict[str, Any]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def producer_schema_incompatible_diff_col_type() -> Dict[str, Any]:
     """Producer has a different column type for a required column."""
     return {
@@ -463,7 +583,7 @@ def producer_schema_incompatible_diff_col_type() -> Dict[str, Any]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def producer_schema_incompatible_missing_table() -> Dict[str, Any]:
     """Producer is missing a table required by consumer."""
     return {
@@ -479,83 +599,44 @@ def producer_schema_incompatible_missing_table() -> Dict[str, Any]:
 # --- Test Cases for is_compatible_with method ---
 
 
-def test_is_compatible_with_identical_schemas(
+@pytest.mark.parametrize(
+    ("producer_fixture", "expected"),
+    [
+        pytest.param("producer_schema_compatible", True, id="identical"),
+        pytest.param(
+            "producer_schema_compatible_extra_col", True, id="producer_extra_column"
+        ),
+        # With default config (enforce_table_names=True), the producer's extra table is
+        # ignored as long as the required table ('users') is present and compatible.
+        pytest.param(
+            "producer_schema_compatible_extra_table", True, id="producer_extra_table"
+        ),
+        pytest.param(
+            "producer_schema_incompatible_missing_col", False, id="missing_column"
+        ),
+        pytest.param(
+            "producer_schema_incompatible_diff_col_type",
+            False,
+            id="different_column_type",
+        ),
+        pytest.param(
+            "producer_schema_incompatible_missing_table", False, id="missing_table"
+        ),
+    ],
+)
+def test_is_compatible_with_default_config(
+    request: pytest.FixtureRequest,
     comparator_default_config: SDIFSchemaComparator,
     consumer_schema_basic: Dict[str, Any],
-    producer_schema_compatible: Dict[str, Any],
+    producer_fixture: str,
+    expected: bool,
 ):
+    producer_schema = request.getfixturevalue(producer_fixture)
     assert (
         comparator_default_config.is_compatible_with(
-            consumer_schema_basic, producer_schema_compatible
+            consumer_schema_basic, producer_schema
         )
-        is True
-    )
-
-
-def test_is_compatible_with_producer_has_extra_column(
-    comparator_default_config: SDIFSchemaComparator,
-    consumer_schema_basic: Dict[str, Any],
-    producer_schema_compatible_extra_col: Dict[str, Any],
-):
-    assert (
-        comparator_default_config.is_compatible_with(
-            consumer_schema_basic, producer_schema_compatible_extra_col
-        )
-        is True
-    )
-
-
-def test_is_compatible_with_producer_has_extra_table(
-    comparator_default_config: SDIFSchemaComparator,
-    consumer_schema_basic: Dict[str, Any],
-    producer_schema_compatible_extra_table: Dict[str, Any],
-):
-    # With default config (enforce_table_names=True), the producer's extra table is ignored
-    # as long as the required table ('users') is present and compatible.
-    assert (
-        comparator_default_config.is_compatible_with(
-            consumer_schema_basic, producer_schema_compatible_extra_table
-        )
-        is True
-    )
-
-
-def test_is_incompatible_producer_missing_column(
-    comparator_default_config: SDIFSchemaComparator,
-    consumer_schema_basic: Dict[str, Any],
-    producer_schema_incompatible_missing_col: Dict[str, Any],
-):
-    assert (
-        comparator_default_config.is_compatible_with(
-            consumer_schema_basic, producer_schema_incompatible_missing_col
-        )
-        is False
-    )
-
-
-def test_is_incompatible_producer_diff_column_type(
-    comparator_default_config: SDIFSchemaComparator,
-    consumer_schema_basic: Dict[str, Any],
-    producer_schema_incompatible_diff_col_type: Dict[str, Any],
-):
-    assert (
-        comparator_default_config.is_compatible_with(
-            consumer_schema_basic, producer_schema_incompatible_diff_col_type
-        )
-        is False
-    )
-
-
-def test_is_incompatible_producer_missing_table(
-    comparator_default_config: SDIFSchemaComparator,
-    consumer_schema_basic: Dict[str, Any],
-    producer_schema_incompatible_missing_table: Dict[str, Any],
-):
-    assert (
-        comparator_default_config.is_compatible_with(
-            consumer_schema_basic, producer_schema_incompatible_missing_table
-        )
-        is False
+        is expected
     )
 
 
@@ -718,6 +799,37 @@ def test_compatibility_dict_incompatible_value():
     assert comparator._check_compatibility_recursive(consumer, producer) is False
 
 
+def test_compatibility_stops_at_first_mismatch(mocker):
+    comparator = SDIFSchemaComparator()
+    consumer = {"a": {"x": 1}, **{f"k{i}": {"v": i} for i in range(50)}}
+    producer = {"a": {"x": 2}, **{f"k{i}": {"v": i} for i in range(50)}}
+    spy = mocker.spy(comparator, "_check_compatibility_recursive")
+
+    assert comparator._check_compatibility_recursive(consumer, producer) is False
+    # root -> "a" -> "x": the remaining keys are never visited.
+    assert spy.call_count == 3
+
+
+def test_is_compatible_with_same_schema_object(
+    mocker, comparator_default_config: SDIFSchemaComparator
+):
+    schema = {
+        "sdif_properties": {"sdif_version": "1.0"},
+        "tables": {
+            f"table{i}": {
+                "columns": [{"name": "id", "sqlite_type": "INTEGER", "pk": 1}],
+                "primary_key_columns": ("id",),
+                "foreign_keys": [],
+            }
+            for i in range(20)
+        },
+    }
+    spy = mocker.spy(comparator_default_config, "_check_compatibility_recursive")
+
+    assert comparator_default_config.is_compatible_with(schema, schema) is True
+    assert spy.call_count == 1
+
+
 def test_compatibility_tuple_frozenset_subset():
     # These are canonicalized forms from apply_rules_to_schema
     comparator = SDIFSchemaComparator()
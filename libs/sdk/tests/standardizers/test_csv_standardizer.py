@@ -683,3 +683,29 @@ def test_csv_standardizer_descriptions(create_csv_file, tmp_path: Path):
     assert (
         result_multi.file_configs[str(csv_file2.resolve())]["description"] == "Desc 2"
     )
+
+
+def test_default_skip_config_validated_once(create_csv_file, tmp_path, mocker):
+    """Test that defaults are validated at init and not again for each input file."""
+    from satif_sdk.standardizers import csv as csv_module
+
+    files = [
+        create_csv_file(f"part_{i}.csv", [["id", "v"], ["skip", "me"], [i, "x"]])
+        for i in range(3)
+    ]
+    standardizer = CSVStandardizer(skip_rows={1}, skip_columns=["v"])
+    rows_spy = mocker.spy(csv_module, "validate_skip_rows_config")
+    columns_spy = mocker.spy(csv_module, "validate_skip_columns_config")
+
+    result = standardizer.standardize(files, tmp_path / "out.sdif")
+
+    assert rows_spy.call_count == 0
+    assert columns_spy.call_count == 0
+    configs = list(result.file_configs.values())
+    assert [cfg["skip_rows"] for cfg in configs] == [{1}] * 3
+    assert [cfg["skip_columns"] for cfg in configs] == [["v"]] * 3
+    assert configs[0]["skip_rows"] is not configs[1]["skip_rows"]
+    for table in _get_all_table_names(tmp_path / "out.sdif"):
+        assert len(_get_table_data(tmp_path / "out.sdif", table)) == 1
+        schema = _get_table_schema(tmp_path / "out.sdif", table)
+        assert schema["columns"].keys() == {"id"}
@@ -511,3 +511,23 @@ def test_xlsx_standardizer_case_sensitivity(create_excel_file, tmp_path: Path):
     assert schema["columns"]["id"]["original_column_name"] == "ID"
     assert schema["columns"]["username"]["original_column_name"] == "UserName"
     assert schema["columns"]["lastlogin"]["original_column_name"] == "LastLogin"
+
+
+def test_xlsx_standardizer_na_strings_preserved(create_excel_file, tmp_path: Path):
+    """Test that 'NA'-like strings are kept verbatim while empty cells become NULL."""
+    data = [
+        ["id", "status"],
+        [1, "NA"],
+        [2, "NULL"],
+        [3, None],
+    ]
+
+    excel_file = create_excel_file("na_values.xlsx", {"Statuses": data})
+
+    standardizer = XLSXStandardizer()
+    output_sdif = tmp_path / "na_output.sdif"
+
+    standardizer.standardize(excel_file, output_sdif)
+
+    data_rows = _get_table_data(output_sdif, "statuses")
+    assert [row["status"] for row in data_rows] == ["NA", "NULL", None]
@@ -0,0 +1,163 @@
+import charset_normalizer
+import clevercsv
+import pytest
+
+from satif_sdk import utils
+from satif_sdk.utils import (
+    _guess_common_delimiter,
+    detect_csv_delimiter,
+    detect_file_encoding,
+)
+
+
+def _sample(delimiter: str, rows: int = 6) -> str:
+    lines = [delimiter.join(["id", "name", "city"])]
+    lines += [delimiter.join([str(i), f"name{i}", "Paris"]) for i in range(rows - 1)]
+    return "\n".join(lines) + "\n"
+
+
+@pytest.mark.parametrize("delimiter", [";", "\t", "|"])
+def test_guess_common_delimiter_clear_samples(delimiter: str):
+    sample = _sample(delimiter)
+    assert _guess_common_delimiter(sample) == delimiter
+    assert detect_csv_delimiter(sample) == delimiter
+
+
+def test_guess_common_delimiter_ignores_incomplete_last_line():
+    # Five complete lines plus a truncated one with fewer delimiters.
+    sample = _sample(";", rows=5) + "99;name"
+    assert _guess_common_delimiter(sample) == ";"
+
+
+def test_guess_common_delimiter_needs_five_complete_lines():
+    assert _guess_common_delimiter(_sample(";", rows=4)) is None
+    assert _guess_common_delimiter(_sample(";", rows=5)[:-1]) is None
+
+
+def test_guess_common_delimiter_quoted_fields_fall_back(mocker):
+    sample = (
+        "id,name,city\n"
+        '1,"Doe, John",Paris\n'
+        "2,Smith,Rome\n"
+        '3,"Roe, Jane",Oslo\n'
+        "4,Brown,Lima\n"
+        "5,Green,Kyiv\n"
+    )
+    assert _guess_common_delimiter(sample) is None
+
+    sniff = mocker.spy(clevercsv.Sniffer, "sniff")
+    assert detect_csv_delimiter(sample) == ","
+    sniff.assert_called_once()
+
+
+def test_guess_common_delimiter_ambiguous_sample_falls_back(mocker):
+    # ',' and ';' each appear a fixed number of times per line, so the quick check can't
+    # decide; the sniffer sees that ';' yields consistent columns.
+    sample = "id;name,surname;age\n" + "".join(
+        f"{i};Doe{i},John;{20 + i}\n" for i in range(6)
+    )
+    assert _guess_common_delimiter(sample) is None
+
+    sniff = mocker.spy(clevercsv.Sniffer, "sniff")
+    assert detect_csv_delimiter(sample) == ";"
+    sniff.assert_called_once()
+
+
+_LATIN1_SAMPLE = "nom;ville\nCafé;Crème brûlée\nÉlodie;Besançon\n".encode("latin-1")
+
+
+@pytest.fixture
+def latin1_file(tmp_path):
+    path = tmp_path / "latin1.csv"
+    path.write_bytes(_LATIN1_SAMPLE)
+    return path
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        _LATIN1_SAMPLE,
+        b"a,b\n1,2\n",
+        "a,é\n1,ü\n".encode(),
+        "\ufeffa,b\n1,é\n".encode(),
+    ],
+    ids=["latin1", "ascii", "utf8", "utf8_bom"],
+)
+def test_detect_file_encoding_same_with_and_without_cchardet(
+    monkeypatch, tmp_path, content
+):
+    pytest.importorskip("cchardet")
+    path = tmp_path / "sample.csv"
+    path.write_bytes(content)
+
+    with_cchardet = detect_file_encoding(path)
+    monkeypatch.setattr(utils, "_cchardet_detect", None)
+    assert with_cchardet == detect_file_encoding(path)
+
+
+def test_detect_file_encoding_latin1_sample(monkeypatch, latin1_file):
+    # cchardet calls this 'ISO-8859-1'; only charset-normalizer's name is reported.
+    monkeypatch.setattr(utils, "_cchardet_detect", None)
+    assert detect_file_encoding(latin1_file) == "Windows-1252"
+
+
+@pytest.mark.parametrize(
+    ("cchardet_available", "expected_sample_size"),
+    [
+        (True, utils.CCHARDET_ENCODING_SAMPLE_SIZE),
+        (False, utils.ENCODING_SAMPLE_SIZE),
+    ],
+)
+def test_detect_file_encoding_sample_size(
+    mocker, monkeypatch, tmp_path, cchardet_available, expected_sample_size
+):
+    path = tmp_path / "big.csv"
+    path.write_bytes(b"a,b\n" * 50_000)
+    cchardet_detect = mocker.Mock(return_value={"encoding": "ASCII", "confidence": 1})
+    charset_detect = mocker.patch(
+        "charset_normalizer.detect", return_value={"encoding": "ascii"}
+    )
+    monkeypatch.setattr(
+        utils, "_cchardet_detect", cchardet_detect if cchardet_available else None
+    )
+
+    assert detect_file_encoding(path) == "ascii"
+    detect = cchardet_detect if cchardet_available else charset_detect
+    assert len(detect.call_args.args[0]) == expected_sample_size
+
+
+def test_detect_file_encoding_fallback_reads_charset_normalizer_sample(
+    mocker, monkeypatch, tmp_path
+):
+    path = tmp_path / "big.csv"
+    path.write_bytes(b"a,b\n" * 50_000)
+    monkeypatch.setattr(
+        utils,
+        "_cchardet_detect",
+        mocker.Mock(return_value={"encoding": "ISO-8859-1", "confidence": 0.99}),
+    )
+    charset_detect = mocker.spy(charset_normalizer, "detect")
+
+    assert detect_file_encoding(path) == "ascii"
+    assert len(charset_detect.call_args.args[0]) == utils.ENCODING_SAMPLE_SIZE
+
+
+@pytest.mark.parametrize(
+    "cchardet_guess",
+    [
+        {"encoding": "UTF-8", "confidence": 0.79},
+        {"encoding": "UTF-8", "confidence": None},
+        {"encoding": None, "confidence": 0.0},
+        {"encoding": "ISO-8859-1", "confidence": 0.99},
+    ],
+)
+def test_detect_file_encoding_unconfirmed_guess_falls_back(
+    mocker, monkeypatch, latin1_file, cchardet_guess
+):
+    monkeypatch.setattr(
+        utils, "_cchardet_detect", mocker.Mock(return_value=cchardet_guess)
+    )
+    charset_detect = mocker.spy(charset_normalizer, "detect")
+
+    assert detect_file_encoding(latin1_file) == "Windows-1252"
+    charset_detect.assert_called_once_with(_LATIN1_SAMPLE)
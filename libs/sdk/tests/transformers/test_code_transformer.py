@@ -6,7 +6,8 @@ import pandas as pd
 import pytest
 from sdif_db import SDIFDatabase
 
-from satif_sdk.transformers.code import CodeTransformer, transformation
+from satif_sdk.code_executors import LocalCodeExecutor
+from satif_sdk.transformers.code import CodeTransformer, ExportError, transformation
 
 
 @pytest.fixture
@@ -98,6 +99,26 @@ def test_transformer_init_with_registered_name():
     assert transformer.transform_code is None
 
 
+def test_transformation_reregistration_warns_only_on_overwrite(caplog):
+    """Test that re-registering the same function is silent but replacing one warns."""
+
+    def reloaded(conn):
+        return {}
+
+    def replacement(conn):
+        return {}
+
+    transformation(reloaded, name="reregistered_transform")
+    with caplog.at_level("WARNING"):
+        transformation(reloaded, name="reregistered_transform")
+        assert "already registered" not in caplog.text
+        transformation(replacement, name="reregistered_transform")
+        assert "already registered" in caplog.text
+
+    transformer = CodeTransformer(function="reregistered_transform")
+    assert transformer.transform_function_obj is replacement
+
+
 def test_transformer_init_with_code_string():
     """Test initializing CodeTransformer with a code string."""
     code = """
@@ -703,3 +724,748 @@ def transform(conn):
     with open(text_file_path, "r", encoding="utf-8") as f:
         text = f.read()
         assert text == "This is plain text stored as bytes"
+
+
+def test_export_dataframes_to_zip_formats(create_test_sdif, tmp_path):
+    """Test that DataFrames streamed into a zip archive keep their requested format."""
+    users_df = pd.DataFrame({"id": [1, 2], "name": ["Alice", "Bob"]})
+    sdif_path = create_test_sdif("test_db", {"users": users_df})
+
+    def transform(conn):
+        df = pd.read_sql_query("SELECT * FROM db1.users", conn)
+        return {"users.csv": df, "users.json": df, "extra.txt": df}
+
+    transformer = CodeTransformer(function=transform)
+    zip_path = tmp_path / "dataframes.zip"
+    transformer.export(sdif=sdif_path, output_path=zip_path, zip_archive=True)
+
+    import zipfile
+
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        assert sorted(zip_ref.namelist()) == ["extra.csv", "users.csv", "users.json"]
+        with zip_ref.open("users.csv") as csv_entry:
+            assert pd.read_csv(csv_entry).to_dict("records") == [
+                {"id": 1, "name": "Alice"},
+                {"id": 2, "name": "Bob"},
+            ]
+        assert json.loads(zip_ref.read("users.json")) == [
+            {"id": 1, "name": "Alice"},
+            {"id": 2, "name": "Bob"},
+        ]
+
+
+def test_export_to_zip_compression_options(create_test_sdif, tmp_path):
+    """Test that the zip compression method is configurable on export."""
+    import zipfile
+
+    users_df = pd.DataFrame({"id": [1, 2], "name": ["Alice", "Bob"]})
+    sdif_path = create_test_sdif("test_db", {"users": users_df})
+
+    def transform(conn):
+        df = pd.read_sql_query("SELECT * FROM db1.users", conn)
+        return {"users.csv": df, "report.json": {"count": len(df)}}
+
+    transformer = CodeTransformer(function=transform)
+
+    stored_zip = transformer.export(
+        sdif=sdif_path,
+        output_path=tmp_path / "stored.zip",
+        zip_archive=True,
+        zip_compression=zipfile.ZIP_STORED,
+    )
+    with zipfile.ZipFile(stored_zip, "r") as zip_ref:
+        assert {info.compress_type for info in zip_ref.infolist()} == {
+            zipfile.ZIP_STORED
+        }
+
+    deflated_zip = transformer.export(
+        sdif=sdif_path, output_path=tmp_path / "deflated.zip", zip_archive=True
+    )
+    with zipfile.ZipFile(deflated_zip, "r") as zip_ref:
+        assert {info.compress_type for info in zip_ref.infolist()} == {
+            zipfile.ZIP_DEFLATED
+        }
+        assert json.loads(zip_ref.read("report.json")) == {"count": 2}
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_export_parallel_and_serial_outputs_match(create_test_sdif, tmp_path, parallel):
+    """Test that parallel and serial exports write the same files."""
+    import zipfile
+
+    users_df = pd.DataFrame({"id": [1, 2, 3], "name": ["Alice", "Bob", "Charlie"]})
+    sdif_path = create_test_sdif("test_db", {"users": users_df})
+
+    def transform(conn):
+        df = pd.read_sql_query("SELECT * FROM db1.users", conn)
+        return {
+            "users.csv": df,
+            "users.json": df,
+            "summary.json": {"count": len(df)},
+            "notes.txt": "done",
+            "raw.bin": b"\x00\x01",
+        }
+
+    transformer = CodeTransformer(function=transform, parallel=parallel)
+
+    out_dir = transformer.export(sdif=sdif_path, output_path=tmp_path / "out")
+    assert sorted(p.name for p in out_dir.iterdir()) == [
+        "notes.txt",
+        "raw.bin",
+        "summary.json",
+        "users.csv",
+        "users.json",
+    ]
+    assert len(pd.read_csv(out_dir / "users.csv")) == 3
+    assert (out_dir / "raw.bin").read_bytes() == b"\x00\x01"
+
+    zip_path = transformer.export(
+        sdif=sdif_path, output_path=tmp_path / "out.zip", zip_archive=True
+    )
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        for info in zip_ref.infolist():
+            if info.filename.endswith(".csv"):
+                with zip_ref.open(info) as csv_entry:
+                    pd.testing.assert_frame_equal(
+                        pd.read_csv(csv_entry), pd.read_csv(out_dir / info.filename)
+                    )
+            else:
+                assert zip_ref.read(info) == (out_dir / info.filename).read_bytes()
+
+
+@pytest.mark.parametrize("analyze_on_attach", [None, True, False])
+def test_transform_analyze_on_attach(create_test_sdif, analyze_on_attach):
+    """Test that planner statistics are written to input SDIFs only when opted in."""
+    import sqlite3
+
+    users_df = pd.DataFrame({"id": [1, 2, 3], "name": ["Alice", "Bob", "Charlie"]})
+    sdif_path = create_test_sdif("test_db", {"users": users_df})
+
+    options = (
+        {} if analyze_on_attach is None else {"analyze_on_attach": analyze_on_attach}
+    )
+    transformer = CodeTransformer(function=simple_transform, **options)
+    result = transformer.transform(sdif=sdif_path)
+    assert len(result["users.csv"]) == 3
+
+    conn = sqlite3.connect(sdif_path)
+    try:
+        has_stats = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+        ).fetchone()
+    finally:
+        conn.close()
+    assert bool(has_stats) is bool(analyze_on_attach)
+
+
+def test_df_to_csv_bytes_matches_pandas_semantics():
+    """Test that CSV serialization round-trips and keeps pandas formatting for bools."""
+    from io import BytesIO
+
+    from satif_sdk.transformers.code import _df_to_csv_bytes
+
+    df = pd.DataFrame({"id": [1, 2], "name": ["Al,ice", "Bob"], "score": [1.5, None]})
+    pd.testing.assert_frame_equal(pd.read_csv(BytesIO(_df_to_csv_bytes(df))), df)
+
+    bool_df = pd.DataFrame({"id": [1, 2], "active": [True, False]})
+    assert _df_to_csv_bytes(bool_df) == bool_df.to_csv(index=False).encode("utf-8")
+
+
+def test_json_bytes_handles_numpy_and_non_string_keys():
+    """Test JSON serialization of numpy values and fallback for non-string keys."""
+    import numpy as np
+
+    from satif_sdk.transformers.code import _json_bytes
+
+    assert json.loads(_json_bytes({"count": 3, "items": ["a", "b"]})) == {
+        "count": 3,
+        "items": ["a", "b"],
+    }
+    assert json.loads(_json_bytes({1: "one"})) == {"1": "one"}
+    try:
+        import orjson  # noqa: F401
+    except ImportError:
+        return
+    assert json.loads(_json_bytes({"total": np.int64(7)})) == {"total": 7}
+
+
+def test_code_file_source_is_cached_until_modified(create_test_code_file):
+    """Test that script reads are memoized per file version."""
+    import os
+
+    from satif_sdk.transformers.code import _load_script
+
+    file_path = create_test_code_file("def transform(conn):\n    return {}\n")
+    _load_script.cache_clear()
+
+    first = CodeTransformer(function=file_path)
+    second = CodeTransformer(function=file_path)
+    assert first.transform_code == second.transform_code
+    assert _load_script.cache_info().hits == 1
+
+    file_path.write_text("def transform(conn):\n    return {'a.txt': 'x'}\n")
+    st = file_path.stat()
+    os.utime(file_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    third = CodeTransformer(function=file_path)
+    assert "a.txt" in third.transform_code
+
+
+def test_code_string_is_precompiled(create_test_sdif):
+    """Test that code strings are compiled once at init for the local executor."""
+    users_df = pd.DataFrame({"id": [1, 2], "name": ["Alice", "Bob"]})
+    sdif_path = create_test_sdif("test_db", {"users": users_df})
+    code = """
+def transform(conn):
+    return {"users.csv": pd.read_sql_query("SELECT * FROM db1.users", conn)}
+"""
+    transformer = CodeTransformer(function=code)
+    assert transformer.transform_code_obj is not None
+    assert transformer.transform_code_obj.co_filename == "<code_string>"
+
+    result = transformer.transform(sdif_path)
+    assert len(result["users.csv"]) == 2
+
+    broken = CodeTransformer(function="def transform(conn) return {}")
+    assert broken.transform_code_obj is None
+    with pytest.raises(ExportError):
+        broken.transform(sdif_path)
+
+
+def test_context_read_sql_chunked(create_test_sdif):
+    """Test that direct callables get a chunked read_sql helper in context."""
+    users_df = pd.DataFrame({"id": range(5), "name": list("abcde")})
+    sdif_path = create_test_sdif("test_db", {"users": users_df})
+
+    def transform(conn, context):
+        chunks = list(context["read_sql_chunked"]("SELECT * FROM db1.users", conn))
+        return {"sizes.json": [len(chunk) for chunk in chunks]}
+
+    transformer = CodeTransformer(function=transform, read_chunk_size=2)
+    assert transformer.transform(sdif_path) == {"sizes.json": [2, 2, 1]}
+
+
+@pytest.mark.parametrize("strict_resolve", [False, True])
+def test_transform_strict_resolve(create_test_sdif, tmp_path, strict_resolve):
+    """Test that symlinked SDIF paths are only resolved when strict_resolve is set."""
+    users_df = pd.DataFrame({"id": [1], "name": ["Alice"]})
+    sdif_path = create_test_sdif("test_db", {"users": users_df})
+    link_path = tmp_path / "link.sdif"
+    link_path.symlink_to(sdif_path)
+
+    seen_sources = {}
+
+    class RecordingExecutor(LocalCodeExecutor):
+        def execute(self, code, function_name, sdif_sources, extra_context):
+            seen_sources.update(sdif_sources)
+            return super().execute(code, function_name, sdif_sources, extra_context)
+
+    transformer = CodeTransformer(
+        function="def transform(conn):\n    return {}\n",
+        code_executor=RecordingExecutor(disable_security_warning=True),
+        strict_resolve=strict_resolve,
+    )
+    transformer.transform(link_path)
+    expected = sdif_path.resolve() if strict_resolve else link_path
+    assert seen_sources == {"db1": expected}
+
+
+def test_transform_with_executor_lacking_accepts_code_objects(create_test_sdif):
+    """Test that executors without `accepts_code_objects` receive the source string."""
+    sdif_path = create_test_sdif("test_db", {"users": pd.DataFrame({"id": [1]})})
+    seen_code = []
+
+    class DuckTypedExecutor:
+        def execute(self, code, function_name, sdif_sources, extra_context):
+            seen_code.append(code)
+            return {"out.txt": "ok"}
+
+    code = "def transform(conn):\n    return {}\n"
+    transformer = CodeTransformer(function=code, code_executor=DuckTypedExecutor())
+    assert transformer.transform(sdif_path) == {"out.txt": "ok"}
+    assert seen_code == [code]
+
+
+def test_transform_result_keys_coerced_to_str(create_test_sdif):
+    """Test that non-string result keys are coerced and colliding keys rejected."""
+    sdif_path = create_test_sdif("test_db", {"users": pd.DataFrame({"id": [1]})})
+
+    transformer = CodeTransformer(function=lambda conn: {1: "one", "b.txt": "two"})
+    assert transformer.transform(sdif_path) == {"1": "one", "b.txt": "two"}
+
+    transformer = CodeTransformer(function=lambda conn: {1: "one", "1": "also one"})
+    with pytest.raises(ExportError, match="collide"):
+        transformer.transform(sdif_path)
+
+
+def test_export_skips_unsafe_filename_keys(tmp_path):
+    """Test that unsafe result keys are dropped for both directory and zip exports."""
+    import zipfile
+
+    transformer = CodeTransformer(function=simple_transform)
+    data = {"ok.txt": "fine", "../escape.txt": "nope", "sub/nested.txt": "also fine"}
+
+    out_dir = transformer._export_data(data, tmp_path / "out")
+    assert (out_dir / "ok.txt").read_text() == "fine"
+    assert (out_dir / "sub" / "nested.txt").exists()
+    assert not (tmp_path / "escape.txt").exists()
+
+    zip_path = transformer._export_data(data, tmp_path / "out.zip", zip_archive=True)
+    with zipfile.ZipFile(zip_path) as zf:
+        assert sorted(zf.namelist()) == ["ok.txt", "sub/nested.txt"]
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_export_zip_entries_are_reproducible(tmp_path, parallel):
+    """Test that zip entries get a fixed timestamp and permissions."""
+    import zipfile
+
+    transformer = CodeTransformer(function=simple_transform, parallel=parallel)
+    data = {"a.csv": pd.DataFrame({"x": [1, 2]}), "b.json": {"k": "v"}}
+
+    first = transformer._export_data(data, tmp_path / "first.zip", zip_archive=True)
+    second = transformer._export_data(data, tmp_path / "second.zip", zip_archive=True)
+    assert first.read_bytes() == second.read_bytes()
+
+    with zipfile.ZipFile(first) as zf:
+        for info in zf.infolist():
+            assert info.date_time == (1980, 1, 1, 0, 0, 0)
+            assert info.external_attr >> 16 == 0o644
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_export_zip_entries_use_archive_compresslevel(tmp_path, monkeypatch, parallel):
+    """Test that every entry, buffered or streamed, is deflated at the given level."""
+    import zipfile
+    import zlib
+
+    from satif_sdk.transformers import code as code_module
+
+    monkeypatch.setattr(code_module, "ZIP_STREAM_MIN_SIZE", 1000)
+    text = "".join(f"row {i} value {i * 7919 % 1000}\n" for i in range(2000))
+    data = {"small.txt": text[:900], "large.txt": text}
+
+    transformer = CodeTransformer(function=simple_transform, parallel=parallel)
+    zip_path = transformer._export_data(
+        data, tmp_path / "out.zip", zip_archive=True, zip_compresslevel=9
+    )
+
+    with zipfile.ZipFile(zip_path) as zf:
+        for name, content in data.items():
+            deflate = zlib.compressobj(9, zlib.DEFLATED, -15)
+            expected = deflate.compress(content.encode()) + deflate.flush()
+            assert zf.getinfo(name).compress_size == len(expected)
+
+
+def test_set_compress_level_uses_public_attribute_when_available():
+    """Test that `compress_level` is set on Python 3.13+, `_compresslevel` before."""
+    import sys
+    import zipfile
+
+    from satif_sdk.transformers import code as code_module
+
+    zinfo = zipfile.ZipInfo("a.txt")
+    code_module._set_compress_level(zinfo, 7)
+
+    if sys.version_info >= (3, 13):
+        assert zinfo.compress_level == 7
+    else:
+        assert not hasattr(zinfo, "compress_level")
+        assert zinfo._compresslevel == 7
+
+
+def test_export_single_output_to_file_or_dotted_directory(tmp_path):
+    """Test single-output exports to a file path and to a directory with a suffix."""
+    transformer = CodeTransformer(function=simple_transform)
+
+    file_path = transformer._export_data(
+        {"ignored.txt": "hi"}, tmp_path / "new" / "out.txt"
+    )
+    assert file_path.read_text() == "hi"
+
+    dotted_dir = tmp_path / "results.d"
+    dotted_dir.mkdir()
+    transformer._export_data({"report.txt": "hello"}, dotted_dir)
+    assert (dotted_dir / "report.txt").read_text() == "hello"
+
+
+@pytest.mark.parametrize("fast_excel", [True, False])
+def test_export_dataframe_to_xlsx(tmp_path, fast_excel):
+    """Test that .xlsx exports round-trip with and without the fast writer."""
+    pytest.importorskip("openpyxl")
+    df = pd.DataFrame(
+        {"id": [1, 2, 3], "name": ["a", "b", "c"], "score": [1.5, 2.0, 3.25]}
+    )
+
+    transformer = CodeTransformer(function=simple_transform, fast_excel=fast_excel)
+    out_path = transformer._export_data({"out.xlsx": df}, tmp_path / "out.xlsx")
+
+    pd.testing.assert_frame_equal(pd.read_excel(out_path), df)
+
+
+def test_export_fast_xlsx_matches_openpyxl(tmp_path):
+    """Test that the fast .xlsx writer keeps headers, dtypes and missing values."""
+    pytest.importorskip("openpyxl")
+    from satif_sdk.transformers import code as code_module
+
+    if code_module.jetxl is None and code_module.rustpy_xlsxwriter is None:
+        pytest.skip("no fast xlsx writer installed")
+    df = pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "Name With Space": ["a", None, "c"],
+            "score": [1.5, float("nan"), 3.25],
+            "flag": [True, False, True],
+            "when": pd.to_datetime(["2024-01-01", "2024-02-01", None]),
+        }
+    )
+
+    outputs = {}
+    for fast_excel in (True, False):
+        transformer = CodeTransformer(function=simple_transform, fast_excel=fast_excel)
+        outputs[fast_excel] = pd.read_excel(
+            transformer._export_data(
+                {"out.xlsx": df}, tmp_path / f"fast_{fast_excel}.xlsx"
+            )
+        )
+
+    assert CodeTransformer(function=simple_transform).fast_excel is False
+    assert list(outputs[True].columns) == list(df.columns)
+    pd.testing.assert_frame_equal(outputs[True], outputs[False])
+
+
+def test_export_zip_streams_entries_in_chunks(tmp_path, monkeypatch):
+    """Test that serial zip exports stream str/bytes/JSON entries across chunks."""
+    import zipfile
+
+    from satif_sdk.transformers import code as code_module
+
+    monkeypatch.setattr(code_module, "ZIP_STREAM_CHUNK_SIZE", 7)
+    monkeypatch.setattr(code_module, "ZIP_STREAM_MIN_SIZE", 0)
+    data = {
+        "text.txt": "héllo wörld " * 10,
+        "blob.bin": bytes(range(256)),
+        "items.json": [{"n": i} for i in range(20)],
+    }
+
+    transformer = CodeTransformer(function=simple_transform, parallel=False)
+    zip_path = transformer._export_data(data, tmp_path / "out.zip", zip_archive=True)
+
+    with zipfile.ZipFile(zip_path) as zf:
+        assert zf.read("text.txt").decode("utf-8") == data["text.txt"]
+        assert zf.read("blob.bin") == data["blob.bin"]
+        assert json.loads(zf.read("items.json")) == data["items.json"]
+
+
+def test_export_parallel_zip_streams_large_entries(tmp_path, monkeypatch):
+    """Test that parallel zip exports stream large entries, keeping entry order."""
+    import zipfile
+
+    from satif_sdk.transformers import code as code_module
+
+    monkeypatch.setattr(code_module, "ZIP_STREAM_MIN_SIZE", 1000)
+    streamed = []
+    stream_df = code_module._ZIP_STREAMERS[pd.DataFrame]
+
+    def recording_stream_df(df, ext, raw_entry):
+        streamed.append(len(df))
+        stream_df(df, ext, raw_entry)
+
+    monkeypatch.setitem(code_module._ZIP_STREAMERS, pd.DataFrame, recording_stream_df)
+    big = pd.DataFrame({"v": range(500)})
+    data = {
+        "a.txt": "first",
+        "big.csv": big,
+        "small.csv": pd.DataFrame({"v": [1, 2]}),
+        "b.json": {"last": True},
+    }
+
+    transformer = CodeTransformer(function=simple_transform, parallel=True)
+    zip_path = transformer._export_data(data, tmp_path / "out.zip", zip_archive=True)
+
+    assert streamed == [500]
+    with zipfile.ZipFile(zip_path) as zf:
+        assert zf.namelist() == list(data)
+        with zf.open("big.csv") as entry:
+            pd.testing.assert_frame_equal(pd.read_csv(entry), big)
+
+
+class _FailsToRender:
+    """Cell value whose text conversion fails, to break serialization midway."""
+
+    def __str__(self) -> str:
+        raise ValueError("cannot render")
+
+    __repr__ = __str__
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_export_zip_skips_entries_failing_midway(tmp_path, monkeypatch, parallel):
+    """Test that entries failing partway through are skipped, never left truncated."""
+    import zipfile
+
+    from satif_sdk.transformers import code as code_module
+
+    monkeypatch.setattr(code_module, "ZIP_STREAM_CHUNK_SIZE", 7)
+    monkeypatch.setattr(code_module, "ZIP_STREAM_MIN_SIZE", 0)
+    # pandas writes CSV in row batches, so the first batch is out before the bad cell.
+    rows: list = list(range(150_000)) + [_FailsToRender()]
+    data = {
+        "x.json": {"a": list(range(1000)), "b": {1}},
+        "frame.csv": pd.DataFrame({"v": rows}),
+        "ok.txt": "fine",
+    }
+
+    transformer = CodeTransformer(function=simple_transform, parallel=parallel)
+    zip_path = transformer._export_data(data, tmp_path / "out.zip", zip_archive=True)
+
+    with zipfile.ZipFile(zip_path) as zf:
+        assert zf.namelist() == ["ok.txt"]
+        assert zf.testzip() is None
+        assert zf.read("ok.txt") == b"fine"
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_export_dataframe_to_parquet(tmp_path, parallel):
+    """Test that .parquet keys are written as Parquet, both as files and zip entries."""
+    import io
+    import zipfile
+
+    pq = pytest.importorskip("pyarrow.parquet")
+    df = pd.DataFrame({"id": [1, 2, 3], "city": ["Paris", "Paris", "Rome"]})
+    transformer = CodeTransformer(function=simple_transform, parallel=parallel)
+
+    out_path = transformer._export_data({"out.parquet": df}, tmp_path / "out.parquet")
+    pd.testing.assert_frame_equal(pd.read_parquet(out_path), df)
+    assert (
+        pq.ParquetFile(out_path).metadata.row_group(0).column(0).compression == "ZSTD"
+    )
+
+    zip_path = transformer._export_data(
+        {"nested/out.parquet": df}, tmp_path / "out.zip", zip_archive=True
+    )
+    with zipfile.ZipFile(zip_path) as zf:
+        info = zf.getinfo("nested/out.parquet")
+        assert info.compress_type == zipfile.ZIP_STORED
+        entry = io.BytesIO(zf.read(info))
+    pd.testing.assert_frame_equal(pd.read_parquet(entry), df)
+
+
+def test_export_large_bytes_written_in_chunks(tmp_path, monkeypatch):
+    """Test that bytes outputs above the threshold are written chunk by chunk."""
+    from satif_sdk.transformers import code as code_module
+
+    monkeypatch.setattr(code_module, "LARGE_BYTES_WRITE_THRESHOLD", 100)
+    monkeypatch.setattr(code_module, "FILE_WRITE_CHUNK_SIZE", 7)
+    data = {"small.bin": b"tiny", "large.bin": bytes(range(256)) * 3}
+
+    transformer = CodeTransformer(function=simple_transform)
+    transformer._export_data(data, tmp_path)
+
+    assert (tmp_path / "small.bin").read_bytes() == data["small.bin"]
+    assert (tmp_path / "large.bin").read_bytes() == data["large.bin"]
+
+
+def test_export_parallel_zip_preserves_entry_order(tmp_path):
+    """Test that parallel zip exports keep result order with many entries in flight."""
+    import os
+    import zipfile
+
+    count = 4 * (os.cpu_count() or 1) + 3
+    data = {f"part_{i:03d}.txt": f"payload {i}" for i in reversed(range(count))}
+
+    transformer = CodeTransformer(function=simple_transform, parallel=True)
+    zip_path = transformer._export_data(data, tmp_path / "out.zip", zip_archive=True)
+
+    with zipfile.ZipFile(zip_path) as zf:
+        assert zf.namelist() == list(data)
+        assert all(zf.read(name).decode() == data[name] for name in data)
+
+
+def test_export_csv_file_drops_index(tmp_path):
+    """Test CSV file exports of plain and MultiIndex frames omit the index."""
+    df = pd.DataFrame(
+        {"region": ["n", "s"], "qty": [1, 2], "price": [1.5, None]},
+        index=pd.MultiIndex.from_tuples([("a", 1), ("b", 2)]),
+    )
+
+    transformer = CodeTransformer(function=simple_transform)
+    out_path = transformer._export_data({"out.csv": df}, tmp_path / "out.csv")
+
+    pd.testing.assert_frame_equal(
+        pd.read_csv(out_path), df.reset_index(drop=True), check_dtype=False
+    )
+
+
+def test_export_json_file_matches_zip_entry(tmp_path):
+    """Test that JSON files and JSON zip entries are serialized identically."""
+    import zipfile
+
+    data = {"summary.json": {"total": 3, "names": ["ä", "b"], 2: "two"}}
+    transformer = CodeTransformer(function=simple_transform)
+
+    file_path = transformer._export_data(data, tmp_path / "summary.json")
+    zip_path = transformer._export_data(data, tmp_path / "out.zip", zip_archive=True)
+
+    assert json.loads(file_path.read_bytes()) == {
+        "total": 3,
+        "names": ["ä", "b"],
+        "2": "two",
+    }
+    with zipfile.ZipFile(zip_path) as zf:
+        assert zf.read("summary.json") == file_path.read_bytes()
+
+
+def test_sanitize_output_filename(tmp_path):
+    """Test filename key validation for directory and zip outputs."""
+    transformer = CodeTransformer(function=simple_transform)
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    target = tmp_path / "target"
+    target.mkdir()
+    (target / "escape").symlink_to(outside)
+
+    sanitize = transformer._sanitize_output_filename
+    assert sanitize("..", None) is None
+    assert sanitize("a/../b.txt", None) is None
+    assert sanitize("/abs.txt", None) is None
+    assert sanitize("..hidden.txt", None) == Path("..hidden.txt")
+    assert sanitize("sub/ok.txt", target) == target.resolve() / "sub" / "ok.txt"
+    assert sanitize("escape/x.txt", target) is None
+
+
+def test_export_xlsx_without_openpyxl(tmp_path, monkeypatch):
+    """Test that a missing openpyxl is reported as an ExportError."""
+    from satif_sdk.transformers import code as code_module
+
+    monkeypatch.setattr(code_module, "_openpyxl_available", lambda: False)
+    transformer = CodeTransformer(function=simple_transform, fast_excel=False)
+
+    with pytest.raises(ExportError, match="requires 'openpyxl'"):
+        transformer._export_data(
+            {"out.xlsx": pd.DataFrame({"a": [1]})}, tmp_path / "out.xlsx"
+        )
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_export_zip_stores_precompressed_entries(tmp_path, parallel):
+    """Test that already-compressed payloads are stored rather than deflated."""
+    import gzip
+    import zipfile
+
+    payload = gzip.compress(b"a,b\n1,2\n" * 100)
+    data = {"data.csv.gz": payload, "image.PNG": b"\x89PNG", "notes.txt": "x" * 100}
+
+    transformer = CodeTransformer(function=simple_transform, parallel=parallel)
+    zip_path = transformer._export_data(data, tmp_path / "out.zip", zip_archive=True)
+
+    with zipfile.ZipFile(zip_path) as zf:
+        assert zf.getinfo("data.csv.gz").compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo("image.PNG").compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo("notes.txt").compress_type == zipfile.ZIP_DEFLATED
+        assert zf.read("data.csv.gz") == payload
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_export_zip_deflates_with_isal_when_available(tmp_path, mocker, parallel):
+    """Test that deflated entries go through ISA-L and remain readable by stdlib zipfile."""
+    import zipfile
+
+    isal_zlib = pytest.importorskip("isal.isal_zlib")
+    spy = mocker.spy(isal_zlib, "compressobj")
+
+    data = {"data.csv": pd.DataFrame({"a": range(1000)}), "notes.txt": "x" * 1000}
+    transformer = CodeTransformer(function=simple_transform, parallel=parallel)
+    zip_path = transformer._export_data(data, tmp_path / "out.zip", zip_archive=True)
+
+    assert spy.call_count == 2
+    with zipfile.ZipFile(zip_path) as zf:
+        assert zf.testzip() is None
+        assert zf.read("notes.txt") == b"x" * 1000
+
+
+def test_isal_deflate_is_scoped_to_zip_exports(tmp_path, mocker):
+    """Test that importing the module or exporting leaves stdlib zipfile on zlib."""
+    import zipfile
+    import zlib
+
+    pytest.importorskip("isal.isal_zlib")
+    from satif_sdk.transformers import code as code_module
+
+    assert zipfile.zlib is zlib
+    seen_zlib = []
+    serialize = code_module._serialize_entry
+
+    def recording_serialize(*args):
+        seen_zlib.append(zipfile.zlib)
+        return serialize(*args)
+
+    mocker.patch.object(code_module, "_serialize_entry", recording_serialize)
+    transformer = CodeTransformer(function=simple_transform, parallel=False)
+    transformer._export_data({"a.txt": "x"}, tmp_path / "out.zip", zip_archive=True)
+
+    assert isinstance(seen_zlib[0], code_module._IsalDeflateZlib)
+    assert zipfile.zlib is zlib
+
+
+def test_find_handler_falls_back_to_subclasses():
+    """Test that writer dispatch resolves exact types and their subclasses."""
+    from collections import OrderedDict
+
+    from satif_sdk.transformers.code import (
+        _FILE_WRITERS,
+        _ZIP_SERIALIZERS,
+        _find_handler,
+    )
+
+    assert _find_handler(_ZIP_SERIALIZERS, [1, 2]) is _ZIP_SERIALIZERS[list]
+    assert _find_handler(_FILE_WRITERS, OrderedDict(a=1)) is _FILE_WRITERS[dict]
+    assert _find_handler(_FILE_WRITERS, 42) is None
+
+
+def test_transform_cache_connections(create_test_sdif):
+    """Test that cached connections are reused across calls and released on close."""
+    users_df = pd.DataFrame({"id": [1, 2, 3], "name": ["Alice", "Bob", "Charlie"]})
+    sdif_path = create_test_sdif("test_db", {"users": users_df})
+
+    seen_connections = []
+
+    def transform(conn):
+        seen_connections.append(conn)
+        return {"users.csv": pd.read_sql_query("SELECT * FROM db1.users", conn)}
+
+    with CodeTransformer(function=transform, cache_connections=True) as transformer:
+        transformer.transform(sdif=sdif_path)
+        transformer.transform(sdif=sdif_path)
+        assert seen_connections[0] is seen_connections[1]
+        assert len(transformer._conn_cache) == 1
+
+    assert transformer._conn_cache == {}
+
+    uncached = CodeTransformer(function=transform)
+    uncached.transform(sdif=sdif_path)
+    uncached.transform(sdif=sdif_path)
+    assert seen_connections[2] is not seen_connections[3]
+
+
+def test_transform_applies_sqlite_tuning(create_test_sdif):
+    """Test that attached SDIFs get the configured mmap and cache sizes."""
+    users_df = pd.DataFrame({"id": [1, 2], "name": ["Alice", "Bob"]})
+    sdif_path = create_test_sdif("test_db", {"users": users_df})
+
+    def transform(conn):
+        return {
+            "pragmas.json": {
+                "mmap_size": conn.execute("PRAGMA db1.mmap_size").fetchone()[0],
+                "cache_size": conn.execute("PRAGMA db1.cache_size").fetchone()[0],
+                "temp_store": conn.execute("PRAGMA temp_store").fetchone()[0],
+            }
+        }
+
+    result = CodeTransformer(function=transform, mmap_size=1024 * 1024).transform(
+        sdif=sdif_path
+    )
+    assert result["pragmas.json"] == {
+        "mmap_size": 1024 * 1024,
+        "cache_size": -65536,
+        "temp_store": 2,
+    }